@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import WebhookEndpoint
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = (
+        "url",
+        "project",
+        "is_active",
+        "last_event_id",
+        "failures",
+        "next_attempt_time",
+    )
+    search_fields = ("url",)
+    list_filter = ("is_active",)
+    readonly_fields = ("last_event_id", "failures", "next_attempt_time", "last_error")
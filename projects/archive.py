@@ -0,0 +1,144 @@
+"""
+Archivage des issues terminées.
+
+Les issues au statut Finished non modifiées depuis N jours sont déplacées, avec
+leurs commentaires, vers les tables ArchivedIssue / ArchivedComment, par lots
+d'une transaction chacun. Les listes n'interrogent plus que les tables actives ;
+les routes de détail se replient sur l'archive (voir ArchiveFallbackMixin).
+
+L'archivage ajoute une entrée UPSERT au journal des modifications pour chaque
+issue et commentaire déplacé : le flux de synchronisation renvoie alors leur
+représentation archivée (archived: true) au lieu de les traiter comme supprimés.
+
+Chaque shard est archivé à son tour ; les tables d'archive et le journal sont
+sur la base par défaut.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from softdesk.writes import multi_atomic
+
+from .changes import record_changes
+from .constants import ChangeAction, Status
+from .models import Issue, Comment, ArchivedIssue, ArchivedComment
+from .sharding import current_shard, get_shards, use_shard
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def get_archive_after_days():
+    """
+    Ancienneté minimale d'une issue terminée avant archivage
+    (settings.ISSUE_ARCHIVE_AFTER_DAYS, 90 jours par défaut).
+    """
+    return getattr(settings, "ISSUE_ARCHIVE_AFTER_DAYS", 90)
+
+
+def _copy(instance, archive_model, **extra):
+    """
+    Copie les champs d'un objet actif vers une instance du modèle d'archive.
+    """
+    values = {
+        field.attname: getattr(instance, field.attname)
+        for field in archive_model._meta.concrete_fields
+        if hasattr(instance, field.attname)
+    }
+    values.update(extra)
+    return archive_model(**values)
+
+
+def archivable_issues(cutoff):
+    """
+    Issues terminées non modifiées depuis cutoff (hors projets en suppression).
+    """
+    return Issue.objects.filter(
+        status=Status.FINISHED,
+        updated_time__lt=cutoff,
+        project__pending_deletion=False,
+    )
+
+
+def _archive_batch(pks, cutoff):
+    """
+    Déplace un lot d'issues et leurs commentaires dans une seule transaction.
+
+    Les critères sont revérifiés dans la transaction : une issue rouverte entre
+    la sélection et le déplacement reste dans la table active.
+
+    Returns:
+        int: nombre d'issues archivées.
+    """
+    now = timezone.now()
+    # Issues et commentaires sur le shard courant, archives et journal sur la base par défaut
+    with multi_atomic((DEFAULT_DB_ALIAS, current_shard())):
+        issues = list(archivable_issues(cutoff).filter(pk__in=pks))
+        if not issues:
+            return 0
+        ids = [issue.pk for issue in issues]
+        comments = list(Comment.objects.filter(issue_id__in=ids))
+
+        ArchivedIssue.objects.bulk_create(
+            [_copy(issue, ArchivedIssue, archived_time=now) for issue in issues]
+        )
+        ArchivedComment.objects.bulk_create(
+            [_copy(comment, ArchivedComment) for comment in comments]
+        )
+        record_changes(Issue, ids, ChangeAction.UPSERT)
+        record_changes(Comment, [comment.pk for comment in comments], ChangeAction.UPSERT)
+        # Les feuilles d'abord : le collecteur de cascade n'a plus rien à parcourir
+        Comment.objects.filter(issue_id__in=ids).delete()
+        Issue.objects.filter(pk__in=ids).delete()
+    return len(issues)
+
+
+def _archive_shard(cutoff, batch_size, limit):
+    """
+    Archive par lots les issues du shard courant (au plus `limit`).
+    """
+    archived = 0
+    while limit is None or archived < limit:
+        size = batch_size if limit is None else min(batch_size, limit - archived)
+        pks = list(
+            archivable_issues(cutoff).order_by("pk").values_list("pk", flat=True)[:size]
+        )
+        if not pks:
+            break
+        moved = _archive_batch(pks, cutoff)
+        if not moved:
+            # Tout le lot a été rouvert entre-temps : on recommence la sélection
+            continue
+        archived += moved
+        logger.info("%s issue(s) archivée(s)", archived)
+    return archived
+
+
+def archive_finished_issues(older_than_days=None, batch_size=DEFAULT_BATCH_SIZE, limit=None):
+    """
+    Archive les issues terminées depuis plus de older_than_days jours.
+
+    Args:
+        older_than_days (int|None): ancienneté minimale (réglage par défaut si None).
+        batch_size (int): nombre d'issues déplacées par transaction.
+        limit (int|None): nombre maximal d'issues archivées pendant cette passe.
+
+    Returns:
+        int: nombre d'issues archivées.
+    """
+    if older_than_days is None:
+        older_than_days = get_archive_after_days()
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+
+    archived = 0
+    for alias in get_shards():
+        with use_shard(alias):
+            archived += _archive_shard(
+                cutoff, batch_size, None if limit is None else limit - archived
+            )
+    return archived
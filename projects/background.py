@@ -0,0 +1,216 @@
+"""
+File de tâches d'arrière-plan, stockée en base (table BackgroundTask).
+
+Les effets de bord qui n'ont pas à retarder la réponse (notifications,
+compteurs, indexation...) sont déclarés comme tâches puis mis en file :
+
+    @register("users.welcome")
+    def send_welcome(user_id):
+        ...
+
+    enqueue("users.welcome", user_id=user.pk)
+
+enqueue() écrit la tâche dans la transaction courante : elle n'est visible du
+worker qu'après la validation de cette transaction, et disparaît avec elle en
+cas d'annulation. Le worker (commande run_tasks) réserve les tâches prêtes par
+une mise à jour conditionnelle (aucun verrou de ligne ni broker nécessaire, ce
+qui convient à SQLite), les exécute dans un pool de threads et les relance
+avec un délai croissant en cas d'erreur. Une tâche dont le worker disparaît
+redevient disponible à l'expiration de son délai de visibilité : les tâches
+doivent donc être idempotentes.
+
+Les fonctions de tâche sont déclarées dans les modules tasks.py des
+applications, importés par le worker.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .constants import JobStatus
+from .models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+# Fonctions de tâche enregistrées, par nom
+_registry = {}
+# SQLite n'accepte qu'un écrivain à la fois : les écritures de suivi des
+# threads du pool (fin, relance) sont sérialisées au sein du processus
+_bookkeeping_lock = threading.Lock()
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_VISIBILITY_TIMEOUT = 300
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+def register(name):
+    """
+    Décorateur : enregistre une fonction comme tâche sous le nom donné.
+    """
+    def decorator(function):
+        _registry[name] = function
+        return function
+    return decorator
+
+
+def get_task(name):
+    return _registry.get(name)
+
+
+def discover_tasks():
+    """
+    Importe les modules tasks.py des applications installées.
+    """
+    autodiscover_modules("tasks")
+
+
+def enqueue(name, *, delay=0, max_attempts=DEFAULT_MAX_ATTEMPTS, **payload):
+    """
+    Met une tâche en file, dans la transaction courante.
+
+    Args:
+        name (str): nom de la tâche enregistrée.
+        delay (float): délai minimal (en secondes) avant l'exécution.
+        max_attempts (int): nombre maximal d'exécutions.
+        **payload: arguments nommés de la tâche (sérialisables en JSON).
+
+    Returns:
+        BackgroundTask: tâche créée.
+    """
+    return BackgroundTask.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def retry_delay(attempts):
+    """
+    Délai (en secondes) avant la nouvelle tentative : 10 s, 20 s, 40 s... plafonné à 1 h.
+    """
+    return min(10 * 2 ** (attempts - 1), 3600)
+
+
+def _ready(now):
+    """
+    Tâches prêtes : en attente et échues, ou réservées par un worker disparu.
+    """
+    return BackgroundTask.objects.filter(
+        Q(status=JobStatus.PENDING, run_after__lte=now)
+        | Q(status=JobStatus.RUNNING, locked_until__lte=now)
+    )
+
+
+def claim(limit, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT):
+    """
+    Réserve jusqu'à `limit` tâches prêtes pour ce worker.
+
+    Chaque réservation est une mise à jour conditionnelle : si un autre worker
+    a pris la tâche entre-temps, la mise à jour ne touche aucune ligne.
+
+    Returns:
+        list[BackgroundTask]: tâches réservées (attempts déjà incrémenté).
+    """
+    now = timezone.now()
+    candidates = list(
+        _ready(now).order_by("run_after", "id").values_list("id", flat=True)[:limit]
+    )
+    claimed = []
+    for task_id in candidates:
+        token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+        updated = _ready(now).filter(pk=task_id).update(
+            status=JobStatus.RUNNING,
+            locked_by=token,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            attempts=F("attempts") + 1,
+        )
+        if not updated:
+            continue
+        task = BackgroundTask.objects.get(pk=task_id)
+        if task.attempts > task.max_attempts:
+            # Reprise d'une tâche dont le worker a disparu à la dernière tentative
+            BackgroundTask.objects.filter(pk=task_id, locked_by=token).update(
+                status=JobStatus.FAILED,
+                locked_until=None,
+                last_error="Délai de visibilité expiré à la dernière tentative.",
+            )
+            continue
+        claimed.append(task)
+    return claimed
+
+
+def execute(task):
+    """
+    Exécute une tâche réservée puis la supprime, ou programme sa relance.
+
+    Seul le worker détenteur de la réservation (locked_by) peut conclure la
+    tâche : si elle a été reprise après expiration, son résultat est ignoré.
+
+    Returns:
+        bool: True si la tâche a réussi.
+    """
+    owned = BackgroundTask.objects.filter(pk=task.pk, locked_by=task.locked_by)
+    function = get_task(task.name)
+    try:
+        if function is None:
+            raise LookupError(f"Tâche inconnue : {task.name}")
+        function(**task.payload)
+    except Exception as exc:
+        logger.exception("Échec de la tâche %s (#%s)", task.name, task.pk)
+        with _bookkeeping_lock:
+            if task.attempts >= task.max_attempts or function is None:
+                owned.update(status=JobStatus.FAILED, locked_until=None, last_error=repr(exc))
+            else:
+                owned.update(
+                    status=JobStatus.PENDING,
+                    locked_by="",
+                    locked_until=None,
+                    run_after=timezone.now() + timedelta(seconds=retry_delay(task.attempts)),
+                    last_error=repr(exc),
+                )
+        return False
+    with _bookkeeping_lock:
+        owned.delete()
+    return True
+
+
+def _execute_in_thread(task):
+    try:
+        return execute(task)
+    finally:
+        # Chaque thread du pool ouvre sa propre connexion : elle est fermée ici
+        connections.close_all()
+
+
+def run_pending(concurrency=DEFAULT_CONCURRENCY, visibility_timeout=None):
+    """
+    Réserve et exécute un lot de tâches prêtes (au plus `concurrency`).
+
+    Returns:
+        dict: {"succeeded": int, "failed": int}.
+    """
+    if visibility_timeout is None:
+        visibility_timeout = getattr(
+            settings, "TASK_VISIBILITY_TIMEOUT", DEFAULT_VISIBILITY_TIMEOUT
+        )
+    tasks = claim(concurrency, visibility_timeout)
+    if not tasks:
+        return {"succeeded": 0, "failed": 0}
+    if concurrency == 1:
+        results = [execute(task) for task in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(tasks))) as pool:
+            results = list(pool.map(_execute_in_thread, tasks))
+    succeeded = sum(results)
+    return {"succeeded": succeeded, "failed": len(results) - succeeded}
@@ -0,0 +1,231 @@
+"""
+Journal des modifications et flux de synchronisation incrémentale.
+
+Chaque création, modification ou suppression d'un projet, d'une issue ou d'un
+commentaire ajoute une entrée Change dans la même transaction que la modification.
+L'id auto-incrémenté de Change sert de curseur monotone aux clients de synchronisation.
+
+Une tombstone de projet couvre implicitement ses issues et ses commentaires :
+le client supprime alors tout le contenu local du projet.
+"""
+
+from django.db.models import Q
+
+from .constants import ChangeType, ChangeAction
+from .models import (
+    Project,
+    Contributor,
+    Issue,
+    Comment,
+    Change,
+    ArchivedIssue,
+    ArchivedComment,
+)
+from .sharding import fan_out, in_bulk, is_sharded, select_users
+
+MODEL_TYPES = {
+    Project: ChangeType.PROJECT,
+    Issue: ChangeType.ISSUE,
+    Comment: ChangeType.COMMENT,
+}
+
+# Chemin vers l'id du projet parent, pour chaque modèle suivi
+PROJECT_PATHS = {
+    Project: "pk",
+    Issue: "project_id",
+    Comment: "issue__project_id",
+}
+
+
+def _project_id_of(instance):
+    if isinstance(instance, Project):
+        return instance.pk
+    if isinstance(instance, Issue):
+        return instance.project_id
+    return instance.issue.project_id
+
+
+def record_change(instance, action=ChangeAction.UPSERT):
+    """
+    Enregistre la création/modification (ou la suppression) d'un objet suivi.
+
+    À appeler avant la suppression effective pour une tombstone.
+    """
+    return Change.objects.create(
+        project_id=_project_id_of(instance),
+        type=MODEL_TYPES[type(instance)],
+        object_id=str(instance.pk),
+        action=action,
+    )
+
+
+def record_changes(model, pks, action):
+    """
+    Enregistre en une requête les modifications d'un lot d'objets d'un même modèle.
+    """
+    rows = model.objects.filter(pk__in=pks).values_list("pk", PROJECT_PATHS[model])
+    return Change.objects.bulk_create(
+        [
+            Change(
+                project_id=project_id,
+                type=MODEL_TYPES[model],
+                object_id=str(pk),
+                action=action,
+            )
+            for pk, project_id in rows
+        ]
+    )
+
+
+def record_project_tombstones(project_ids, users=None):
+    """
+    Enregistre la disparition de projets pour leurs contributeurs actuels.
+
+    Les tombstones sont adressées à chaque contributeur (champ user) plutôt
+    qu'au projet : elles restent ainsi lisibles une fois les contributeurs
+    purgés avec le projet.
+
+    Args:
+        project_ids (Iterable[int]): projets supprimés ou devenus inaccessibles.
+        users (Iterable[int]|None): restreint les destinataires à ces utilisateurs.
+    """
+    memberships = Contributor.objects.filter(project_id__in=list(project_ids))
+    if users is not None:
+        memberships = memberships.filter(user_id__in=list(users))
+    return Change.objects.bulk_create(
+        [
+            Change(
+                project_id=project_id,
+                user_id=user_id,
+                type=ChangeType.PROJECT,
+                object_id=str(project_id),
+                action=ChangeAction.DELETE,
+            )
+            for project_id, user_id in memberships.values_list("project_id", "user_id")
+        ]
+    )
+
+
+def record_project_grants(project_id, users):
+    """
+    Signale à de nouveaux contributeurs l'accès à un projet.
+
+    L'entrée est adressée à chaque utilisateur : les entrées antérieures du
+    projet ne leur sont pas visibles, le client récupère alors son contenu.
+    """
+    return Change.objects.bulk_create(
+        [
+            Change(
+                project_id=project_id,
+                user_id=user_id,
+                type=ChangeType.PROJECT,
+                object_id=str(project_id),
+                action=ChangeAction.UPSERT,
+            )
+            for user_id in users
+        ]
+    )
+
+
+def visible_changes(user, since):
+    """
+    Entrées postérieures au curseur `since` visibles par l'utilisateur :
+    celles des projets dont il est contributeur et celles qui lui sont adressées.
+    """
+    memberships = Contributor.objects.filter(user=user, project__pending_deletion=False)
+    if is_sharded():
+        # Les contributeurs sont sur les shards, le journal sur la base par défaut
+        found = fan_out(
+            lambda alias: list(memberships.using(alias).values_list("project_id", flat=True))
+        )
+        project_ids = [project_id for ids in found.values() for project_id in ids]
+    else:
+        project_ids = memberships.values("project_id")
+    return Change.objects.filter(
+        Q(project_id__in=project_ids, user__isnull=True) | Q(user=user),
+        id__gt=since,
+    ).order_by("id")
+
+
+def build_feed(user, since, limit, serializer_context):
+    """
+    Construit une page du flux : une entrée par objet (la plus récente),
+    avec la représentation actuelle des objets créés ou modifiés.
+
+    Returns:
+        dict: {"cursor", "has_more", "changes"}.
+    """
+    from .serializers import (
+        ProjectSerializer,
+        IssueSerializer,
+        CommentSerializer,
+        ArchivedIssueSerializer,
+        ArchivedCommentSerializer,
+    )
+
+    serializers = {
+        ChangeType.PROJECT: (Project, ProjectSerializer),
+        ChangeType.ISSUE: (Issue, IssueSerializer),
+        ChangeType.COMMENT: (Comment, CommentSerializer),
+    }
+    # Un objet archivé n'est pas supprimé : il est renvoyé depuis l'archive
+    archives = {
+        ChangeType.ISSUE: (ArchivedIssue, ArchivedIssueSerializer),
+        ChangeType.COMMENT: (ArchivedComment, ArchivedCommentSerializer),
+    }
+
+    entries = list(visible_changes(user, since)[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Ne garde que la dernière entrée de chaque objet dans la page
+    latest = {}
+    for entry in entries:
+        latest[(entry.type, entry.object_id)] = entry
+    entries = sorted(latest.values(), key=lambda entry: entry.id)
+
+    # Charge en une requête par type les objets à renvoyer, puis ceux qui
+    # manquent depuis l'archive
+    objects = {}
+    for change_type, (model, serializer_class) in serializers.items():
+        ids = [
+            e.object_id for e in entries
+            if e.type == change_type and e.action == ChangeAction.UPSERT
+        ]
+        if not ids:
+            continue
+        queryset = select_users(model.objects.all(), "author")
+        found = objects[change_type] = {
+            str(pk): (obj, serializer_class) for pk, obj in in_bulk(queryset, ids).items()
+        }
+        missing = [object_id for object_id in ids if object_id not in found]
+        if missing and change_type in archives:
+            archive_model, archive_serializer_class = archives[change_type]
+            queryset = archive_model.objects.select_related("author")
+            found.update(
+                (str(pk), (obj, archive_serializer_class))
+                for pk, obj in queryset.in_bulk(missing).items()
+            )
+
+    changes = []
+    for entry in entries:
+        item = {
+            "cursor": entry.id,
+            "type": entry.type,
+            "id": entry.object_id,
+            "action": entry.action,
+            "time": entry.created_time,
+        }
+        if entry.action == ChangeAction.UPSERT:
+            obj, serializer_class = objects.get(entry.type, {}).get(entry.object_id, (None, None))
+            if obj is None:
+                # Supprimé depuis sans tombstone dans cette page : traité comme tel
+                item["action"] = ChangeAction.DELETE
+            else:
+                item["data"] = serializer_class(obj, context=serializer_context).data
+        changes.append(item)
+
+    # La dernière entrée de chaque objet est conservée : le curseur est donc
+    # bien celui de la dernière entrée lue, même si la page a été dédupliquée
+    cursor = entries[-1].id if entries else since
+    return {"cursor": cursor, "has_more": has_more, "changes": changes}
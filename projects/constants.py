@@ -1,22 +1,49 @@
 from django.db import models
 
+
 class ProjectType(models.TextChoices):
     BACK_END = "Back-End", "Back-End"
     FRONT_END = "Front-End", "Front-End"
     IOS = "iOS", "iOS"
     ANDROID = "Android", "Android"
 
+
 class Priority(models.TextChoices):
     LOW = "Low", "Low"
     MEDIUM = "Medium", "Medium"
     HIGH = "High", "High"
 
+
 class Tag(models.TextChoices):
     BUG = "Bug", "Bug"
     FEATURE = "Feature", "Feature"
     TASK = "Task", "Task"
 
+
 class Status(models.TextChoices):
     TODO = "To Do", "To Do"
     IN_PROGRESS = "In Progress", "In Progress"
-    FINISHED = "Finished", "Finished"
\ No newline at end of file
+    FINISHED = "Finished", "Finished"
+
+
+class JobStatus(models.TextChoices):
+    PENDING = "Pending", "Pending"
+    RUNNING = "Running", "Running"
+    DONE = "Done", "Done"
+    FAILED = "Failed", "Failed"
+
+
+class ChangeType(models.TextChoices):
+    PROJECT = "project", "project"
+    ISSUE = "issue", "issue"
+    COMMENT = "comment", "comment"
+
+
+class ChangeAction(models.TextChoices):
+    UPSERT = "upsert", "upsert"
+    DELETE = "delete", "delete"
+
+
+class NotificationKind(models.TextChoices):
+    ASSIGNED = "assigned", "assigned"
+    COMMENTED = "commented", "commented"
@@ -0,0 +1,168 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from softdesk.writes import multi_atomic
+
+from .changes import record_project_tombstones
+from .constants import JobStatus
+from .inbox import remove_projects
+from .sharding import current_shard, shard_for_project, use_shard
+from .models import (
+    Project,
+    Contributor,
+    Issue,
+    Comment,
+    ArchivedIssue,
+    ArchivedComment,
+    ProjectDeletionJob,
+)
+
+logger = logging.getLogger(__name__)
+
+# Nombre de lignes supprimées par transaction : borne la durée du verrou d'écriture
+DEFAULT_BATCH_SIZE = 500
+# Délai (s) sans progression après lequel une tâche Running est reprise
+DEFAULT_STALE_AFTER = 600
+
+
+def get_stale_after():
+    """
+    Délai sans progression après lequel une tâche Running est considérée comme
+    abandonnée (settings.PROJECT_DELETION_STALE_AFTER, en secondes).
+    """
+    return timedelta(seconds=getattr(settings, "PROJECT_DELETION_STALE_AFTER", DEFAULT_STALE_AFTER))
+
+
+def schedule_project_deletion(project, user):
+    """
+    Masque immédiatement le projet et enregistre une tâche de purge.
+
+    Args:
+        project (Project): projet à supprimer.
+        user (User): utilisateur à l'origine de la demande.
+
+    Returns:
+        ProjectDeletionJob: tâche créée, au statut Pending.
+    """
+    with multi_atomic((DEFAULT_DB_ALIAS, project._state.db)):
+        project.pending_deletion = True
+        project.save(update_fields=["pending_deletion"])
+        # Le projet disparaît dès maintenant pour les clients de synchronisation
+        record_project_tombstones([project.pk])
+        remove_projects([project.pk])
+        return ProjectDeletionJob.objects.create(
+            project=project,
+            project_title=project.title,
+            requested_by=user,
+        )
+
+
+def _delete_in_batches(queryset, batch_size, job):
+    """
+    Supprime les lignes du queryset par lots de batch_size, une transaction par lot,
+    en mettant à jour la progression de la tâche après chaque lot.
+
+    La transaction couvre le shard courant (lignes supprimées) et la base par
+    défaut (progression de la tâche).
+    """
+    model = queryset.model
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        with multi_atomic((DEFAULT_DB_ALIAS, current_shard())):
+            deleted, _ = model.objects.filter(pk__in=pks).delete()
+            job.deleted_rows += deleted
+            job.save(update_fields=["deleted_rows", "updated_time"])
+
+
+def _purge_project(project_id, batch_size, job):
+    """
+    Supprime par lots les données du projet, sur le shard courant.
+    """
+    _delete_in_batches(
+        Comment.objects.filter(issue__project_id=project_id), batch_size, job
+    )
+    _delete_in_batches(
+        Issue.objects.filter(project_id=project_id), batch_size, job
+    )
+    _delete_in_batches(
+        ArchivedComment.objects.filter(issue__project_id=project_id), batch_size, job
+    )
+    _delete_in_batches(
+        ArchivedIssue.objects.filter(project_id=project_id), batch_size, job
+    )
+    _delete_in_batches(
+        Contributor.objects.filter(project_id=project_id), batch_size, job
+    )
+    with multi_atomic((DEFAULT_DB_ALIAS, current_shard())):
+        deleted, _ = Project.objects.filter(pk=project_id).delete()
+        job.deleted_rows += deleted
+        job.save(update_fields=["deleted_rows", "updated_time"])
+
+
+def run_deletion_job(job, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Purge un projet par lots : commentaires, issues (actifs puis archivés),
+    contributeurs puis le projet.
+
+    La tâche doit déjà avoir été réclamée (statut Running).
+    En cas d'erreur, la tâche passe au statut Failed avec le message associé.
+    """
+    project_id = job.project_id
+    try:
+        if project_id is not None:
+            with use_shard(shard_for_project(project_id)):
+                _purge_project(project_id, batch_size, job)
+    except Exception as exc:
+        logger.exception("Échec de la purge du projet %s", project_id)
+        job.status = JobStatus.FAILED
+        job.error = str(exc)
+        job.finished_time = timezone.now()
+        job.save(update_fields=["status", "error", "finished_time", "updated_time"])
+        return job
+
+    job.status = JobStatus.DONE
+    job.finished_time = timezone.now()
+    job.save(update_fields=["status", "finished_time", "updated_time"])
+    return job
+
+
+def process_pending_jobs(batch_size=DEFAULT_BATCH_SIZE, limit=None, stale_after=None):
+    """
+    Traite les tâches de suppression en attente, de la plus ancienne à la plus
+    récente, ainsi que celles restées Running sans progression depuis
+    stale_after (worker interrompu ; réglage par défaut si None), qui sont
+    reprises : la purge supprime alors ce qui reste du projet.
+
+    Chaque tâche est réclamée par un UPDATE conditionnel, ce qui permet de lancer
+    plusieurs workers sans traiter deux fois la même tâche.
+
+    Returns:
+        int: nombre de tâches traitées.
+    """
+    stale_before = timezone.now() - (stale_after or get_stale_after())
+    candidates = ProjectDeletionJob.objects.filter(
+        status=JobStatus.PENDING
+    ) | ProjectDeletionJob.objects.filter(
+        status=JobStatus.RUNNING, updated_time__lt=stale_before
+    )
+    candidates = candidates.order_by("created_time", "id")
+    if limit is not None:
+        candidates = candidates[:limit]
+
+    processed = 0
+    for job in candidates:
+        claimed = ProjectDeletionJob.objects.filter(
+            pk=job.pk, status=job.status, updated_time=job.updated_time
+        ).update(status=JobStatus.RUNNING, updated_time=timezone.now())
+        if not claimed:
+            continue
+        job.refresh_from_db()
+        run_deletion_job(job, batch_size=batch_size)
+        processed += 1
+    return processed
@@ -0,0 +1,100 @@
+"""
+Expansion des objets liés dans les réponses : ?expand=comments,project...
+
+Les routes de lecture (list, retrieve) des projets et des issues acceptent
+?expand= pour inclure dans la réponse les objets liés, au lieu de requêtes
+HTTP séparées. Chaque expansion ajoute au queryset un select_related ou un
+Prefetch précis (enfants triés par id, limités à settings.EXPAND_MAX_CHILDREN) :
+le nombre de requêtes SQL reste constant quel que soit le nombre d'objets.
+"""
+
+from django.conf import settings
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+from .models import Comment, Contributor, Issue
+from .sharding import select_users
+
+
+def get_max_children():
+    """
+    Nombre maximal d'enfants inclus par expansion (settings.EXPAND_MAX_CHILDREN, 20 par défaut).
+    """
+    return getattr(settings, "EXPAND_MAX_CHILDREN", 20)
+
+
+def prefetch_children(relation, queryset, to_attr):
+    """
+    Prefetch des premiers enfants (par id) d'une relation, dans l'attribut to_attr.
+    """
+    return Prefetch(
+        relation,
+        queryset=queryset.order_by("id")[:get_max_children()],
+        to_attr=to_attr,
+    )
+
+
+# Expansions disponibles par modèle : nom -> fonction appliquée au queryset
+ISSUE_EXPANSIONS = {
+    "comments": lambda qs: qs.prefetch_related(
+        prefetch_children(
+            "comments", select_users(Comment.objects.all(), "author"), "expanded_comments"
+        )
+    ),
+    "project": lambda qs: select_users(qs, "project__author"),
+}
+
+PROJECT_EXPANSIONS = {
+    "contributors": lambda qs: qs.prefetch_related(
+        prefetch_children(
+            "contributors",
+            select_users(Contributor.objects.all(), "user"),
+            "expanded_contributors",
+        )
+    ),
+    "issues": lambda qs: qs.prefetch_related(
+        prefetch_children("issues", select_users(Issue.objects.all(), "author"), "expanded_issues")
+    ),
+}
+
+
+class ExpandMixin:
+    """
+    Mixin de ViewSet : lit ?expand=, l'applique au queryset (expand_queryset)
+    et le transmet aux sérialiseurs via le contexte (clé "expand").
+
+    Les sous-classes définissent `expansions` (nom -> fonction de queryset).
+    """
+    expansions = {}
+    expand_actions = ("list", "retrieve")
+
+    def get_expand(self):
+        """
+        Returns:
+            tuple[str]: expansions demandées, pour les actions de lecture.
+
+        Raises:
+            ValidationError: si une expansion demandée n'existe pas.
+        """
+        request = getattr(self, "request", None)
+        if request is None or getattr(self, "action", None) not in self.expand_actions:
+            return ()
+        raw = request.query_params.get("expand", "")
+        names = tuple(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+        unknown = [name for name in names if name not in self.expansions]
+        if unknown:
+            raise ValidationError({
+                "expand": f"Expansions inconnues : {', '.join(unknown)}. "
+                          f"Disponibles : {', '.join(self.expansions)}."
+            })
+        return names
+
+    def expand_queryset(self, queryset):
+        for name in self.get_expand():
+            queryset = self.expansions[name](queryset)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["expand"] = self.get_expand()
+        return context
@@ -0,0 +1,90 @@
+"""
+Boîte « travail assigné » : table InboxEntry maintenue au fil des écritures.
+
+Une issue y figure tant qu'elle est assignée, non terminée, dans un projet
+actif dont l'assigné est contributeur. Les vues et traitements qui modifient
+l'assignation, le statut ou l'appartenance à un projet appellent ces fonctions
+dans la même transaction que l'écriture.
+"""
+
+from .constants import Priority, Status
+from .models import Contributor, InboxEntry, Issue
+
+# Ordre du tri : priorité haute d'abord
+PRIORITY_RANK = {
+    Priority.HIGH: 0,
+    Priority.MEDIUM: 1,
+    Priority.LOW: 2,
+}
+
+
+def _is_open(issue):
+    return (
+        issue.assignee_user_id is not None
+        and issue.status != Status.FINISHED
+        and not issue.project.pending_deletion
+        and Contributor.objects.filter(
+            user_id=issue.assignee_user_id, project_id=issue.project_id
+        ).exists()
+    )
+
+
+def _entry(issue):
+    return InboxEntry(
+        user_id=issue.assignee_user_id,
+        issue_id=issue.pk,
+        project_id=issue.project_id,
+        priority_rank=PRIORITY_RANK.get(issue.priority, len(PRIORITY_RANK)),
+        issue_created_time=issue.created_time,
+    )
+
+
+def sync_issue(issue):
+    """
+    Ajoute, met à jour ou retire l'entrée d'une issue après une écriture.
+    """
+    if not _is_open(issue):
+        InboxEntry.objects.filter(issue_id=issue.pk).delete()
+        return
+    entry = _entry(issue)
+    InboxEntry.objects.update_or_create(
+        issue_id=issue.pk,
+        defaults={
+            "user_id": entry.user_id,
+            "project_id": entry.project_id,
+            "priority_rank": entry.priority_rank,
+            "issue_created_time": entry.issue_created_time,
+        },
+    )
+
+
+def remove_issues(issue_ids):
+    """
+    Retire les entrées d'un lot d'issues (désassignées en masse, par exemple).
+    """
+    InboxEntry.objects.filter(issue_id__in=issue_ids).delete()
+
+
+def remove_projects(project_ids, user_ids=None):
+    """
+    Retire les entrées des projets donnés, pour tous ou pour certains utilisateurs
+    (projet en attente de suppression, contributeurs retirés).
+    """
+    entries = InboxEntry.objects.filter(project_id__in=project_ids)
+    if user_ids is not None:
+        entries = entries.filter(user_id__in=user_ids)
+    entries.delete()
+
+
+def add_contributors(project_id, user_ids):
+    """
+    Ajoute les issues ouvertes déjà assignées aux nouveaux contributeurs du projet.
+    """
+    issues = Issue.objects.filter(
+        project_id=project_id,
+        project__pending_deletion=False,
+        assignee_user_id__in=user_ids,
+    ).exclude(status=Status.FINISHED)
+    InboxEntry.objects.bulk_create(
+        [_entry(issue) for issue in issues], ignore_conflicts=True
+    )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from projects.archive import DEFAULT_BATCH_SIZE, archive_finished_issues
+
+
+class Command(BaseCommand):
+    """
+    Archive les issues terminées depuis longtemps, avec leurs commentaires.
+
+    Usage :
+        python manage.py archive_issues
+        python manage.py archive_issues --days 30 --batch-size 500
+    """
+    help = "Déplace par lots les issues terminées anciennes vers les tables d'archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Ancienneté minimale (jours sans modification) ; ISSUE_ARCHIVE_AFTER_DAYS par défaut.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Nombre d'issues déplacées par transaction.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Nombre maximal d'issues archivées pendant cette passe.",
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_finished_issues(
+            older_than_days=options["days"],
+            batch_size=options["batch_size"],
+            limit=options["limit"],
+        )
+        self.stdout.write(f"{archived} issue(s) archivée(s).")
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from utils.ids import uuid7
+
+GENERATORS = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+def benchmark_ids(generator, rows, batch_size):
+    """
+    Insère `rows` identifiants dans une table SQLite temporaire de même structure
+    que la clé primaire des commentaires (char(32), index unique implicite).
+
+    Returns:
+        tuple[float, int]: lignes insérées par seconde et taille de l'index (octets).
+    """
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(path)
+        connection.execute(
+            'CREATE TABLE "comment" ("id" char(32) NOT NULL PRIMARY KEY, "description" text NOT NULL)'
+        )
+        started = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            count = min(batch_size, rows - start)
+            with connection:
+                connection.executemany(
+                    'INSERT INTO "comment" ("id", "description") VALUES (?, ?)',
+                    [(generator().hex, "x") for _ in range(count)],
+                )
+        elapsed = time.perf_counter() - started
+        index_bytes = connection.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = 'sqlite_autoindex_comment_1'"
+        ).fetchone()[0]
+        connection.close()
+    finally:
+        os.remove(path)
+    return rows / elapsed, index_bytes
+
+
+class Command(BaseCommand):
+    """
+    Compare l'insertion de commentaires avec des clés UUIDv4 (aléatoires) et
+    UUIDv7 (ordonnées dans le temps) : débit d'insertion et taille de l'index.
+
+    Usage :
+        python manage.py benchmark_comment_ids --rows 100000 --batch-size 100
+    """
+    help = "Compare débit d'insertion et taille d'index entre clés UUIDv4 et UUIDv7."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=50000,
+            help="Nombre de lignes insérées par génération d'identifiants.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Nombre de lignes par transaction.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'clés':<6} {'lignes/s':>10} {'index (Ko)':>11}")
+        for name, generator in GENERATORS.items():
+            throughput, index_bytes = benchmark_ids(
+                generator, options["rows"], options["batch_size"]
+            )
+            self.stdout.write(f"{name:<6} {throughput:10.0f} {index_bytes / 1024:11.0f}")
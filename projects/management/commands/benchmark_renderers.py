@@ -0,0 +1,107 @@
+import gzip
+import json
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from projects.constants import Priority, Status, Tag
+from projects.models import Comment, Issue, Project
+from projects.serializers import CommentSerializer, IssueSerializer
+from utils import renderers
+from utils.ids import uuid7
+
+User = get_user_model()
+
+
+def sample_page(issues, comments_per_issue):
+    """
+    Page d'issues et de commentaires sérialisée par IssueSerializer et
+    CommentSerializer, comme une réponse de l'API (dates ISO 8601, UUID en
+    texte). Les objets sont construits en mémoire : aucune base n'est lue.
+    """
+    now = timezone.now()
+    author = User(pk=1, username="author")
+    contributor = User(pk=2, username="contributor")
+    project = Project(pk=1, title="Projet", author=author)
+    results = []
+    for index in range(issues):
+        issue = Issue(
+            pk=index + 1,
+            title=f"Issue {index}",
+            description="Description de l'issue. " * 5,
+            tag=Tag.BUG,
+            priority=Priority.HIGH,
+            status=Status.IN_PROGRESS,
+            project=project,
+            author=author,
+            assignee_user=contributor,
+            created_time=now - timedelta(minutes=index),
+            updated_time=now,
+        )
+        comments = [
+            Comment(
+                id=uuid7(),
+                description="Un commentaire. " * 3,
+                author=contributor,
+                issue=issue,
+                created_time=now,
+                updated_time=now,
+            )
+            for _ in range(comments_per_issue)
+        ]
+        data = dict(IssueSerializer(issue).data)
+        data["comments"] = CommentSerializer(comments, many=True).data
+        results.append(data)
+    return {"total_items": issues, "results": results}
+
+
+def measure(function, repeat):
+    """
+    Durée moyenne (en ms) d'un appel, et résultat du dernier appel.
+    """
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) * 1000 / repeat, result
+
+
+class Command(BaseCommand):
+    """
+    Compare JSON et MessagePack sur une grande page d'issues et de commentaires :
+    taille brute et compressée, temps d'encodage et de décodage.
+
+    Usage :
+        python manage.py benchmark_renderers --issues 100 --comments 5
+    """
+    help = "Compare taille et temps d'encodage/décodage entre JSON et MessagePack."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--issues", type=int, default=100, help="Issues dans la page.")
+        parser.add_argument("--comments", type=int, default=5, help="Commentaires par issue.")
+        parser.add_argument("--repeat", type=int, default=50, help="Répétitions par mesure.")
+
+    def handle(self, *args, **options):
+        if renderers.msgpack is None:
+            raise CommandError("msgpack n'est pas installé.")
+        data = sample_page(options["issues"], options["comments"])
+        repeat = options["repeat"]
+        json_renderer = JSONRenderer()
+
+        formats = {
+            "json": (lambda: json_renderer.render(data), json.loads),
+            "msgpack": (lambda: renderers.packb(data), renderers.unpackb),
+        }
+        self.stdout.write(
+            f"{'format':<8} {'octets':>9} {'gzip':>9} {'encodage (ms)':>14} {'décodage (ms)':>14}"
+        )
+        for name, (encode, decode) in formats.items():
+            encode_ms, payload = measure(encode, repeat)
+            decode_ms, _ = measure(lambda: decode(payload), repeat)
+            self.stdout.write(
+                f"{name:<8} {len(payload):9d} {len(gzip.compress(payload)):9d} "
+                f"{encode_ms:14.2f} {decode_ms:14.2f}"
+            )
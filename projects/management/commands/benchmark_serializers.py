@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+from rest_framework.utils.serializer_helpers import BindingDict
+
+from projects.serializers import (
+    CommentSerializer,
+    ContributorSerializer,
+    IssueSerializer,
+    NestedIssueSerializer,
+    ProjectSerializer,
+)
+
+SERIALIZERS = {
+    "issue (flat)": IssueSerializer,
+    "issue (nested)": NestedIssueSerializer,
+    "comment": CommentSerializer,
+    "project": ProjectSerializer,
+    "contributor": ContributorSerializer,
+}
+
+
+def uncached_fields(serializer_class):
+    """
+    Champs construits comme avant le cache : ModelSerializer.get_fields à
+    chaque instanciation, puis liaison au sérialiseur.
+    """
+    serializer = serializer_class()
+    fields = BindingDict(serializer)
+    for name, field in serializers.ModelSerializer.get_fields(serializer).items():
+        fields[name] = field
+    return fields
+
+
+def cached_fields(serializer_class):
+    return serializer_class().fields
+
+
+def per_instance(build, serializer_class, instances):
+    """
+    Durée moyenne (µs) d'une instanciation avec construction des champs.
+    """
+    build(serializer_class)
+    started = time.perf_counter()
+    for _ in range(instances):
+        build(serializer_class)
+    return (time.perf_counter() - started) / instances * 1e6
+
+
+class Command(BaseCommand):
+    """
+    Mesure le coût d'instanciation des sérialiseurs (construction des champs),
+    sans cache (ModelSerializer.get_fields à chaque fois) et avec le cache par
+    classe (CachedFieldsMixin).
+
+    Usage :
+        python manage.py benchmark_serializers --instances 2000
+    """
+    help = "Compare le coût d'instanciation des sérialiseurs avant et après le cache des champs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--instances",
+            type=int,
+            default=2000,
+            help="Nombre d'instanciations mesurées par sérialiseur.",
+        )
+
+    def handle(self, *args, **options):
+        instances = options["instances"]
+        self.stdout.write(f"{'sérialiseur':<16} {'avant (µs)':>11} {'après (µs)':>11} {'gain':>6}")
+        for name, serializer_class in SERIALIZERS.items():
+            before = per_instance(uncached_fields, serializer_class, instances)
+            after = per_instance(cached_fields, serializer_class, instances)
+            self.stdout.write(
+                f"{name:<16} {before:>11.1f} {after:>11.1f} {before / after:>5.1f}x"
+            )
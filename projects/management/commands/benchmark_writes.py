@@ -0,0 +1,146 @@
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+
+from projects.changes import record_change
+from projects.constants import Priority, Tag
+from projects.models import Contributor, Issue, Project
+from projects.outbox import enqueue_event
+from softdesk.writes import GroupCommitter, retry_on_lock
+
+User = get_user_model()
+
+
+def create_issue(project_id, user, title):
+    """
+    Écriture type d'IssueViewSet.perform_create : lecture du projet, puis
+    création de l'issue, de son entrée de journal et de son événement.
+    """
+    project = Project.objects.get(pk=project_id)
+    issue = Issue.objects.create(
+        title=title, description="d", tag=Tag.BUG, priority=Priority.LOW,
+        project=project, author=user,
+    )
+    record_change(issue)
+    enqueue_event(issue, "created")
+    return issue.pk
+
+
+def plain_atomic(function):
+    with transaction.atomic():
+        return function()
+
+
+def benchmark_mode(transaction_mode, run, threads, writes, project_id, user):
+    """
+    Lance `threads` écrivains concurrents de `writes` écritures chacun.
+
+    Returns:
+        tuple[int, int, float]: écritures réussies, écritures en erreur, durée (s).
+    """
+    connection.settings_dict["OPTIONS"]["transaction_mode"] = transaction_mode
+    # Les nouvelles connexions (une par thread) prennent le mode configuré
+    connections.close_all()
+    barrier = threading.Barrier(threads)
+
+    def writer(index):
+        succeeded = failed = 0
+        barrier.wait()
+        try:
+            for number in range(writes):
+                try:
+                    run(lambda: create_issue(project_id, user, f"Issue {index}-{number}"))
+                    succeeded += 1
+                except OperationalError:
+                    failed += 1
+        finally:
+            connections.close_all()
+        return succeeded, failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(writer, range(threads)))
+    elapsed = time.perf_counter() - started
+    return sum(ok for ok, _ in results), sum(failed for _, failed in results), elapsed
+
+
+class Command(BaseCommand):
+    """
+    Mesure, sur une base SQLite temporaire, les créations d'issues concurrentes
+    selon la coordination des écritures (voir softdesk/writes.py) :
+
+    - deferred  : transaction DEFERRED simple (comportement par défaut de SQLite) ;
+    - immediate : BEGIN IMMEDIATE et nouvelles tentatives avec jitter ;
+    - group     : BEGIN IMMEDIATE et regroupement des écritures (group commit).
+
+    Usage :
+        python manage.py benchmark_writes --threads 8 --writes 50
+    """
+    help = "Compare taux d'erreur et débit des écritures concurrentes sur SQLite."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Nombre d'écrivains concurrents.",
+        )
+        parser.add_argument(
+            "--writes",
+            type=int,
+            default=50,
+            help="Nombre d'écritures par écrivain.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=5,
+            help="Délai d'attente du verrou SQLite (s).",
+        )
+
+    def handle(self, *args, **options):
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        settings_dict = connection.settings_dict
+        previous_test = dict(settings_dict["TEST"])
+        previous_options = dict(settings_dict["OPTIONS"])
+        settings_dict["TEST"]["NAME"] = path
+        settings_dict["OPTIONS"]["timeout"] = options["timeout"]
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            user = User.objects.create_user(username="benchmark", password="pass", age=20)
+            project = Project.objects.create(
+                title="Benchmark", description="d", type="Back-End", author=user
+            )
+            Contributor.objects.create(user=user, project=project)
+
+            committer = GroupCommitter()
+            modes = {
+                "deferred": ("DEFERRED", plain_atomic),
+                "immediate": ("IMMEDIATE", retry_on_lock),
+                "group": ("IMMEDIATE", committer.submit),
+            }
+            self.stdout.write(
+                f"{'mode':<10} {'écritures':>10} {'erreurs':>8} {'taux':>7} {'écritures/s':>12}"
+            )
+            for name, (transaction_mode, run) in modes.items():
+                succeeded, failed, elapsed = benchmark_mode(
+                    transaction_mode, run, options["threads"], options["writes"], project.pk, user
+                )
+                rate = failed / (succeeded + failed) * 100
+                self.stdout.write(
+                    f"{name:<10} {succeeded:>10} {failed:>8} {rate:>6.1f}% {succeeded / elapsed:>12.0f}"
+                )
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            settings_dict["TEST"] = previous_test
+            settings_dict["OPTIONS"] = previous_options
+            if os.path.exists(path):
+                os.remove(path)
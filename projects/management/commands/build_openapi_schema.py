@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from softdesk.schema import get_schema_path, write_schema
+
+
+class Command(BaseCommand):
+    """
+    Génère le schéma OpenAPI sous forme d'artefact statique.
+
+    Usage :
+        python manage.py build_openapi_schema
+        python manage.py build_openapi_schema --output build/openapi.json
+    """
+    help = "Génère le schéma OpenAPI une fois pour toutes (servi ensuite depuis la mémoire)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Fichier de sortie (settings.OPENAPI_SCHEMA_PATH par défaut).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["output"] or get_schema_path()
+        if path is None:
+            raise CommandError("Aucun chemin : passez --output ou définissez OPENAPI_SCHEMA_PATH.")
+        document = write_schema(path)
+        self.stdout.write(
+            f"Schéma écrit dans {path} ({len(document.content)} octets, "
+            f"ETag {document.etag}, généré en {document.generation_seconds * 1000:.1f} ms)."
+        )
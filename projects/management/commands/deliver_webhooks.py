@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects.webhooks import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_TIMEOUT,
+    deliver_pending,
+    prune_delivered_events,
+)
+
+
+class Command(BaseCommand):
+    """
+    Worker de livraison des webhooks à partir de l'outbox.
+
+    Usage :
+        python manage.py deliver_webhooks
+        python manage.py deliver_webhooks --loop --interval 1 --concurrency 8
+    """
+    help = "Livre par lots les événements de l'outbox aux webhooks enregistrés."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Nombre maximal d'événements par POST.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help="Nombre maximal de webhooks appelés en parallèle.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=DEFAULT_TIMEOUT,
+            help="Délai maximal (en secondes) d'un appel HTTP.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Tourne en continu au lieu d'effectuer une seule passe.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Pause (en secondes) entre deux passes sans travail en mode --loop.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Supprime les événements livrés à tous les webhooks après chaque passe.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = deliver_pending(
+                batch_size=options["batch_size"],
+                concurrency=options["concurrency"],
+                timeout=options["timeout"],
+            )
+            if result["delivered"] or result["failed"]:
+                self.stdout.write(
+                    f"{result['delivered']} événement(s) livré(s), "
+                    f"{result['failed']} lot(s) en échec."
+                )
+            if options["prune"]:
+                prune_delivered_events()
+            if not options["loop"]:
+                break
+            # Enchaîne immédiatement tant qu'il reste des lots complets à livrer
+            if not result["delivered"]:
+                time.sleep(options["interval"])
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from softdesk.startup import measure_cold_start
+
+
+class Command(BaseCommand):
+    """
+    Rapport du démarrage à froid : django.setup(), résolveur d'URL et imports.
+
+    Usage :
+        python manage.py profile_startup
+        python manage.py profile_startup --settings-module softdesk.settings_api --top 30
+    """
+    help = "Mesure le démarrage à froid d'un worker et liste les imports les plus coûteux."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-module",
+            default=None,
+            help="Module de settings à mesurer (celui du processus courant par défaut).",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=25,
+            help="Nombre de modules affichés.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["cumulative", "self"],
+            default="cumulative",
+            help="Tri par temps cumulé (module et dépendances) ou propre.",
+        )
+
+    def handle(self, *args, **options):
+        report = measure_cold_start(options["settings_module"])
+        self.stdout.write(f"Settings          : {report.settings_module}")
+        self.stdout.write(f"django.setup()    : {report.setup_seconds * 1000:8.1f} ms")
+        self.stdout.write(f"Résolveur d'URL   : {report.urls_seconds * 1000:8.1f} ms")
+        self.stdout.write(f"Total             : {report.total_seconds * 1000:8.1f} ms")
+        self.stdout.write(f"Modules importés  : {len(report.imports)}")
+        self.stdout.write("")
+        self.stdout.write(f"{'self (ms)':>10} {'cumulé (ms)':>12}  module")
+        for module in report.top(options["top"], key=f"{options['sort']}_us"):
+            self.stdout.write(
+                f"{module.self_us / 1000:10.1f} {module.cumulative_us / 1000:12.1f}  {module.name}"
+            )
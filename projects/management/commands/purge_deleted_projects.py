@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects.deletion import DEFAULT_BATCH_SIZE, process_pending_jobs
+
+
+class Command(BaseCommand):
+    """
+    Worker de purge des projets marqués pour suppression.
+
+    Usage :
+        python manage.py purge_deleted_projects
+        python manage.py purge_deleted_projects --loop --interval 5
+    """
+    help = "Purge par lots les projets en attente de suppression."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Nombre de lignes supprimées par transaction.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Tourne en continu au lieu de traiter la file une seule fois.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Pause (en secondes) entre deux passes en mode --loop.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_pending_jobs(batch_size=options["batch_size"])
+            if processed:
+                self.stdout.write(f"{processed} projet(s) purgé(s).")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
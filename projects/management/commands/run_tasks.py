@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects.background import (
+    DEFAULT_CONCURRENCY,
+    discover_tasks,
+    run_pending,
+)
+
+
+class Command(BaseCommand):
+    """
+    Worker de la file de tâches d'arrière-plan (table BackgroundTask).
+
+    Usage :
+        python manage.py run_tasks
+        python manage.py run_tasks --loop --concurrency 8 --interval 1
+    """
+    help = "Exécute les tâches d'arrière-plan en attente dans un pool de threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help="Nombre de tâches exécutées en parallèle (taille du pool de threads).",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=int,
+            default=None,
+            help="Durée (en secondes) de réservation d'une tâche avant qu'elle "
+                 "puisse être reprise (défaut : settings.TASK_VISIBILITY_TIMEOUT).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Tourne en continu au lieu d'effectuer une seule passe.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Pause (en secondes) entre deux passes sans travail en mode --loop.",
+        )
+
+    def handle(self, *args, **options):
+        discover_tasks()
+        while True:
+            result = run_pending(
+                concurrency=options["concurrency"],
+                visibility_timeout=options["visibility_timeout"],
+            )
+            if result["succeeded"] or result["failed"]:
+                self.stdout.write(
+                    f"{result['succeeded']} tâche(s) réussie(s), "
+                    f"{result['failed']} en échec."
+                )
+            if not options["loop"]:
+                break
+            # Enchaîne immédiatement tant que des tâches sont disponibles
+            if not (result["succeeded"] or result["failed"]):
+                time.sleep(options["interval"])
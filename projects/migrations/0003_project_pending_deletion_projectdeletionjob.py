@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='pending_deletion',
+            field=models.BooleanField(db_index=True, default=False, help_text='Si vrai, le projet est masqué et sera purgé en arrière-plan'),
+        ),
+        migrations.CreateModel(
+            name='ProjectDeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_title', models.CharField(help_text='Titre du projet au moment de la demande', max_length=128)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Done', 'Done'), ('Failed', 'Failed')], db_index=True, default='Pending', help_text='Statut de la tâche de suppression', max_length=10)),
+                ('deleted_rows', models.PositiveBigIntegerField(default=0, help_text='Nombre de lignes supprimées')),
+                ('error', models.TextField(blank=True, help_text="Message d'erreur si la purge a échoué")),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text='Date et heure de la demande de suppression')),
+                ('finished_time', models.DateTimeField(blank=True, help_text='Date et heure de fin de la purge', null=True)),
+                ('project', models.ForeignKey(blank=True, help_text='Projet à supprimer', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion_jobs', to='projects.project')),
+                ('requested_by', models.ForeignKey(help_text='Utilisateur ayant demandé la suppression', on_delete=django.db.models.deletion.CASCADE, related_name='project_deletion_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_pending_deletion_projectdeletionjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text='Date et heure de dernière modification du commentaire'),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text="Date et heure de dernière modification de l'issue"),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text='Date et heure de dernière modification du projet'),
+        ),
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.BigIntegerField(blank=True, help_text='Projet concerné par la modification', null=True)),
+                ('type', models.CharField(choices=[('project', 'project'), ('issue', 'issue'), ('comment', 'comment')], help_text="Type d'objet modifié", max_length=10)),
+                ('object_id', models.CharField(help_text="Identifiant de l'objet modifié", max_length=36)),
+                ('action', models.CharField(choices=[('upsert', 'upsert'), ('delete', 'delete')], help_text='Nature de la modification', max_length=10)),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text='Date et heure de la modification')),
+                ('user', models.ForeignKey(blank=True, help_text="Destinataire unique de l'entrée (optionnel)", null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project_id', 'id'], name='projects_ch_project_0feaa4_idx'), models.Index(fields=['user', 'id'], name='projects_ch_user_id_7c128b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_comment_updated_time_issue_updated_time_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(help_text="Type d'événement (ex. issue.created)", max_length=32)),
+                ('project_id', models.BigIntegerField(db_index=True, help_text="Projet concerné par l'événement")),
+                ('object_id', models.CharField(help_text="Identifiant de l'objet concerné", max_length=36)),
+                ('payload', models.JSONField(default=dict, help_text="Représentation de l'objet au moment de l'événement")),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text="Date et heure de l'événement")),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WebhookEndpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(help_text='URL appelée en POST avec les événements')),
+                ('secret', models.CharField(blank=True, help_text='Clé de signature HMAC-SHA256 du corps', max_length=128)),
+                ('is_active', models.BooleanField(default=True, help_text="Si faux, aucune livraison n'est tentée")),
+                ('last_event_id', models.BigIntegerField(default=0, help_text='Dernier événement livré avec succès')),
+                ('failures', models.PositiveIntegerField(default=0, help_text="Nombre d'échecs consécutifs")),
+                ('next_attempt_time', models.DateTimeField(blank=True, help_text='Date et heure de la prochaine tentative après un échec', null=True)),
+                ('last_error', models.TextField(blank=True, help_text='Dernière erreur de livraison')),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text='Date et heure de création du webhook')),
+                ('project', models.ForeignKey(blank=True, help_text='Projet surveillé (tous les projets si vide)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='webhooks', to='projects.project')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:24
+
+import utils.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Les nouveaux commentaires reçoivent un UUIDv7. Seule la valeur par défaut
+    (côté Python) change : la colonne est identique, les identifiants UUIDv4
+    existants restent valides et la table n'est pas reconstruite.
+    """
+
+    dependencies = [
+        ('projects', '0005_outboxevent_webhookendpoint'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='comment',
+                    name='id',
+                    field=models.UUIDField(default=utils.ids.uuid7, editable=False, help_text='Identifiant unique du commentaire, ordonné dans le temps (UUIDv7)', primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
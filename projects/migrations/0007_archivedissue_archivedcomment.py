@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_comment_uuid7'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedIssue',
+            fields=[
+                ('id', models.BigIntegerField(help_text="Identifiant de l'issue d'origine", primary_key=True, serialize=False)),
+                ('title', models.CharField(help_text="Titre de l'issue", max_length=128)),
+                ('description', models.TextField(help_text="Description détaillée de l'issue")),
+                ('tag', models.CharField(choices=[('Bug', 'Bug'), ('Feature', 'Feature'), ('Task', 'Task')], help_text="Étiquette de l'issue", max_length=10)),
+                ('priority', models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High')], help_text='Niveau de priorité', max_length=10)),
+                ('status', models.CharField(choices=[('To Do', 'To Do'), ('In Progress', 'In Progress'), ('Finished', 'Finished')], help_text="Statut de l'issue au moment de l'archivage", max_length=20)),
+                ('created_time', models.DateTimeField(help_text="Date et heure de création de l'issue")),
+                ('updated_time', models.DateTimeField(help_text="Date et heure de dernière modification de l'issue")),
+                ('archived_time', models.DateTimeField(auto_now_add=True, help_text="Date et heure de l'archivage")),
+                ('assignee_user', models.ForeignKey(blank=True, help_text="Utilisateur assigné à l'issue (optionnel)", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_issues_assigned', to=settings.AUTH_USER_MODEL)),
+                ('author', models.ForeignKey(help_text="Utilisateur ayant créé l'issue", on_delete=django.db.models.deletion.CASCADE, related_name='archived_issues_created', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(help_text="Projet auquel l'issue appartient", on_delete=django.db.models.deletion.CASCADE, related_name='archived_issues', to='projects.project')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.UUIDField(help_text="Identifiant du commentaire d'origine", primary_key=True, serialize=False)),
+                ('description', models.TextField(help_text='Texte du commentaire')),
+                ('created_time', models.DateTimeField(help_text='Date et heure de création du commentaire')),
+                ('updated_time', models.DateTimeField(help_text='Date et heure de dernière modification du commentaire')),
+                ('author', models.ForeignKey(help_text='Utilisateur auteur du commentaire', on_delete=django.db.models.deletion.CASCADE, related_name='archived_comments', to=settings.AUTH_USER_MODEL)),
+                ('issue', models.ForeignKey(help_text='Issue archivée à laquelle le commentaire est lié', on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='projects.archivedissue')),
+            ],
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+
+
+def fill_inbox(apps, schema_editor):
+    """
+    Remplit la boîte à partir des issues ouvertes déjà assignées.
+    """
+    Issue = apps.get_model("projects", "Issue")
+    Contributor = apps.get_model("projects", "Contributor")
+    InboxEntry = apps.get_model("projects", "InboxEntry")
+    issues = Issue.objects.filter(
+        assignee_user__isnull=False, project__pending_deletion=False
+    ).exclude(status="Finished").filter(
+        Exists(
+            Contributor.objects.filter(
+                user_id=OuterRef("assignee_user_id"), project_id=OuterRef("project_id")
+            )
+        )
+    )
+    InboxEntry.objects.bulk_create(
+        (
+            InboxEntry(
+                user_id=issue.assignee_user_id,
+                issue_id=issue.pk,
+                project_id=issue.project_id,
+                priority_rank=PRIORITY_RANK.get(issue.priority, 3),
+                issue_created_time=issue.created_time,
+            )
+            for issue in issues.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_archivedissue_archivedcomment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority_rank', models.PositiveSmallIntegerField(help_text='Rang de priorité : 0 = High, 1 = Medium, 2 = Low')),
+                ('issue_created_time', models.DateTimeField(help_text="Date de création de l'issue, pour le tri par ancienneté")),
+                ('issue', models.OneToOneField(help_text='Issue assignée', on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entry', to='projects.issue')),
+                ('project', models.ForeignKey(help_text="Projet de l'issue", on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project')),
+                ('user', models.ForeignKey(help_text='Utilisateur assigné', on_delete=django.db.models.deletion.CASCADE, related_name='inbox', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'priority_rank', 'issue_created_time', 'issue'], name='inbox_user_order_idx')],
+            },
+        ),
+        migrations.RunPython(fill_inbox, migrations.RunPython.noop),
+    ]
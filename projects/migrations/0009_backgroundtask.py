@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_inboxentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Nom de la tâche enregistrée', max_length=100)),
+                ('payload', models.JSONField(default=dict, help_text='Arguments nommés de la tâche')),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Done', 'Done'), ('Failed', 'Failed')], default='Pending', help_text='Statut de la tâche', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text="Nombre d'exécutions commencées")),
+                ('max_attempts', models.PositiveIntegerField(default=5, help_text="Nombre maximal d'exécutions avant l'échec définitif")),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='Date à partir de laquelle la tâche peut être exécutée')),
+                ('locked_by', models.CharField(blank=True, help_text='Jeton du worker qui exécute la tâche', max_length=64)),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Fin de la réservation par le worker (délai de visibilité)', null=True)),
+                ('last_error', models.TextField(blank=True, help_text="Dernière erreur d'exécution")),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text='Date et heure de création de la tâche')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'run_after'], name='task_ready_idx'), models.Index(fields=['status', 'locked_until'], name='task_expired_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_backgroundtask'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('assigned', 'assigned'), ('commented', 'commented')], help_text='Type de notification', max_length=10)),
+                ('excerpt', models.CharField(blank=True, help_text='Extrait du commentaire', max_length=200)),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text="Date et heure de l'action")),
+                ('sending_time', models.DateTimeField(blank=True, help_text="Début de l'envoi du résumé contenant la notification", null=True)),
+                ('actor', models.ForeignKey(blank=True, help_text="Auteur de l'action notifiée", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('issue', models.ForeignKey(help_text='Issue concernée', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.issue')),
+                ('user', models.ForeignKey(help_text='Destinataire de la notification', on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sending_time', 'user', 'created_time'], name='notification_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, migrations, models
+
+
+def fill_directory(apps, schema_editor):
+    """
+    Inscrit les projets existants dans l'annuaire, sur la base par défaut,
+    pour que les identifiants suivants ne les recouvrent pas.
+    """
+    if schema_editor.connection.alias != DEFAULT_DB_ALIAS:
+        return
+    Project = apps.get_model("projects", "Project")
+    ProjectShard = apps.get_model("projects", "ProjectShard")
+    ProjectShard.objects.bulk_create(
+        [ProjectShard(id=pk, alias=DEFAULT_DB_ALIAS) for pk in Project.objects.values_list("pk", flat=True)],
+        batch_size=500,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_notification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text='Alias de la base de données du projet', max_length=64)),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text="Date et heure de l'attribution du shard")),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='archivedissue',
+            name='project',
+            field=models.ForeignKey(db_constraint=False, help_text="Projet auquel l'issue appartient", on_delete=django.db.models.deletion.CASCADE, related_name='archived_issues', to='projects.project'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='author',
+            field=models.ForeignKey(db_constraint=False, help_text='Utilisateur auteur du commentaire', on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='contributor',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, help_text='Utilisateur contributeur', on_delete=django.db.models.deletion.CASCADE, related_name='contributions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='inboxentry',
+            name='issue',
+            field=models.OneToOneField(db_constraint=False, help_text='Issue assignée', on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entry', to='projects.issue'),
+        ),
+        migrations.AlterField(
+            model_name='inboxentry',
+            name='project',
+            field=models.ForeignKey(db_constraint=False, help_text="Projet de l'issue", on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project'),
+        ),
+        migrations.AlterField(
+            model_name='issue',
+            name='assignee_user',
+            field=models.ForeignKey(blank=True, db_constraint=False, help_text="Utilisateur assigné pour traiter l'issue (optionnel)", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='issues_assigned', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='issue',
+            name='author',
+            field=models.ForeignKey(db_constraint=False, help_text="Utilisateur ayant créé l'issue", on_delete=django.db.models.deletion.CASCADE, related_name='issues_created', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='issue',
+            field=models.ForeignKey(db_constraint=False, help_text='Issue concernée', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.issue'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='author',
+            field=models.ForeignKey(db_constraint=False, help_text='Utilisateur créateur du projet', on_delete=django.db.models.deletion.CASCADE, related_name='projects', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='projectdeletionjob',
+            name='project',
+            field=models.ForeignKey(blank=True, db_constraint=False, help_text='Projet à supprimer', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion_jobs', to='projects.project'),
+        ),
+        migrations.AlterField(
+            model_name='webhookendpoint',
+            name='project',
+            field=models.ForeignKey(blank=True, db_constraint=False, help_text='Projet surveillé (tous les projets si vide)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='webhooks', to='projects.project'),
+        ),
+        migrations.RunPython(fill_directory, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_projectshard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectdeletionjob',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, help_text='Date et heure de la dernière progression'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:56
+
+from django.db import DEFAULT_DB_ALIAS, migrations, models
+
+
+def fill_directories(apps, schema_editor):
+    """
+    Inscrit les issues (actives et archivées) et les contributeurs existants
+    dans leurs annuaires, sur la base par défaut, pour que les identifiants
+    suivants ne les recouvrent pas.
+    """
+    if schema_editor.connection.alias != DEFAULT_DB_ALIAS:
+        return
+    directories = {
+        "IssueShard": ["Issue", "ArchivedIssue"],
+        "ContributorShard": ["Contributor"],
+    }
+    for directory_name, model_names in directories.items():
+        directory = apps.get_model("projects", directory_name)
+        pks = set()
+        for model_name in model_names:
+            pks.update(apps.get_model("projects", model_name).objects.values_list("pk", flat=True))
+        directory.objects.bulk_create(
+            [directory(id=pk, alias=DEFAULT_DB_ALIAS) for pk in sorted(pks)],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_projectdeletionjob_updated_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContributorShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text="Alias de la base de données de l'objet", max_length=64)),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text="Date et heure de l'attribution du shard")),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='IssueShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text="Alias de la base de données de l'objet", max_length=64)),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text="Date et heure de l'attribution du shard")),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='projectshard',
+            name='alias',
+            field=models.CharField(help_text="Alias de la base de données de l'objet", max_length=64),
+        ),
+        migrations.RunPython(fill_directories, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,17 @@
-import uuid
-from django.db import models
+from django.db import models, router
+from django.utils import timezone
 from django.contrib.auth import get_user_model
-from .constants import ProjectType, Priority, Tag, Status
+from utils.ids import uuid7
+from .constants import (
+    ProjectType,
+    Priority,
+    Tag,
+    Status,
+    JobStatus,
+    ChangeType,
+    ChangeAction,
+    NotificationKind,
+)
 
 # Récupère le modèle utilisateur configuré pour ce projet
 User = get_user_model()
@@ -17,6 +27,8 @@ class Project(models.Model):
         type (str) : catégorie du projet, parmi ProjectType.
         author (User) : utilisateur ayant créé le projet.
         created_time (datetime) : horodatage de création du projet.
+        updated_time (datetime) : horodatage de dernière modification.
+        pending_deletion (bool) : projet en attente de suppression différée.
     """
     title = models.CharField(
         max_length=128,
@@ -33,6 +45,7 @@ class Project(models.Model):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="projects",
         help_text="Utilisateur créateur du projet"
     )
@@ -40,6 +53,30 @@ class Project(models.Model):
         auto_now_add=True,
         help_text="Date et heure de création du projet"
     )
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        help_text="Date et heure de dernière modification du projet"
+    )
+    pending_deletion = models.BooleanField(
+        default=False,
+        db_index=True,
+        help_text="Si vrai, le projet est masqué et sera purgé en arrière-plan"
+    )
+
+    def save(self, *args, **kwargs):
+        """
+        À la création, l'identifiant et la base (shard) du projet sont attribués
+        par l'annuaire ProjectShard (voir projects/sharding.py).
+        """
+        if self.pk is None and self._state.adding:
+            from .sharding import allocate_project
+
+            self.pk, alias = allocate_project()
+            # Prime sur la base choisie par le manager (QuerySet.create passe using)
+            kwargs["using"] = alias
+            kwargs.setdefault("force_insert", True)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """
@@ -48,7 +85,90 @@ class Project(models.Model):
         return self.title
 
 
-class Contributor(models.Model):
+class ShardDirectory(models.Model):
+    """
+    Annuaire des shards d'un modèle shardé, stocké sur la base par défaut.
+
+    Sa clé primaire sert de séquence globale : les identifiants de ce modèle
+    sont uniques sur l'ensemble des shards, et l'annuaire indique la base de
+    chaque objet sans interroger tous les shards.
+
+    Attributs :
+        id (int) : identifiant de l'objet.
+        alias (str) : alias de la base (settings.DATABASES) qui contient l'objet.
+        created_time (datetime) : horodatage de l'attribution.
+    """
+    alias = models.CharField(
+        max_length=64,
+        help_text="Alias de la base de données de l'objet"
+    )
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de l'attribution du shard"
+    )
+
+    class Meta:
+        abstract = True
+
+
+class ProjectShard(ShardDirectory):
+    """
+    Annuaire des projets : la base d'un projet contient aussi ses
+    contributeurs, ses issues et leurs commentaires.
+    """
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de l'entrée d'annuaire.
+        """
+        return f"projet {self.id} → {self.alias}"
+
+
+class ContributorShard(ShardDirectory):
+    """
+    Annuaire des contributeurs (identifiants globaux des contributeurs).
+    """
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de l'entrée d'annuaire.
+        """
+        return f"contributeur {self.id} → {self.alias}"
+
+
+class IssueShard(ShardDirectory):
+    """
+    Annuaire des issues (identifiants globaux des issues, conservés à l'archivage).
+    """
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de l'entrée d'annuaire.
+        """
+        return f"issue {self.id} → {self.alias}"
+
+
+class GloballyNumberedModel(models.Model):
+    """
+    Modèle shardé dont l'identifiant est attribué à la création par son
+    annuaire (voir projects/sharding.py), sur la base où l'objet est écrit.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.pk is None and self._state.adding:
+            from .sharding import allocate_ids
+
+            alias = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+            self.pk = allocate_ids(type(self), alias)[0]
+            kwargs["using"] = alias
+            kwargs.setdefault("force_insert", True)
+        super().save(*args, **kwargs)
+
+
+class Contributor(GloballyNumberedModel):
     """
     Associe un utilisateur à un projet en tant que contributeur.
 
@@ -60,6 +180,7 @@ class Contributor(models.Model):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="contributions",
         help_text="Utilisateur contributeur"
     )
@@ -88,7 +209,7 @@ class Contributor(models.Model):
         return f"{self.user.username} -> {self.project.title}"
 
 
-class Issue(models.Model):
+class Issue(GloballyNumberedModel):
     """
     Modélise une issue (ticket) liée à un projet.
 
@@ -102,6 +223,7 @@ class Issue(models.Model):
         author (User) : utilisateur ayant créé l'issue.
         assignee_user (User|None) : utilisateur assigné (facultatif).
         created_time (datetime) : horodatage de création de l'issue.
+        updated_time (datetime) : horodatage de dernière modification.
     """
     title = models.CharField(
         max_length=128,
@@ -136,12 +258,14 @@ class Issue(models.Model):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="issues_created",
         help_text="Utilisateur ayant créé l'issue"
     )
     assignee_user = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
+        db_constraint=False,
         null=True,
         blank=True,
         related_name="issues_assigned",
@@ -152,6 +276,11 @@ class Issue(models.Model):
         auto_now_add=True,
         help_text="Date et heure de création de l'issue"
     )
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        help_text="Date et heure de dernière modification de l'issue"
+    )
 
     def __str__(self):
         """
@@ -165,17 +294,19 @@ class Comment(models.Model):
     Représente un commentaire attaché à une issue.
 
     Attributs :
-        id (UUID) : identifiant unique du commentaire.
+        id (UUID) : identifiant unique du commentaire (UUIDv7, croissant à la création ;
+            les identifiants UUIDv4 antérieurs restent valides).
         description (str) : contenu du commentaire.
         author (User) : utilisateur ayant écrit le commentaire.
         issue (Issue) : issue associée au commentaire.
         created_time (datetime) : horodatage de création du commentaire.
+        updated_time (datetime) : horodatage de dernière modification.
     """
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
-        help_text="Identifiant unique du commentaire"
+        help_text="Identifiant unique du commentaire, ordonné dans le temps (UUIDv7)"
     )
     description = models.TextField(
         help_text="Texte du commentaire"
@@ -183,6 +314,7 @@ class Comment(models.Model):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="comments",
         help_text="Utilisateur auteur du commentaire"
     )
@@ -196,9 +328,592 @@ class Comment(models.Model):
         auto_now_add=True,
         help_text="Date et heure de création du commentaire"
     )
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        help_text="Date et heure de dernière modification du commentaire"
+    )
 
     def __str__(self):
         """
         Retourne une représentation concise du commentaire.
         """
         return f"Commentaire de {self.author.username} sur {self.issue.title}"
+
+
+class ArchivedIssue(models.Model):
+    """
+    Issue terminée déplacée dans la table d'archive (voir projects/archive.py).
+
+    Les issues terminées depuis longtemps quittent la table Issue pour que
+    ses index restent compacts ; elles restent consultables en lecture seule
+    via les routes de détail. L'identifiant d'origine est conservé.
+
+    Attributs :
+        id (int) : identifiant de l'issue d'origine.
+        title, description, tag, priority, status : copiés de l'issue.
+        project (Project) : projet parent de l'issue.
+        author (User) : utilisateur ayant créé l'issue.
+        assignee_user (User|None) : utilisateur assigné (facultatif).
+        created_time (datetime) : horodatage de création de l'issue.
+        updated_time (datetime) : horodatage de dernière modification de l'issue.
+        archived_time (datetime) : horodatage de l'archivage.
+    """
+    id = models.BigIntegerField(
+        primary_key=True,
+        help_text="Identifiant de l'issue d'origine"
+    )
+    title = models.CharField(
+        max_length=128,
+        help_text="Titre de l'issue"
+    )
+    description = models.TextField(
+        help_text="Description détaillée de l'issue"
+    )
+    tag = models.CharField(
+        max_length=10,
+        choices=Tag.choices,
+        help_text="Étiquette de l'issue"
+    )
+    priority = models.CharField(
+        max_length=10,
+        choices=Priority.choices,
+        help_text="Niveau de priorité"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        help_text="Statut de l'issue au moment de l'archivage"
+    )
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="archived_issues",
+        help_text="Projet auquel l'issue appartient"
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="archived_issues_created",
+        help_text="Utilisateur ayant créé l'issue"
+    )
+    assignee_user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_issues_assigned",
+        help_text="Utilisateur assigné à l'issue (optionnel)"
+    )
+    created_time = models.DateTimeField(
+        help_text="Date et heure de création de l'issue"
+    )
+    updated_time = models.DateTimeField(
+        help_text="Date et heure de dernière modification de l'issue"
+    )
+    archived_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de l'archivage"
+    )
+
+    def __str__(self):
+        """
+        Retourne le titre de l'issue archivée suivi du nom du projet.
+        """
+        return f"{self.title} ({self.project.title}, archivée)"
+
+
+class ArchivedComment(models.Model):
+    """
+    Commentaire d'une issue archivée, déplacé avec elle.
+
+    Attributs :
+        id (UUID) : identifiant du commentaire d'origine.
+        description (str) : contenu du commentaire.
+        author (User) : utilisateur ayant écrit le commentaire.
+        issue (ArchivedIssue) : issue archivée associée.
+        created_time (datetime) : horodatage de création du commentaire.
+        updated_time (datetime) : horodatage de dernière modification.
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        help_text="Identifiant du commentaire d'origine"
+    )
+    description = models.TextField(
+        help_text="Texte du commentaire"
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="archived_comments",
+        help_text="Utilisateur auteur du commentaire"
+    )
+    issue = models.ForeignKey(
+        ArchivedIssue,
+        on_delete=models.CASCADE,
+        related_name="comments",
+        help_text="Issue archivée à laquelle le commentaire est lié"
+    )
+    created_time = models.DateTimeField(
+        help_text="Date et heure de création du commentaire"
+    )
+    updated_time = models.DateTimeField(
+        help_text="Date et heure de dernière modification du commentaire"
+    )
+
+    def __str__(self):
+        """
+        Retourne une représentation concise du commentaire archivé.
+        """
+        return f"Commentaire de {self.author.username} sur {self.issue.title} (archivé)"
+
+
+class InboxEntry(models.Model):
+    """
+    Entrée de la boîte « travail assigné » d'un utilisateur (voir projects/inbox.py).
+
+    Une entrée par issue ouverte (non terminée) assignée, maintenue à chaque
+    changement d'assignation ou de statut. L'index (user, priority_rank,
+    issue_created_time, issue) sert directement le tri de /issues/assigned-to-me/.
+
+    Attributs :
+        user (User) : utilisateur assigné.
+        issue (Issue) : issue assignée.
+        project (Project) : projet de l'issue (retrait groupé par projet).
+        priority_rank (int) : rang de priorité (0 = High, 1 = Medium, 2 = Low).
+        issue_created_time (datetime) : date de création de l'issue (tri par ancienneté).
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="inbox",
+        help_text="Utilisateur assigné"
+    )
+    issue = models.OneToOneField(
+        Issue,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="inbox_entry",
+        help_text="Issue assignée"
+    )
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="+",
+        help_text="Projet de l'issue"
+    )
+    priority_rank = models.PositiveSmallIntegerField(
+        help_text="Rang de priorité : 0 = High, 1 = Medium, 2 = Low"
+    )
+    issue_created_time = models.DateTimeField(
+        help_text="Date de création de l'issue, pour le tri par ancienneté"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "priority_rank", "issue_created_time", "issue"],
+                name="inbox_user_order_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Retourne l'utilisateur et l'identifiant de l'issue assignée.
+        """
+        return f"{self.user} → issue {self.issue_id}"
+
+
+class ProjectDeletionJob(models.Model):
+    """
+    Tâche de suppression différée d'un projet et de ses données liées.
+
+    Attributs :
+        project (Project|None) : projet à purger (NULL une fois supprimé).
+        project_title (str) : titre du projet, conservé après la purge.
+        requested_by (User) : utilisateur ayant demandé la suppression.
+        status (str) : état de la tâche, parmi JobStatus.
+        deleted_rows (int) : nombre de lignes supprimées jusqu'ici.
+        error (str) : message d'erreur en cas d'échec.
+        created_time (datetime) : horodatage de la demande.
+        updated_time (datetime) : horodatage de la dernière progression.
+        finished_time (datetime|None) : horodatage de fin de la purge.
+    """
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.SET_NULL,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="deletion_jobs",
+        help_text="Projet à supprimer"
+    )
+    project_title = models.CharField(
+        max_length=128,
+        help_text="Titre du projet au moment de la demande"
+    )
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="project_deletion_jobs",
+        help_text="Utilisateur ayant demandé la suppression"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=JobStatus.choices,
+        default=JobStatus.PENDING,
+        db_index=True,
+        help_text="Statut de la tâche de suppression"
+    )
+    deleted_rows = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Nombre de lignes supprimées"
+    )
+    error = models.TextField(
+        blank=True,
+        help_text="Message d'erreur si la purge a échoué"
+    )
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de la demande de suppression"
+    )
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        help_text="Date et heure de la dernière progression"
+    )
+    finished_time = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Date et heure de fin de la purge"
+    )
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de la tâche.
+        """
+        return f"Suppression de {self.project_title} ({self.status})"
+
+
+class Change(models.Model):
+    """
+    Entrée du journal des modifications utilisé par le flux de synchronisation.
+
+    L'identifiant auto-incrémenté sert de curseur monotone : un client qui a lu
+    jusqu'au curseur N ne demande ensuite que les entrées d'id > N.
+
+    Attributs :
+        project_id (int) : projet concerné ; l'entrée est visible de ses contributeurs.
+        user (User|None) : destinataire unique, pour les entrées qui ne concernent
+            qu'un utilisateur (ex. perte d'accès à un projet).
+        type (str) : type d'objet modifié, parmi ChangeType.
+        object_id (str) : identifiant de l'objet modifié.
+        action (str) : upsert ou delete (tombstone), parmi ChangeAction.
+        created_time (datetime) : horodatage de la modification.
+    """
+    project_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Projet concerné par la modification"
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Destinataire unique de l'entrée (optionnel)"
+    )
+    type = models.CharField(
+        max_length=10,
+        choices=ChangeType.choices,
+        help_text="Type d'objet modifié"
+    )
+    object_id = models.CharField(
+        max_length=36,
+        help_text="Identifiant de l'objet modifié"
+    )
+    action = models.CharField(
+        max_length=10,
+        choices=ChangeAction.choices,
+        help_text="Nature de la modification"
+    )
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de la modification"
+    )
+
+    class Meta:
+        indexes = [
+            # Lecture du flux : id > curseur pour les projets visibles / l'utilisateur
+            models.Index(fields=["project_id", "id"]),
+            models.Index(fields=["user", "id"]),
+        ]
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de l'entrée.
+        """
+        return f"#{self.id} {self.action} {self.type} {self.object_id}"
+
+
+class OutboxEvent(models.Model):
+    """
+    Événement à notifier aux webhooks (outbox transactionnelle).
+
+    Écrit dans la même transaction que la modification qu'il décrit, puis
+    livré en différé par la commande deliver_webhooks : aucun appel HTTP
+    n'a lieu pendant la requête API.
+
+    Attributs :
+        event_type (str) : type d'événement, ex. "issue.created".
+        project_id (int) : projet concerné, pour le filtrage par webhook.
+        object_id (str) : identifiant de l'objet concerné.
+        payload (dict) : représentation de l'objet au moment de l'événement.
+        created_time (datetime) : horodatage de l'événement.
+    """
+    event_type = models.CharField(
+        max_length=32,
+        help_text="Type d'événement (ex. issue.created)"
+    )
+    project_id = models.BigIntegerField(
+        db_index=True,
+        help_text="Projet concerné par l'événement"
+    )
+    object_id = models.CharField(
+        max_length=36,
+        help_text="Identifiant de l'objet concerné"
+    )
+    payload = models.JSONField(
+        default=dict,
+        help_text="Représentation de l'objet au moment de l'événement"
+    )
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de l'événement"
+    )
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de l'événement.
+        """
+        return f"#{self.id} {self.event_type} {self.object_id}"
+
+
+class Notification(models.Model):
+    """
+    Notification en attente d'envoi dans le prochain résumé (digest) de son
+    destinataire (voir projects/notifications.py).
+
+    Créée uniquement pour les utilisateurs qui acceptent d'être contactés
+    (can_be_contacted), puis supprimée une fois le résumé envoyé.
+
+    Attributs :
+        user (User) : destinataire.
+        kind (str) : assignation ou nouveau commentaire (NotificationKind).
+        issue (Issue) : issue concernée.
+        actor (User|None) : auteur de l'action.
+        excerpt (str) : extrait du commentaire, le cas échéant.
+        created_time (datetime) : horodatage de l'action.
+        sending_time (datetime|None) : début de l'envoi du résumé qui la contient.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        help_text="Destinataire de la notification"
+    )
+    kind = models.CharField(
+        max_length=10,
+        choices=NotificationKind.choices,
+        help_text="Type de notification"
+    )
+    issue = models.ForeignKey(
+        Issue,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="+",
+        help_text="Issue concernée"
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Auteur de l'action notifiée"
+    )
+    excerpt = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text="Extrait du commentaire"
+    )
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de l'action"
+    )
+    sending_time = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Début de l'envoi du résumé contenant la notification"
+    )
+
+    class Meta:
+        indexes = [
+            # Notifications en attente, par destinataire et ancienneté
+            models.Index(
+                fields=["sending_time", "user", "created_time"], name="notification_pending_idx"
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de la notification.
+        """
+        return f"{self.kind} issue {self.issue_id} → {self.user}"
+
+
+class BackgroundTask(models.Model):
+    """
+    Tâche d'arrière-plan en file d'attente (voir projects/background.py).
+
+    Écrite dans la transaction de la requête qui la crée : elle n'est visible
+    du worker (commande run_tasks) qu'une fois cette transaction validée.
+    Supprimée une fois exécutée avec succès ; conservée en échec définitif.
+
+    Attributs :
+        name (str) : nom de la fonction enregistrée à exécuter.
+        payload (dict) : arguments nommés de la fonction.
+        status (str) : Pending, Running ou Failed (JobStatus).
+        attempts (int) : nombre d'exécutions commencées.
+        max_attempts (int) : nombre maximal d'exécutions.
+        run_after (datetime) : date à partir de laquelle la tâche peut être prise.
+        locked_by (str) : jeton du worker qui l'exécute.
+        locked_until (datetime|None) : fin de la visibilité réservée au worker ;
+            passée cette date, la tâche peut être reprise par un autre worker.
+        last_error (str) : dernière erreur rencontrée.
+        created_time (datetime) : horodatage de création.
+    """
+    name = models.CharField(
+        max_length=100,
+        help_text="Nom de la tâche enregistrée"
+    )
+    payload = models.JSONField(
+        default=dict,
+        help_text="Arguments nommés de la tâche"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=JobStatus.choices,
+        default=JobStatus.PENDING,
+        help_text="Statut de la tâche"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Nombre d'exécutions commencées"
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=5,
+        help_text="Nombre maximal d'exécutions avant l'échec définitif"
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        help_text="Date à partir de laquelle la tâche peut être exécutée"
+    )
+    locked_by = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Jeton du worker qui exécute la tâche"
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Fin de la réservation par le worker (délai de visibilité)"
+    )
+    last_error = models.TextField(
+        blank=True,
+        help_text="Dernière erreur d'exécution"
+    )
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de création de la tâche"
+    )
+
+    class Meta:
+        indexes = [
+            # Sélection des tâches prêtes (en attente) ou abandonnées (réservation expirée)
+            models.Index(fields=["status", "run_after"], name="task_ready_idx"),
+            models.Index(fields=["status", "locked_until"], name="task_expired_idx"),
+        ]
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de la tâche.
+        """
+        return f"#{self.id} {self.name} ({self.status})"
+
+
+class WebhookEndpoint(models.Model):
+    """
+    Destinataire de webhooks, avec son curseur de livraison dans l'outbox.
+
+    Attributs :
+        url (str) : URL appelée en POST avec un lot d'événements JSON.
+        secret (str) : clé de signature HMAC-SHA256 du corps (optionnelle).
+        project (Project|None) : limite aux événements de ce projet (tous si vide).
+        is_active (bool) : livraison activée.
+        last_event_id (int) : dernier événement livré avec succès.
+        failures (int) : échecs consécutifs, pour le backoff exponentiel.
+        next_attempt_time (datetime|None) : prochaine tentative après un échec.
+        last_error (str) : dernière erreur de livraison.
+        created_time (datetime) : horodatage de création.
+    """
+    url = models.URLField(
+        help_text="URL appelée en POST avec les événements"
+    )
+    secret = models.CharField(
+        max_length=128,
+        blank=True,
+        help_text="Clé de signature HMAC-SHA256 du corps"
+    )
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="webhooks",
+        help_text="Projet surveillé (tous les projets si vide)"
+    )
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Si faux, aucune livraison n'est tentée"
+    )
+    last_event_id = models.BigIntegerField(
+        default=0,
+        help_text="Dernier événement livré avec succès"
+    )
+    failures = models.PositiveIntegerField(
+        default=0,
+        help_text="Nombre d'échecs consécutifs"
+    )
+    next_attempt_time = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Date et heure de la prochaine tentative après un échec"
+    )
+    last_error = models.TextField(
+        blank=True,
+        help_text="Dernière erreur de livraison"
+    )
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de création du webhook"
+    )
+
+    def __str__(self):
+        """
+        Retourne l'URL du webhook.
+        """
+        return self.url
@@ -0,0 +1,187 @@
+"""
+Notifications par e-mail, regroupées en résumés (digests) par utilisateur.
+
+Un utilisateur qui accepte d'être contacté (can_be_contacted) et possède une
+adresse e-mail est notifié lorsqu'une issue lui est assignée et lorsqu'une
+issue qui lui est assignée est commentée. Chaque action ajoute une ligne
+Notification dans la transaction de la requête ; aucun e-mail n'est envoyé
+pendant la requête.
+
+La tâche d'arrière-plan « notifications.send_digests » (projects/tasks.py)
+envoie, pour chaque destinataire dont la plus ancienne notification en attente
+a au moins settings.NOTIFICATION_DIGEST_WINDOW secondes, un seul e-mail
+récapitulatif. Tous les résumés dus partent en un lot, sur une seule connexion
+au backend e-mail de Django. Une seule tâche d'envoi est en attente à la fois :
+une rafale de commentaires produit quelques envois, pas un par commentaire.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .background import DEFAULT_VISIBILITY_TIMEOUT, enqueue
+from .constants import JobStatus, NotificationKind
+from .models import BackgroundTask, Issue, Notification
+from .sharding import is_sharded, load_related
+
+User = get_user_model()
+
+DIGEST_TASK = "notifications.send_digests"
+EXCERPT_LENGTH = 200
+
+
+def get_window():
+    """
+    Fenêtre de regroupement en secondes (settings.NOTIFICATION_DIGEST_WINDOW, 300 par défaut).
+    """
+    return getattr(settings, "NOTIFICATION_DIGEST_WINDOW", 300)
+
+
+def get_claim_timeout():
+    """
+    Délai (s) après lequel une réservation non terminée est abandonnée : celui
+    des tâches d'arrière-plan (settings.TASK_VISIBILITY_TIMEOUT), après lequel
+    la tâche d'envoi d'un worker arrêté est reprise.
+    """
+    return getattr(settings, "TASK_VISIBILITY_TIMEOUT", DEFAULT_VISIBILITY_TIMEOUT)
+
+
+def _contactable(user_id):
+    return User.objects.filter(
+        pk=user_id, can_be_contacted=True, is_active=True
+    ).exclude(email="").exists()
+
+
+def schedule_digests(delay=None):
+    """
+    Met en file la tâche d'envoi des résumés, sauf si une tâche est déjà en attente.
+    """
+    if BackgroundTask.objects.filter(name=DIGEST_TASK, status=JobStatus.PENDING).exists():
+        return
+    enqueue(DIGEST_TASK, delay=get_window() if delay is None else delay)
+
+
+def _notify(user_id, kind, issue, actor, excerpt=""):
+    if user_id is None or user_id == actor.pk or not _contactable(user_id):
+        return None
+    notification = Notification.objects.create(
+        user_id=user_id, kind=kind, issue=issue, actor=actor, excerpt=excerpt[:EXCERPT_LENGTH]
+    )
+    schedule_digests()
+    return notification
+
+
+def notify_assignment(issue, actor):
+    """
+    Notifie l'utilisateur assigné à l'issue (sauf s'il s'est assigné lui-même).
+
+    Returns:
+        Notification|None: notification créée, ou None si personne n'est à notifier.
+    """
+    return _notify(issue.assignee_user_id, NotificationKind.ASSIGNED, issue, actor)
+
+
+def notify_comment(comment, actor):
+    """
+    Notifie l'assigné de l'issue commentée (sauf s'il est l'auteur du commentaire).
+    """
+    issue = comment.issue
+    return _notify(
+        issue.assignee_user_id, NotificationKind.COMMENTED, issue, actor, comment.description
+    )
+
+
+def _line(notification):
+    actor = notification.actor.username if notification.actor else "un utilisateur supprimé"
+    issue = notification.issue
+    where = f"[{issue.project.title}] « {issue.title} »"
+    if notification.kind == NotificationKind.ASSIGNED:
+        return f"- {where} vous a été assignée par {actor}."
+    return f"- {where} : {actor} a commenté « {notification.excerpt} »"
+
+
+def build_digest(user, notifications):
+    """
+    E-mail récapitulatif des notifications d'un utilisateur.
+    """
+    count = len(notifications)
+    lines = [f"Bonjour {user.username},", "", f"{count} nouvelle(s) notification(s) :", ""]
+    lines += [_line(notification) for notification in notifications]
+    return EmailMessage(
+        subject=f"SoftDesk : {count} notification(s)",
+        body="\n".join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+
+
+def send_due_digests():
+    """
+    Envoie en un lot les résumés dus, puis reprogramme la tâche s'il reste
+    des notifications plus récentes.
+
+    Les notifications sont réservées (sending_time) avant l'envoi ; en cas
+    d'échec du backend, la réservation est levée et l'erreur propagée (la
+    tâche est alors relancée). Une réservation plus ancienne que
+    get_claim_timeout() (worker arrêté avant la fin de l'envoi) est
+    considérée comme abandonnée : ses notifications sont de nouveau en attente.
+
+    Returns:
+        int: nombre d'e-mails envoyés.
+    """
+    now = timezone.now()
+    pending = Notification.objects.filter(
+        Q(sending_time__isnull=True)
+        | Q(sending_time__lt=now - timedelta(seconds=get_claim_timeout()))
+    )
+    due_users = list(
+        pending.values("user_id")
+        .annotate(oldest=Min("created_time"))
+        .filter(oldest__lte=now - timedelta(seconds=get_window()))
+        .values_list("user_id", flat=True)
+    )
+    sent = 0
+    if due_users:
+        ids = list(pending.filter(user_id__in=due_users).values_list("id", flat=True))
+        pending.filter(pk__in=ids).update(sending_time=now)
+        claimed = Notification.objects.filter(pk__in=ids, sending_time=now)
+
+        # Le consentement est vérifié de nouveau à l'envoi
+        recipients = User.objects.filter(
+            pk__in=due_users, can_be_contacted=True, is_active=True
+        ).exclude(email="").in_bulk()
+        by_user = defaultdict(list)
+        notifications = claimed.order_by("created_time", "id")
+        if is_sharded():
+            # Les issues sont sur leurs shards : elles sont chargées shard par shard
+            notifications = load_related(
+                notifications.select_related("actor"),
+                "issue",
+                Issue.objects.select_related("project"),
+            )
+        else:
+            notifications = notifications.select_related("actor", "issue__project")
+        for notification in notifications:
+            if notification.issue is None:
+                continue
+            if notification.user_id in recipients:
+                by_user[notification.user_id].append(notification)
+        messages = [build_digest(recipients[user_id], items) for user_id, items in by_user.items()]
+        try:
+            if messages:
+                sent = get_connection().send_messages(messages) or 0
+        except Exception:
+            claimed.update(sending_time=None)
+            raise
+        claimed.delete()
+
+    oldest = pending.aggregate(oldest=Min("created_time"))["oldest"]
+    if oldest is not None:
+        due_in = (oldest + timedelta(seconds=get_window()) - timezone.now()).total_seconds()
+        schedule_digests(delay=max(due_in, 0))
+    return sent
@@ -0,0 +1,86 @@
+"""
+Outbox transactionnelle des webhooks.
+
+Les viewsets ajoutent un OutboxEvent dans la transaction de la modification ;
+la livraison HTTP est faite plus tard par projects.webhooks (deliver_webhooks).
+"""
+
+from .models import Issue, Comment, OutboxEvent
+
+# Seules les issues et les commentaires sont notifiés
+EVENT_PREFIXES = {
+    Issue: "issue",
+    Comment: "comment",
+}
+
+
+def _json_pk(pk):
+    """
+    Clé primaire sérialisable en JSON (les UUID des commentaires en chaîne).
+    """
+    return pk if isinstance(pk, int) else str(pk)
+
+
+def _snapshot(instance):
+    """
+    Représentation de l'objet au moment de l'événement (mêmes champs que l'API).
+    """
+    from .serializers import IssueSerializer, CommentSerializer
+
+    if isinstance(instance, Issue):
+        return dict(IssueSerializer(instance).data)
+    data = dict(CommentSerializer(instance).data)
+    data["project"] = instance.issue.project_id
+    return data
+
+
+def enqueue_event(instance, verb):
+    """
+    Ajoute un événement "<type>.<verb>" pour une issue ou un commentaire.
+
+    Args:
+        instance (Issue|Comment): objet créé, modifié ou sur le point d'être supprimé.
+        verb (str): "created", "updated" ou "deleted".
+
+    Returns:
+        OutboxEvent|None: événement créé, ou None pour un modèle non notifié.
+    """
+    prefix = EVENT_PREFIXES.get(type(instance))
+    if prefix is None:
+        return None
+    if isinstance(instance, Issue):
+        project_id = instance.project_id
+    else:
+        project_id = instance.issue.project_id
+    if verb == "deleted":
+        payload = {"id": _json_pk(instance.pk), "project": project_id}
+    else:
+        payload = _snapshot(instance)
+    return OutboxEvent.objects.create(
+        event_type=f"{prefix}.{verb}",
+        project_id=project_id,
+        object_id=str(instance.pk),
+        payload=payload,
+    )
+
+
+def enqueue_deletions(model, pks):
+    """
+    Ajoute en une requête les événements de suppression d'un lot d'objets.
+    """
+    prefix = EVENT_PREFIXES.get(model)
+    if prefix is None:
+        return []
+    path = "project_id" if model is Issue else "issue__project_id"
+    rows = model.objects.filter(pk__in=pks).values_list("pk", path)
+    return OutboxEvent.objects.bulk_create(
+        [
+            OutboxEvent(
+                event_type=f"{prefix}.deleted",
+                project_id=project_id,
+                object_id=str(pk),
+                payload={"id": _json_pk(pk), "project": project_id},
+            )
+            for pk, project_id in rows
+        ]
+    )
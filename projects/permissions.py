@@ -1,7 +1,29 @@
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
-from .models import Contributor, Project, Issue, Comment
+from .models import Contributor, Project, Issue, Comment, ArchivedIssue, ArchivedComment
 from rest_framework.exceptions import ValidationError
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+from .related import get_related_objects
+
+
+def annotate_access(queryset, user, project_path):
+    """
+    Annote le queryset avec les drapeaux lus par IsContributor et IsAuthor :
+    - is_contributor : Exists sur Contributor (user, projet de l'objet) ;
+    - is_author : l'utilisateur est l'auteur de l'objet.
+
+    La lecture d'un objet et son autorisation tiennent ainsi en une requête.
+
+    Args:
+        project_path (str): chemin vers l'id du projet ("pk", "project_id", ...).
+    """
+    return queryset.annotate(
+        is_contributor=Exists(
+            Contributor.objects.filter(user_id=user.pk, project_id=OuterRef(project_path))
+        ),
+        is_author=ExpressionWrapper(Q(author_id=user.pk), output_field=BooleanField()),
+    )
 
 
 class IsContributor(BasePermission):
@@ -25,29 +47,31 @@ class IsContributor(BasePermission):
         if request.method != 'POST':
             return True
 
-        # Distingue les ressources par basename (défini par le router)
+        # Distingue les ressources par basename (défini par le router) ;
+        # les objets lus sont mis en cache pour la validation du sérialiseur
         base = getattr(view, 'basename', '')
+        related = get_related_objects(request)
 
         # Création de commentaire
         if base in ('comment', 'issue-comments'):
             # Nested : /projects/.../issues/{issue_pk}/comments/
             issue_pk = view.kwargs.get('issue_pk')
             if issue_pk:
-                try:
-                    issue = Issue.objects.get(pk=issue_pk)
-                except Issue.DoesNotExist:
-                    raise ValidationError({'issue': 'Issue introuvable pour création de commentaire.'})
-                project_id = issue.project.id
+                issue = self._get(related, Issue, issue_pk)
+                if issue is None:
+                    raise ValidationError(
+                        {'issue': 'Issue introuvable pour création de commentaire.'}
+                    )
+                project_id = issue.project_id
             else:
                 # Flat : /comments/ -> require issue
                 issue_id = request.data.get('issue')
                 if not issue_id:
                     raise ValidationError({'issue': 'Le champ issue est requis.'})
-                try:
-                    issue = Issue.objects.get(pk=issue_id)
-                except Issue.DoesNotExist:
+                issue = self._get(related, Issue, issue_id)
+                if issue is None:
                     raise ValidationError({'issue': 'Issue introuvable.'})
-                project_id = issue.project.id
+                project_id = issue.project_id
 
         else:
             # Création pour issues ou contributeurs
@@ -60,30 +84,57 @@ class IsContributor(BasePermission):
                 if not project_id:
                     raise ValidationError({'project': 'Le champ project est requis.'})
 
-        # Vérifie contribution
-        if not Contributor.objects.filter(user=request.user, project_id=project_id).exists():
-            return False
-
-        return True
+        # Vérifie contribution (un projet en attente de suppression n'accepte plus d'ajout)
+        try:
+            return related.is_contributor(request.user.id, project_id)
+        except (TypeError, ValueError):
+            raise ValidationError({'project': 'Identifiant de projet invalide.'})
+
+    @staticmethod
+    def _get(related, model, pk):
+        """
+        Objet lu via le cache de la requête ; None si introuvable ou clé invalide.
+        """
+        try:
+            return related.get(model, pk)
+        except (TypeError, ValueError, DjangoValidationError):
+            return None
 
     def has_object_permission(self, request, view, obj):
-        # Vérification GET, PUT, DELETE sur instances
+        # Vérification GET, PUT, DELETE sur instances ; l'annotation posée par
+        # annotate_access évite toute requête supplémentaire
+        annotated = getattr(obj, 'is_contributor', None)
+        if annotated is not None:
+            return annotated
         if isinstance(obj, Project):
             return Contributor.objects.filter(user=request.user, project=obj).exists()
-        if isinstance(obj, Issue):
-            return Contributor.objects.filter(user=request.user, project=obj.project).exists()
-        if isinstance(obj, Comment):
-            return Contributor.objects.filter(user=request.user, project=obj.issue.project).exists()
+        if isinstance(obj, (Issue, ArchivedIssue)):
+            return Contributor.objects.filter(user=request.user, project_id=obj.project_id).exists()
+        if isinstance(obj, (Comment, ArchivedComment)):
+            return Contributor.objects.filter(
+                user=request.user, project_id=obj.issue.project_id
+            ).exists()
         return False
 
 
+def _is_author(request, obj):
+    """
+    Lit l'annotation is_author si présente, sinon compare author_id
+    (sans charger l'auteur).
+    """
+    annotated = getattr(obj, 'is_author', None)
+    if annotated is not None:
+        return annotated
+    return getattr(obj, 'author_id', None) == request.user.pk
+
+
 class IsAuthor(BasePermission):
     """
     Autorise la modification ou suppression si request.user est l'auteur de l'objet.
     """
 
     def has_object_permission(self, request, view, obj):
-        return getattr(obj, 'author', None) == request.user
+        return _is_author(request, obj)
 
 
 class IsAuthorOrReadOnly(BasePermission):
@@ -94,7 +145,7 @@ class IsAuthorOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in ('GET', 'HEAD', 'OPTIONS'):
             return True
-        return getattr(obj, 'author', None) == request.user
+        return _is_author(request, obj)
 
 
 
@@ -106,7 +157,7 @@ class IsAuthor(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Seul l'auteur originel peut modifier ou supprimer
-        return getattr(obj, 'author', None) == request.user
+        return _is_author(request, obj)
 
 
 class IsAuthorOrReadOnly(BasePermission):
@@ -120,4 +171,4 @@ class IsAuthorOrReadOnly(BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         # Méthodes d'écriture réservées à l'auteur
-        return getattr(obj, 'author', None) == request.user
+        return _is_author(request, obj)
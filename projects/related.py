@@ -0,0 +1,154 @@
+"""
+Résolution des objets liés, mise en commun pour toute une requête.
+
+Les permissions (IsContributor) et les sérialiseurs résolvent les mêmes projets,
+issues et appartenances : le cache RelatedObjects, attaché à la requête DRF,
+fait que chaque objet n'est lu qu'une fois. En validation multiple (many=True),
+les clés de tous les éléments sont chargées d'avance par in_bulk.
+"""
+
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+from .models import Contributor
+
+
+class RelatedObjects:
+    """
+    Cache par requête des objets liés et des appartenances aux projets.
+
+    - get/prefetch : objets par clé primaire, chargés par in_bulk
+      (les clés absentes sont mémorisées comme introuvables).
+    - is_contributor/prefetch_memberships : appartenances (utilisateur, projet)
+      aux projets actifs, vérifiées en une requête par lot.
+    """
+
+    def __init__(self):
+        self._objects = defaultdict(dict)
+        self._memberships = {}
+
+    @staticmethod
+    def normalize_pk(model, pk):
+        return model._meta.pk.to_python(pk)
+
+    def prefetch(self, model, pks):
+        cache = self._objects[model]
+        missing = {self.normalize_pk(model, pk) for pk in pks} - cache.keys()
+        if missing:
+            found = model.objects.in_bulk(missing)
+            for pk in missing:
+                cache[pk] = found.get(pk)
+
+    def get(self, model, pk):
+        """
+        Returns:
+            Model|None: l'objet, ou None s'il n'existe pas.
+        """
+        key = self.normalize_pk(model, pk)
+        if key not in self._objects[model]:
+            self.prefetch(model, [key])
+        return self._objects[model][key]
+
+    def put(self, instance):
+        """
+        Ajoute au cache un objet déjà chargé.
+        """
+        self._objects[type(instance)][instance.pk] = instance
+
+    def prefetch_memberships(self, pairs):
+        """
+        Charge en une requête les appartenances (user_id, project_id) données.
+        """
+        pairs = {(int(user_id), int(project_id)) for user_id, project_id in pairs}
+        missing = pairs - self._memberships.keys()
+        if not missing:
+            return
+        found = set(
+            Contributor.objects.filter(
+                user_id__in={user_id for user_id, _ in missing},
+                project_id__in={project_id for _, project_id in missing},
+                project__pending_deletion=False,
+            ).values_list("user_id", "project_id")
+        )
+        for pair in missing:
+            self._memberships[pair] = pair in found
+
+    def is_contributor(self, user_id, project_id):
+        pair = (int(user_id), int(project_id))
+        if pair not in self._memberships:
+            self.prefetch_memberships([pair])
+        return self._memberships[pair]
+
+
+def get_related_objects(request):
+    """
+    Cache RelatedObjects de la requête (créé au premier appel).
+    """
+    cache = getattr(request, "_related_objects", None)
+    if cache is None:
+        cache = RelatedObjects()
+        request._related_objects = cache
+    return cache
+
+
+def related_objects_for(serializer):
+    """
+    Cache de la requête du contexte, ou cache propre au sérialiseur racine
+    hors requête (sérialisation interne, tests).
+    """
+    root = serializer.root
+    request = root.context.get("request")
+    if request is not None:
+        return get_related_objects(request)
+    return get_related_objects(root)
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField dont la résolution passe par le cache de la requête.
+
+    Le queryset du champ doit être le queryset complet du modèle (Model.objects.all()).
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        model = self.get_queryset().model
+        try:
+            instance = related_objects_for(self).get(model, data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+
+class PrefetchRelatedListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer qui charge d'avance, par in_bulk, les objets référencés par
+    les champs CachedPrimaryKeyRelatedField de tous les éléments, puis laisse
+    le sérialiseur enfant compléter (hook prefetch_many) avant la validation.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            cache = related_objects_for(self)
+            items = [item for item in data if isinstance(item, dict)]
+            for name, field in self.child.fields.items():
+                if isinstance(field, CachedPrimaryKeyRelatedField) and not field.read_only:
+                    pks = []
+                    for item in items:
+                        value = item.get(name)
+                        if value in (None, "") or isinstance(value, bool):
+                            continue
+                        try:
+                            pks.append(cache.normalize_pk(field.get_queryset().model, value))
+                        except (TypeError, ValueError, DjangoValidationError):
+                            continue
+                    cache.prefetch(field.get_queryset().model, pks)
+            prefetch_many = getattr(self.child, "prefetch_many", None)
+            if prefetch_many is not None:
+                prefetch_many(items, cache)
+        return super().to_internal_value(data)
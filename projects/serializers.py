@@ -1,18 +1,86 @@
+import copy
+
 from rest_framework import serializers
-from .models import Project, Contributor, Issue, Comment
+from .models import (
+    Project,
+    Contributor,
+    Issue,
+    Comment,
+    ArchivedIssue,
+    ArchivedComment,
+    ProjectDeletionJob,
+)
 from django.contrib.auth import get_user_model
+from .related import (
+    CachedPrimaryKeyRelatedField,
+    PrefetchRelatedListSerializer,
+    related_objects_for,
+)
 
 # Récupère le modèle utilisateur configuré pour ce projet
 User = get_user_model()
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+# Champs construits, par classe de sérialiseur (voir CachedFieldsMixin)
+_FIELDS_CACHE = {}
+
+
+class CachedFieldsMixin:
+    """
+    Construit les champs d'un ModelSerializer une seule fois par classe.
+
+    ModelSerializer.get_fields() introspecte le modèle et reconstruit tous les
+    champs à chaque instanciation (à chaque requête, et pour chaque objet
+    sérialisé isolément). Ici, les champs sont construits à la première
+    instanciation, puis chaque instance en reçoit des copies superficielles
+    (un champ est lié à son sérialiseur parent). Les variantes selon la route
+    (imbriquée ou flat) sont des sous-classes, donc des entrées distinctes.
+    """
+
+    def get_fields(self):
+        fields = _FIELDS_CACHE.get(type(self))
+        if fields is None:
+            fields = _FIELDS_CACHE[type(self)] = super().get_fields()
+        return {
+            # Un sérialiseur imbriqué porte ses propres champs liés : copie profonde
+            name: copy.deepcopy(field) if isinstance(field, serializers.BaseSerializer) else copy.copy(field)
+            for name, field in fields.items()
+        }
+
+
+class ExpandableMixin:
+    """
+    Ajoute les champs des expansions demandées (contexte "expand", voir
+    projects/expand.py) au sérialiseur racine.
+
+    `expandable_fields` associe à chaque expansion une fonction renvoyant le
+    champ à inclure ; il lit les objets déjà chargés par le queryset de la vue.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Les sérialiseurs imbriqués n'ont pas de contexte propre : seule la racine s'étend
+        for name in self.context.get("expand", ()):
+            if name in self.expandable_fields:
+                self.fields[name] = self.expandable_fields[name]()
+
+
+class ProjectSerializer(CachedFieldsMixin, ExpandableMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Project.
 
     - Gère la conversion entre l'objet Project et sa représentation JSON.
     - Le champ 'author' est en lecture seule et renvoie le nom d'utilisateur.
+    - ?expand=contributors,issues : inclut les premiers contributeurs et issues.
     """
+    expandable_fields = {
+        "contributors": lambda: ContributorSerializer(
+            many=True, read_only=True, source="expanded_contributors"
+        ),
+        "issues": lambda: IssueSerializer(many=True, read_only=True, source="expanded_issues"),
+    }
+
     # Affiche le nom d'utilisateur de l'auteur au lieu de son ID
     author = serializers.ReadOnlyField(source="author.username")
 
@@ -24,12 +92,13 @@ class ProjectSerializer(serializers.ModelSerializer):
             "description",
             "type",       
             "author",     
-            "created_time"
+            "created_time",
+            "updated_time"
         ]
-        read_only_fields = ["id", "author", "created_time"]
+        read_only_fields = ["id", "author", "created_time", "updated_time"]
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Contributor.
 
@@ -51,30 +120,85 @@ class ContributorSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user", "project", "created_time"]
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class ContributorBulkSerializer(serializers.Serializer):
+    """
+    Sérialiseur d'entrée de l'ajout/retrait groupé de contributeurs.
+
+    - 'add' et 'remove' : listes d'IDs utilisateurs (au moins une non vide).
+    - Un même utilisateur ne peut pas être à la fois ajouté et retiré.
+    """
+    MAX_USERS = 500
+
+    add = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=MAX_USERS,
+        help_text="IDs des utilisateurs à ajouter",
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=MAX_USERS,
+        help_text="IDs des utilisateurs à retirer",
+    )
+
+    def validate(self, attrs):
+        add, remove = set(attrs["add"]), set(attrs["remove"])
+        if not add and not remove:
+            raise serializers.ValidationError("add ou remove doit contenir au moins un utilisateur.")
+        if add & remove:
+            raise serializers.ValidationError(
+                {"remove": f"Utilisateurs à la fois ajoutés et retirés : {sorted(add & remove)}."}
+            )
+        # Une seule requête pour vérifier tous les utilisateurs
+        found = set(
+            User.objects.filter(pk__in=add | remove, is_active=True).values_list("pk", flat=True)
+        )
+        unknown = sorted((add | remove) - found)
+        if unknown:
+            raise serializers.ValidationError({"users": f"Utilisateurs introuvables : {unknown}."})
+        return {"add": sorted(add), "remove": sorted(remove)}
+
+
+class IssueSerializer(CachedFieldsMixin, ExpandableMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Issue.
 
     - Permet de lire et de créer/modifier des issues.
     - Champ 'author' en lecture seule.
     - Champ 'project' pour définir l'ID du projet parent.
-    - Champ 'assignee_user' optionnel pour l'utilisateur assigné.
+    - Champ 'assignee_user' optionnel : l'utilisateur assigné doit être
+      contributeur du projet (vérifié en une seule requête).
+    - Projets et appartenances sont résolus via le cache de la requête,
+      partagé avec la permission IsContributor.
+    - ?expand=comments,project : inclut les premiers commentaires et le projet.
     """
+    expandable_fields = {
+        "comments": lambda: CommentSerializer(many=True, read_only=True, source="expanded_comments"),
+        "project": lambda: ProjectSerializer(read_only=True),
+    }
+
     # Nom d'utilisateur de l'auteur en lecture seule
     author = serializers.ReadOnlyField(source="author.username")
     # Clé primaire du projet parent (écriture autorisée)
-    project = serializers.PrimaryKeyRelatedField(
+    project = CachedPrimaryKeyRelatedField(
         queryset=Project.objects.all()
     )
-    # Clé primaire de l'utilisateur assigné (optionnel)
-    assignee_user = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(),
+    # ID de l'utilisateur assigné (optionnel) ; son existence et son appartenance
+    # au projet sont vérifiées ensemble dans validate()
+    assignee_user = serializers.IntegerField(
+        source="assignee_user_id",
         required=False,
-        allow_null=True
+        allow_null=True,
+        min_value=1,
+        help_text="ID de l'utilisateur assigné (contributeur du projet)"
     )
 
     class Meta:
         model = Issue
+        list_serializer_class = PrefetchRelatedListSerializer
         fields = [
             "id",            
             "title",        
@@ -85,49 +209,192 @@ class IssueSerializer(serializers.ModelSerializer):
             "project",       
             "author",        
             "assignee_user", 
-            "created_time"   
+            "created_time",
+            "updated_time"
         ]
-        read_only_fields = ["id", "author", "created_time"]
+        read_only_fields = ["id", "author", "created_time", "updated_time"]
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Si on est sur une route imbriquée (project_pk dans l'URL)
+    def _url_project_pk(self):
         view = self.context.get("view", None)
-        if view and view.kwargs.get("project_pk") is not None:
-            # on ne requiert pas le champ project dans le body
-            self.fields["project"].required = False
+        if view:
+            return view.kwargs.get("project_pk")
+        return None
+
+    def _project_id(self, project):
+        """
+        Projet de l'issue : celui de l'URL (routes imbriquées), du payload,
+        ou à défaut celui de l'issue modifiée.
+        """
+        project_pk = self._url_project_pk()
+        if project_pk is not None:
+            return project_pk
+        if project is not None:
+            return project.pk if isinstance(project, Project) else project
+        if self.instance is not None and not isinstance(self.instance, list):
+            return self.instance.project_id
+        return None
+
+    def prefetch_many(self, items, cache):
+        """
+        Vérifie en une requête les appartenances de tous les assignés d'un lot.
+        """
+        pairs = []
+        for item in items:
+            assignee, project_id = item.get("assignee_user"), self._project_id(item.get("project"))
+            try:
+                pairs.append((int(assignee), int(project_id)))
+            except (TypeError, ValueError):
+                continue
+        cache.prefetch_memberships(pairs)
+
+    def validate(self, attrs):
+        assignee_id = attrs.get("assignee_user_id")
+        if assignee_id is not None:
+            project_id = self._project_id(attrs.get("project"))
+            if project_id is None or not related_objects_for(self).is_contributor(
+                assignee_id, project_id
+            ):
+                raise serializers.ValidationError(
+                    {"assignee_user": "L'utilisateur assigné doit être contributeur du projet."}
+                )
+        return attrs
 
     def create(self, validated_data):
-        view = self.context.get("view", None)
         # Si project_pk est présent, on l'utilise
-        if view and view.kwargs.get("project_pk"):
-            project_pk = view.kwargs["project_pk"]
-            validated_data["project"] = Project.objects.get(pk=project_pk)
+        project_pk = self._url_project_pk()
+        if project_pk:
+            validated_data["project"] = related_objects_for(self).get(Project, project_pk)
         return super().create(validated_data)
 
-class CommentSerializer(serializers.ModelSerializer):
+
+class NestedIssueSerializer(IssueSerializer):
+    """
+    Variante d'IssueSerializer pour les routes imbriquées
+    (/projects/{id}/issues/) : le projet vient de l'URL, le champ project
+    n'est pas requis dans le corps.
+    """
+    project = CachedPrimaryKeyRelatedField(
+        queryset=Project.objects.all(),
+        required=False
+    )
+
+
+class CommentSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Comment.
 
     - Convertit entre Comment et JSON.
     - Champ 'author' en lecture seule.
-    - Champ 'issue' optionnel pour définir l'ID de l'issue parente.
+    - Champ 'issue' optionnel pour définir l'ID de l'issue parente
+      (résolu via le cache de la requête, partagé avec IsContributor).
     """
     # Nom d'utilisateur de l'auteur en lecture seule
     author = serializers.ReadOnlyField(source="author.username")
     # Clé primaire de l'issue parente (optionnel en contextes imbriqués)
-    issue = serializers.PrimaryKeyRelatedField(
+    issue = CachedPrimaryKeyRelatedField(
         queryset=Issue.objects.all(),
         required=False
     )
 
     class Meta:
         model = Comment
+        list_serializer_class = PrefetchRelatedListSerializer
         fields = [
             "id",           
             "description",  
             "author",       
             "issue",        
-            "created_time"  
+            "created_time",
+            "updated_time"
+        ]
+        read_only_fields = ["id", "author", "created_time", "updated_time"]
+
+
+class ArchivedCommentSerializer(serializers.ModelSerializer):
+    """
+    Sérialiseur en lecture seule d'un commentaire archivé.
+
+    - Mêmes champs que CommentSerializer, plus 'archived' (toujours vrai).
+    """
+    author = serializers.ReadOnlyField(source="author.username")
+    issue = serializers.ReadOnlyField(source="issue_id")
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedComment
+        fields = [
+            "id",
+            "description",
+            "author",
+            "issue",
+            "created_time",
+            "updated_time",
+            "archived",
+        ]
+        read_only_fields = fields
+
+    def get_archived(self, obj):
+        return True
+
+
+class ArchivedIssueSerializer(serializers.ModelSerializer):
+    """
+    Sérialiseur en lecture seule d'une issue archivée.
+
+    - Mêmes champs que IssueSerializer, plus 'archived', 'archived_time'
+      et les commentaires de l'issue (qui ne sont plus listés par les routes actives).
+    """
+    author = serializers.ReadOnlyField(source="author.username")
+    project = serializers.ReadOnlyField(source="project_id")
+    assignee_user = serializers.ReadOnlyField(source="assignee_user_id")
+    archived = serializers.SerializerMethodField()
+    comments = ArchivedCommentSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedIssue
+        fields = [
+            "id",
+            "title",
+            "description",
+            "tag",
+            "priority",
+            "status",
+            "project",
+            "author",
+            "assignee_user",
+            "created_time",
+            "updated_time",
+            "archived",
+            "archived_time",
+            "comments",
+        ]
+        read_only_fields = fields
+
+    def get_archived(self, obj):
+        return True
+
+
+class ProjectDeletionJobSerializer(serializers.ModelSerializer):
+    """
+    Sérialiseur en lecture seule pour le suivi d'une suppression de projet.
+
+    - Le champ 'status_url' pointe vers l'endpoint de suivi de la tâche.
+    """
+    status_url = serializers.HyperlinkedIdentityField(
+        view_name="projects:deletion-job-detail"
+    )
+
+    class Meta:
+        model = ProjectDeletionJob
+        fields = [
+            "id",
+            "project",
+            "project_title",
+            "status",
+            "deleted_rows",
+            "error",
+            "created_time",
+            "finished_time",
+            "status_url",
         ]
-        read_only_fields = ["id", "author", "created_time"]
+        read_only_fields = fields
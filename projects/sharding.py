@@ -0,0 +1,390 @@
+"""
+Répartition horizontale (sharding) des données de projets sur plusieurs bases.
+
+Un projet, ses contributeurs, ses issues et leurs commentaires sont stockés
+ensemble sur une même base, choisie à la création du projet parmi
+settings.PROJECT_SHARDS (alias de settings.DATABASES). Les annuaires
+ProjectShard, ContributorShard et IssueShard, sur la base par défaut, associent
+chaque projet, contributeur et issue à sa base et fournissent des identifiants
+uniques sur l'ensemble des shards : les données de la base par défaut (flux de
+modifications, boîte « travail assigné »...) ne référencent jamais un
+identifiant ambigu. Les commentaires ont des identifiants UUIDv7, uniques par
+construction. Les autres données (utilisateurs, tâches...) restent sur la base
+par défaut.
+
+- ProjectShardRouter (settings.DATABASE_ROUTERS) route les modèles shardés
+  vers la base de l'objet lié, sinon vers le shard courant (use_shard).
+- ShardedViewMixin épingle chaque requête sur le shard du projet concerné ;
+  les listes « flat » (/issues/, /comments/...) interrogent tous les shards en
+  parallèle et fusionnent les résultats (ShardedResults).
+
+Avec un seul shard (PROJECT_SHARDS = ["default"], valeur par défaut), tout
+reste sur la base par défaut et les requêtes sont inchangées.
+"""
+
+import heapq
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import islice
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from rest_framework.response import Response
+
+from .models import (
+    Comment,
+    Contributor,
+    ContributorShard,
+    Issue,
+    IssueShard,
+    Project,
+    ProjectShard,
+)
+
+SHARDED_MODELS = (Project, Contributor, Issue, Comment)
+
+# Annuaire de chaque modèle shardé à identifiant entier
+DIRECTORIES = {
+    Project: ProjectShard,
+    Contributor: ContributorShard,
+    Issue: IssueShard,
+}
+
+# Shard de la requête ou de la tâche en cours (None : base par défaut)
+_current_shard = ContextVar("project_shard", default=None)
+
+
+def get_shards():
+    """
+    Alias des bases qui stockent les projets (settings.PROJECT_SHARDS).
+    """
+    return list(getattr(settings, "PROJECT_SHARDS", None) or [DEFAULT_DB_ALIAS])
+
+
+def is_sharded():
+    """
+    Vrai si les projets sont répartis sur plusieurs bases.
+    """
+    return len(get_shards()) > 1
+
+
+def is_sharded_model(model):
+    return issubclass(model, SHARDED_MODELS)
+
+
+def current_shard():
+    return _current_shard.get() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_shard(alias):
+    """
+    Contexte dans lequel les modèles shardés sont lus et écrits sur `alias`.
+    """
+    token = _current_shard.set(alias)
+    try:
+        yield alias
+    finally:
+        _current_shard.reset(token)
+
+
+def allocate_project():
+    """
+    Réserve l'identifiant d'un nouveau projet et choisit sa base : les shards
+    sont attribués à tour de rôle selon l'identifiant.
+
+    Returns:
+        tuple[int, str]: (identifiant du projet, alias de sa base).
+    """
+    shards = get_shards()
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        entry = ProjectShard.objects.create(alias=shards[0])
+        alias = shards[entry.pk % len(shards)]
+        if alias != entry.alias:
+            ProjectShard.objects.filter(pk=entry.pk).update(alias=alias)
+    return entry.pk, alias
+
+
+def allocate_ids(model, alias, count=1):
+    """
+    Réserve dans l'annuaire du modèle `count` identifiants d'objets stockés
+    sur `alias` (en une requête, pour les créations en masse).
+
+    Returns:
+        list[int]: identifiants attribués.
+    """
+    directory = DIRECTORIES[model]
+    entries = directory.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+        [directory(alias=alias) for _ in range(count)]
+    )
+    return [entry.pk for entry in entries]
+
+
+def _to_pk(model, pk):
+    """
+    Clé primaire convertie, ou None si elle est invalide pour le modèle.
+    """
+    try:
+        return model._meta.pk.to_python(pk)
+    except (DjangoValidationError, TypeError, ValueError):
+        return None
+
+
+def shard_for_project(project_id):
+    """
+    Base du projet d'après l'annuaire ; la base par défaut pour un projet
+    inconnu (la requête échouera alors normalement, en 404 ou 400).
+    """
+    return locate(Project, project_id)
+
+
+def fan_out(function, aliases=None):
+    """
+    Appelle function(alias) pour chaque shard, dans le contexte de ce shard.
+
+    Les appels sont parallèles (un thread et une connexion par shard), sauf
+    dans un bloc atomic : les threads ne verraient pas les écritures non
+    validées de la transaction en cours.
+
+    Returns:
+        dict: {alias: résultat}, dans l'ordre des shards.
+    """
+    aliases = list(aliases or get_shards())
+
+    def run(alias):
+        with use_shard(alias):
+            return function(alias)
+
+    if len(aliases) == 1 or any(connections[alias].in_atomic_block for alias in aliases):
+        return {alias: run(alias) for alias in aliases}
+
+    def run_in_thread(alias):
+        try:
+            return run(alias)
+        finally:
+            # Chaque thread ouvre ses propres connexions : elles sont fermées ici
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=len(aliases)) as pool:
+        return dict(zip(aliases, pool.map(run_in_thread, aliases)))
+
+
+def locate(model, pk):
+    """
+    Base qui contient l'objet `pk` du modèle shardé (la base par défaut s'il
+    est introuvable) : lue dans l'annuaire du modèle, ou cherchée sur tous les
+    shards pour les commentaires, dont les identifiants UUIDv7 sont uniques.
+    """
+    pk = _to_pk(model, pk)
+    if pk is None or not is_sharded():
+        return DEFAULT_DB_ALIAS
+    directory = DIRECTORIES.get(model)
+    if directory is not None:
+        alias = directory.objects.filter(pk=pk).values_list("alias", flat=True).first()
+        return alias or DEFAULT_DB_ALIAS
+    found = fan_out(lambda alias: model._base_manager.using(alias).filter(pk=pk).exists())
+    return next((alias for alias, exists in found.items() if exists), DEFAULT_DB_ALIAS)
+
+
+def in_bulk(queryset, pks):
+    """
+    in_bulk sur les shards : les objets `pks` du queryset d'un modèle shardé
+    sont lus sur leurs bases, d'après l'annuaire du modèle, ou sur tous les
+    shards (commentaires). Le queryset ne doit pas joindre de modèle non
+    shardé (voir select_users).
+
+    Returns:
+        dict: {pk: objet}, sans les objets introuvables.
+    """
+    pks = list(pks)
+    if not pks:
+        return {}
+    if not is_sharded():
+        return queryset.in_bulk(pks)
+    directory = DIRECTORIES.get(queryset.model)
+    if directory is None:
+        by_alias = {alias: pks for alias in get_shards()}
+    else:
+        by_alias = defaultdict(list)
+        for pk, alias in directory.objects.filter(pk__in=pks).values_list("pk", "alias"):
+            by_alias[alias].append(pk)
+        if not by_alias:
+            return {}
+    found = fan_out(lambda alias: queryset.using(alias).in_bulk(by_alias[alias]), by_alias)
+    return {pk: obj for objects in found.values() for pk, obj in objects.items()}
+
+
+def load_related(instances, field_name, queryset):
+    """
+    Charge, shard par shard, les objets shardés référencés par la clé
+    étrangère `field_name` d'objets de la base par défaut (select_related
+    ne peut pas joindre deux bases). Une référence introuvable vaut None.
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+    field = type(instances[0])._meta.get_field(field_name)
+    objects = in_bulk(queryset, {getattr(instance, field.attname) for instance in instances})
+    for instance in instances:
+        field.set_cached_value(instance, objects.get(getattr(instance, field.attname)))
+    return instances
+
+
+def select_users(queryset, *paths):
+    """
+    select_related vers des utilisateurs (ex. "author", "project__author").
+
+    En mode shardé, les utilisateurs sont sur la base par défaut : aucune
+    jointure n'est possible, ils sont chargés par prefetch_related (une requête
+    par relation).
+    """
+    if not is_sharded():
+        return queryset.select_related(*paths)
+    parents = [path.rsplit("__", 1)[0] for path in paths if "__" in path]
+    if parents:
+        queryset = queryset.select_related(*parents)
+    return queryset.prefetch_related(*paths)
+
+
+class ShardedResults:
+    """
+    Résultats d'un queryset évalué sur tous les shards, fusionnés selon `ordering`.
+
+    Compatible avec le Paginator de Django : count() additionne les comptes des
+    shards ; une page [start:stop] lit au plus `stop` lignes par shard, en
+    parallèle, puis fusionne les flux déjà triés (heapq.merge).
+    """
+    ordered = True
+
+    def __init__(self, queryset, ordering, aliases=None):
+        self.queryset = queryset.order_by(*ordering)
+        self.aliases = list(aliases or get_shards())
+        self._key = attrgetter(*(field.lstrip("-") for field in ordering))
+        self._reverse = ordering[0].startswith("-")
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            counts = fan_out(lambda alias: self.queryset.using(alias).count(), self.aliases)
+            self._count = sum(counts.values())
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        rows = fan_out(
+            lambda alias: list(self.queryset.using(alias)[:stop]), self.aliases
+        )
+        merged = heapq.merge(*rows.values(), key=self._key, reverse=self._reverse)
+        return list(islice(merged, start, stop))
+
+
+class ProjectShardRouter:
+    """
+    Routeur de bases : les modèles shardés vont sur la base de l'objet shardé
+    auquel ils sont liés, sinon sur le shard courant ; tous les autres modèles
+    restent sur la base par défaut.
+
+    Toutes les tables sont créées sur chaque base, afin que les suppressions
+    en cascade puissent interroger les tables liées ; seules les tables des
+    modèles shardés reçoivent des lignes hors de la base par défaut. Les
+    migrations de données ne s'exécutent que sur la base par défaut.
+    """
+
+    def _db_for(self, model, **hints):
+        if not is_sharded_model(model):
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        if instance is not None and is_sharded_model(type(instance)) and instance._state.db:
+            return instance._state.db
+        return current_shard()
+
+    db_for_read = _db_for
+    db_for_write = _db_for
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if is_sharded_model(type(obj1)) and is_sharded_model(type(obj2)):
+            return obj1._state.db == obj2._state.db
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Migrations de données (RunPython) : uniquement sur la base par défaut,
+        # où se trouvent les données existantes
+        if db != DEFAULT_DB_ALIAS and model_name is None and not hints:
+            return False
+        return None
+
+
+class ShardedViewMixin:
+    """
+    Mixin de ViewSet : exécute la requête sur le shard du projet concerné.
+
+    Le shard est déterminé avant les permissions (initial) : par project_pk
+    (routes imbriquées), par pk (ProjectViewSet), par le champ project ou
+    issue du corps (création flat), ou par l'annuaire de l'objet (détail flat ;
+    les commentaires sont cherchés sur tous les shards). Les listes flat
+    interrogent tous les shards et fusionnent les résultats selon
+    `sharded_ordering`.
+
+    Les sous-classes définissent `sharded_model`.
+    """
+    sharded_model = None
+    sharded_ordering = ("created_time", "id")
+
+    def resolve_shard(self, request):
+        """
+        Returns:
+            str: alias de la base sur laquelle exécuter la requête.
+        """
+        if not is_sharded():
+            return DEFAULT_DB_ALIAS
+        project_pk = self.kwargs.get("project_pk")
+        if project_pk is None and self.sharded_model is Project:
+            project_pk = self.kwargs.get("pk")
+        if project_pk is not None:
+            return shard_for_project(project_pk)
+        if "pk" in self.kwargs:
+            return locate(self.sharded_model, self.kwargs["pk"])
+        data = request.data if hasattr(request.data, "get") else {}
+        if data.get("project") is not None:
+            return shard_for_project(data["project"])
+        if data.get("issue") is not None:
+            return locate(Issue, data["issue"])
+        return DEFAULT_DB_ALIAS
+
+    def initial(self, request, *args, **kwargs):
+        self._shard_token = _current_shard.set(self.resolve_shard(request))
+        super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_shard_token", None)
+        if token is not None:
+            _current_shard.reset(token)
+            self._shard_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Liste flat en mode shardé : fan-out sur tous les shards puis fusion.
+        """
+        if not is_sharded() or any(name.endswith("_pk") for name in self.kwargs):
+            return super().list(request, *args, **kwargs)
+        results = ShardedResults(
+            self.filter_queryset(self.get_queryset()), self.sharded_ordering
+        )
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page if page is not None else list(results), many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
@@ -0,0 +1,224 @@
+"""
+Diffusion en temps réel (Server-Sent Events) des nouveaux commentaires d'une issue.
+
+Un seul canal par issue et par processus : une boucle de polling unique lit le
+journal des modifications (projects.changes) et répartit les nouveaux commentaires
+dans la file de chaque abonné. Le coût en base dépend donc du nombre d'issues
+suivies, pas du nombre de clients connectés.
+
+L'id de l'entrée du journal sert d'id d'événement SSE : un client qui se
+reconnecte avec l'en-tête Last-Event-ID reçoit les commentaires manqués.
+"""
+
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max
+
+from .constants import ChangeType, ChangeAction
+from .models import Change, Comment
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal d'événements en attente par abonné : au-delà, le client est
+# déconnecté et se resynchronise à sa reconnexion via Last-Event-ID
+SUBSCRIBER_QUEUE_SIZE = 1000
+FETCH_LIMIT = 500
+
+
+def get_poll_interval():
+    return getattr(settings, "SSE_POLL_INTERVAL", 1.0)
+
+
+def get_keepalive_seconds():
+    return getattr(settings, "SSE_KEEPALIVE_SECONDS", 15.0)
+
+
+def fetch_comment_events(issue_id, project_id, cursor, upper=None):
+    """
+    Lit les commentaires de l'issue créés ou modifiés après le curseur.
+
+    Returns:
+        tuple[list[tuple[int, dict]], int]: événements (id, commentaire sérialisé)
+            et nouveau curseur (qui avance même sur les entrées d'autres issues).
+    """
+    from .serializers import CommentSerializer
+
+    changes = Change.objects.filter(
+        id__gt=cursor,
+        project_id=project_id,
+        type=ChangeType.COMMENT,
+        action=ChangeAction.UPSERT,
+    )
+    if upper is not None:
+        changes = changes.filter(id__lte=upper)
+    rows = list(changes.order_by("id").values_list("id", "object_id")[:FETCH_LIMIT])
+    if not rows:
+        return [], cursor
+
+    comments = {
+        str(comment.pk): comment
+        for comment in Comment.objects.select_related("author").filter(
+            pk__in=[object_id for _, object_id in rows], issue_id=issue_id
+        )
+    }
+    events = [
+        (change_id, CommentSerializer(comments[object_id]).data)
+        for change_id, object_id in rows
+        if object_id in comments
+    ]
+    return events, rows[-1][0]
+
+
+def current_cursor():
+    return Change.objects.aggregate(cursor=Max("id"))["cursor"] or 0
+
+
+def format_event(event_id, data, event="comment"):
+    """
+    Encode un événement au format text/event-stream.
+    """
+    payload = json.dumps(data, cls=DjangoJSONEncoder)
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+# Placé dans la file d'un abonné pour mettre fin à son flux
+_CLOSE = object()
+
+
+def _disconnect(queue):
+    """
+    Vide la file d'un abonné et y place le marqueur de fin de flux.
+    """
+    while not queue.empty():
+        queue.get_nowait()
+    queue.put_nowait(_CLOSE)
+
+
+class _Channel:
+    """
+    Canal d'une issue : curseur partagé, abonnés et tâche de polling.
+    """
+
+    def __init__(self, issue_id, project_id, cursor):
+        self.issue_id = issue_id
+        self.project_id = project_id
+        self.cursor = cursor
+        self.subscribers = set()
+        self.task = None
+
+
+class CommentHub:
+    """
+    Répartiteur en mémoire des nouveaux commentaires, une boucle de polling par issue.
+    """
+
+    def __init__(self, poll_interval=None):
+        self.poll_interval = poll_interval
+        self.channels = {}
+        self.polls = 0
+
+    async def _poll(self, channel):
+        interval = self.poll_interval or get_poll_interval()
+        try:
+            while channel.subscribers:
+                self.polls += 1
+                events, channel.cursor = await sync_to_async(fetch_comment_events)(
+                    channel.issue_id, channel.project_id, channel.cursor
+                )
+                for event in events:
+                    for queue in list(channel.subscribers):
+                        try:
+                            queue.put_nowait(event)
+                        except asyncio.QueueFull:
+                            # Abonné trop lent : déconnecté, il reprendra via Last-Event-ID
+                            channel.subscribers.discard(queue)
+                            _disconnect(queue)
+                await asyncio.sleep(interval)
+        except Exception:
+            logger.exception(
+                "Échec du polling des commentaires de l'issue %s", channel.issue_id
+            )
+            for queue in list(channel.subscribers):
+                _disconnect(queue)
+        finally:
+            if self.channels.get(channel.issue_id) is channel:
+                del self.channels[channel.issue_id]
+
+    async def subscribe(self, issue_id, project_id, last_event_id=None, keepalive=None):
+        """
+        Générateur asynchrone des événements (id, commentaire) d'une issue.
+
+        Si last_event_id est fourni, les commentaires publiés depuis sont d'abord
+        rejoués, puis le flux continue en direct sans doublon ni trou.
+        Produit None après `keepalive` secondes sans événement.
+        """
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        channel = self.channels.get(issue_id)
+        if channel is None:
+            cursor = await sync_to_async(current_cursor)()
+            # Un autre abonné a pu créer le canal pendant la lecture du curseur
+            channel = self.channels.get(issue_id)
+            if channel is None:
+                channel = _Channel(issue_id, project_id, cursor)
+                self.channels[issue_id] = channel
+        channel.subscribers.add(queue)
+        if channel.task is None:
+            channel.task = asyncio.ensure_future(self._poll(channel))
+
+        sent = last_event_id or 0
+        try:
+            if last_event_id is not None:
+                # Rattrapage jusqu'au curseur du canal ; la suite arrive par la file
+                upper = channel.cursor
+                cursor = last_event_id
+                while cursor < upper:
+                    events, new_cursor = await sync_to_async(fetch_comment_events)(
+                        issue_id, project_id, cursor, upper
+                    )
+                    for event in events:
+                        sent = event[0]
+                        yield event
+                    if new_cursor == cursor:
+                        break
+                    cursor = new_cursor
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is _CLOSE:
+                    return
+                if event[0] <= sent:
+                    continue
+                sent = event[0]
+                yield event
+        finally:
+            channel.subscribers.discard(queue)
+
+
+hub = CommentHub()
+
+
+async def event_stream(issue_id, project_id, last_event_id=None):
+    """
+    Flux text/event-stream d'une issue, avec un commentaire keep-alive
+    périodique pour maintenir la connexion ouverte à travers les proxys.
+    """
+    yield f"retry: {int(get_poll_interval() * 1000)}\n\n"
+    events = hub.subscribe(
+        issue_id, project_id, last_event_id, keepalive=get_keepalive_seconds()
+    )
+    try:
+        async for event in events:
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_event(*event)
+    finally:
+        await events.aclose()
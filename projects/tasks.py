@@ -0,0 +1,14 @@
+"""
+Tâches d'arrière-plan de l'application projects (voir projects/background.py).
+"""
+
+from .background import register
+from .notifications import DIGEST_TASK, send_due_digests
+
+
+@register(DIGEST_TASK)
+def send_digests():
+    """
+    Envoie les résumés de notifications dus.
+    """
+    send_due_digests()
@@ -1,11 +1,59 @@
-from rest_framework.test import APITestCase
+import asyncio
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError, connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework import serializers
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from users.models import CustomUser as User
-from projects.models import Project, Contributor, Issue, Comment
-from .constants import Priority, Tag, Status
+from projects.models import (
+    Project,
+    Contributor,
+    Issue,
+    Comment,
+    ArchivedIssue,
+    ArchivedComment,
+    InboxEntry,
+    ProjectDeletionJob,
+    OutboxEvent,
+    WebhookEndpoint,
+    BackgroundTask,
+    Notification,
+    ProjectShard,
+    IssueShard,
+    Change,
+)
+from projects import background
+from projects.archive import archive_finished_issues
+from projects.background import register
+from projects.changes import record_change
+from projects.deletion import process_pending_jobs
+from projects.notifications import send_due_digests
+from projects.serializers import IssueSerializer, NestedIssueSerializer
+from projects.sharding import ShardedResults, use_shard
+from projects.streams import CommentHub, format_event
+from softdesk import writes
+from utils.ids import uuid7
+from projects.webhooks import (
+    SIGNATURE_HEADER,
+    deliver_pending,
+    prune_delivered_events,
+    sign,
+)
+from .constants import Priority, Tag, Status, JobStatus, ChangeAction, ChangeType, NotificationKind
 
 
 class BaseAPITestCase(APITestCase):
@@ -308,3 +356,1610 @@ class CommentPermissionTests(BaseAPITestCase):
         # on recharge et vérifie bien la nouvelle valeur
         self.comment.refresh_from_db()
         self.assertEqual(self.comment.description, "modification")
+
+
+class ProjectDeletionTests(BaseAPITestCase):
+    """
+    Tests de la suppression différée des projets.
+
+    Vérifie que la suppression renvoie 202, masque immédiatement le projet
+    et que le worker purge le projet et ses données par lots.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_contributor = self.create_user("contributor")
+
+        self.project = Project.objects.create(
+            title="Projet à supprimer",
+            description="Description",
+            type="Back-End",
+            author=self.user_author,
+        )
+        Contributor.objects.create(user=self.user_author, project=self.project)
+        Contributor.objects.create(user=self.user_contributor, project=self.project)
+
+        self.issue = Issue.objects.create(
+            title="Issue",
+            description="Issue du projet",
+            tag=Tag.BUG,
+            priority=Priority.HIGH,
+            status=Status.TODO,
+            project=self.project,
+            author=self.user_author,
+        )
+        for i in range(3):
+            Comment.objects.create(
+                description=f"Commentaire {i}", author=self.user_author, issue=self.issue
+            )
+
+    def test_destroy_returns_202_and_hides_project(self):
+        """
+        La suppression renvoie 202 et le projet devient invisible (404).
+        """
+        self.authenticate(self.user_author)
+        url = reverse("projects:project-detail", args=[self.project.id])
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], JobStatus.PENDING)
+        self.assertIn("status_url", response.data)
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        issue_url = reverse("projects:issue-detail", args=[self.issue.id])
+        self.assertEqual(
+            self.client.get(issue_url).status_code, status.HTTP_404_NOT_FOUND
+        )
+        # Les données sont toujours présentes tant que le worker n'est pas passé
+        self.assertTrue(Project.objects.filter(pk=self.project.id).exists())
+
+    def test_worker_purges_project_in_batches(self):
+        """
+        Le worker supprime le projet et toutes ses données, puis marque la tâche Done.
+        """
+        self.authenticate(self.user_author)
+        response = self.client.delete(
+            reverse("projects:project-detail", args=[self.project.id])
+        )
+        job_id = response.data["id"]
+
+        self.assertEqual(process_pending_jobs(batch_size=2), 1)
+
+        self.assertFalse(Project.objects.filter(pk=self.project.id).exists())
+        self.assertEqual(Issue.objects.count(), 0)
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertEqual(Contributor.objects.count(), 0)
+
+        status_response = self.client.get(
+            reverse("projects:deletion-job-detail", args=[job_id])
+        )
+        self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(status_response.data["status"], JobStatus.DONE)
+        # 3 commentaires + 1 issue + 2 contributeurs + 1 projet
+        self.assertEqual(status_response.data["deleted_rows"], 7)
+
+    def test_interrupted_job_is_resumed_once_stale(self):
+        """
+        Une tâche restée Running après l'arrêt de son worker est reprise une
+        fois sans progression depuis stale_after, pas avant.
+        """
+        self.authenticate(self.user_author)
+        job_id = self.client.delete(
+            reverse("projects:project-detail", args=[self.project.id])
+        ).data["id"]
+        ProjectDeletionJob.objects.filter(pk=job_id).update(status=JobStatus.RUNNING)
+
+        self.assertEqual(process_pending_jobs(), 0)
+        self.assertTrue(Project.objects.filter(pk=self.project.id).exists())
+
+        ProjectDeletionJob.objects.filter(pk=job_id).update(
+            updated_time=timezone.now() - timezone.timedelta(minutes=11)
+        )
+        self.assertEqual(process_pending_jobs(), 1)
+        self.assertFalse(Project.objects.filter(pk=self.project.id).exists())
+        self.assertEqual(ProjectDeletionJob.objects.get(pk=job_id).status, JobStatus.DONE)
+
+    @override_settings(PROJECT_DELETION_STALE_AFTER=60)
+    def test_stale_timeout_comes_from_settings(self):
+        """
+        Le délai de reprise d'une tâche Running est lu dans les réglages.
+        """
+        self.authenticate(self.user_author)
+        job_id = self.client.delete(
+            reverse("projects:project-detail", args=[self.project.id])
+        ).data["id"]
+        ProjectDeletionJob.objects.filter(pk=job_id).update(
+            status=JobStatus.RUNNING, updated_time=timezone.now() - timezone.timedelta(seconds=90)
+        )
+        self.assertEqual(process_pending_jobs(), 1)
+        self.assertEqual(ProjectDeletionJob.objects.get(pk=job_id).status, JobStatus.DONE)
+
+    def test_contributor_cannot_follow_other_user_job(self):
+        """
+        Le suivi d'une tâche est réservé à l'utilisateur qui l'a demandée.
+        """
+        job = ProjectDeletionJob.objects.create(
+            project=self.project,
+            project_title=self.project.title,
+            requested_by=self.user_author,
+        )
+        self.authenticate(self.user_contributor)
+        url = reverse("projects:deletion-job-detail", args=[job.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ChangeFeedTests(BaseAPITestCase):
+    """
+    Tests du flux de synchronisation incrémentale /changes/?since=<curseur>.
+
+    Vérifie qu'un client ne reçoit que les modifications postérieures à son curseur,
+    limitées à ses projets, avec des tombstones pour les suppressions.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_stranger = self.create_user("stranger")
+        self.url = reverse("projects:changes")
+
+        self.authenticate(self.user_author)
+        response = self.client.post(
+            reverse("projects:project-list"),
+            {"title": "Projet synchronisé", "description": "d", "type": "Back-End"},
+            format="json",
+        )
+        self.project_id = response.data["id"]
+
+    def create_issue(self, title):
+        return self.client.post(
+            reverse("projects:project-issues-list", args=[self.project_id]),
+            {
+                "title": title,
+                "description": "d",
+                "tag": Tag.BUG,
+                "priority": Priority.LOW,
+                "project": self.project_id,
+            },
+            format="json",
+        ).data
+
+    def test_feed_returns_only_changes_since_cursor(self):
+        """
+        Après une première synchronisation, seules les nouvelles modifications sont renvoyées.
+        """
+        first = self.client.get(self.url).data
+        self.assertEqual([c["type"] for c in first["changes"]], ["project"])
+        self.assertEqual(first["changes"][0]["data"]["title"], "Projet synchronisé")
+
+        issue = self.create_issue("Nouvelle issue")
+        second = self.client.get(self.url, {"since": first["cursor"]}).data
+        self.assertEqual(len(second["changes"]), 1)
+        self.assertEqual(second["changes"][0]["id"], str(issue["id"]))
+        self.assertEqual(second["changes"][0]["action"], ChangeAction.UPSERT)
+        self.assertGreater(second["cursor"], first["cursor"])
+
+        third = self.client.get(self.url, {"since": second["cursor"]}).data
+        self.assertEqual(third["changes"], [])
+        self.assertEqual(third["cursor"], second["cursor"])
+
+    def test_update_and_delete_are_coalesced_into_tombstone(self):
+        """
+        Une issue modifiée puis supprimée n'apparaît qu'une fois, sous forme de tombstone.
+        """
+        cursor = self.client.get(self.url).data["cursor"]
+        issue = self.create_issue("Issue éphémère")
+        detail = reverse("projects:project-issues-detail", args=[self.project_id, issue["id"]])
+        self.client.patch(detail, {"title": "Modifiée"}, format="json")
+        self.client.delete(detail)
+
+        changes = self.client.get(self.url, {"since": cursor}).data["changes"]
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]["action"], ChangeAction.DELETE)
+        self.assertNotIn("data", changes[0])
+
+    def test_feed_is_paginated_by_cursor(self):
+        """
+        Avec limit, le client enchaîne les pages grâce à has_more et au curseur.
+        """
+        for i in range(3):
+            self.create_issue(f"Issue {i}")
+        seen, cursor, has_more = [], 0, True
+        while has_more:
+            page = self.client.get(self.url, {"since": cursor, "limit": 2}).data
+            seen += [c["id"] for c in page["changes"]]
+            cursor, has_more = page["cursor"], page["has_more"]
+        self.assertEqual(len(seen), 4)
+
+    def test_stranger_sees_nothing_and_project_deletion_emits_tombstone(self):
+        """
+        Un étranger ne voit aucune entrée ; la suppression d'un projet envoie
+        une tombstone à ses contributeurs, même après la purge.
+        """
+        self.authenticate(self.user_stranger)
+        self.assertEqual(self.client.get(self.url).data["changes"], [])
+
+        self.authenticate(self.user_author)
+        cursor = self.client.get(self.url).data["cursor"]
+        self.client.delete(reverse("projects:project-detail", args=[self.project_id]))
+        process_pending_jobs()
+
+        changes = self.client.get(self.url, {"since": cursor}).data["changes"]
+        self.assertEqual(
+            [(c["type"], c["id"], c["action"]) for c in changes],
+            [("project", str(self.project_id), ChangeAction.DELETE)],
+        )
+
+
+class WebhookStubHandler(BaseHTTPRequestHandler):
+    """
+    Destinataire HTTP local : enregistre les lots reçus et répond
+    avec le statut configuré sur le serveur.
+    """
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((dict(self.headers), body))
+        self.send_response(self.server.status_code)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WebhookDeliveryTests(BaseAPITestCase):
+    """
+    Tests de l'outbox transactionnelle et de la livraison des webhooks
+    contre un serveur HTTP local.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookStubHandler)
+        self.server.received = []
+        self.server.status_code = 200
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.user_author = self.create_user("author")
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        Contributor.objects.create(user=self.user_author, project=self.project)
+        self.endpoint = WebhookEndpoint.objects.create(
+            url=f"http://127.0.0.1:{self.server.server_address[1]}/hook",
+            secret="s3cret",
+        )
+        self.authenticate(self.user_author)
+
+    def create_issue(self, title):
+        return self.client.post(
+            reverse("projects:project-issues-list", args=[self.project.id]),
+            {"title": title, "description": "d", "tag": Tag.BUG,
+             "priority": Priority.LOW, "project": self.project.id},
+            format="json",
+        )
+
+    def test_api_writes_outbox_without_calling_webhook(self):
+        """
+        La requête API écrit l'événement dans l'outbox mais n'appelle pas le webhook.
+        """
+        response = self.create_issue("Issue notifiée")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.event_type, "issue.created")
+        self.assertEqual(event.payload["title"], "Issue notifiée")
+        self.assertEqual(self.server.received, [])
+
+    def test_events_are_delivered_in_signed_batches(self):
+        """
+        Les événements sont livrés par lots, signés, et le curseur avance.
+        """
+        for i in range(3):
+            self.create_issue(f"Issue {i}")
+
+        self.assertEqual(deliver_pending(batch_size=2), {"delivered": 2, "failed": 0})
+        self.assertEqual(deliver_pending(batch_size=2), {"delivered": 1, "failed": 0})
+        self.assertEqual(deliver_pending(batch_size=2), {"delivered": 0, "failed": 0})
+
+        batches = [json.loads(body)["events"] for _, body in self.server.received]
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(batches[0][0]["type"], "issue.created")
+        headers, body = self.server.received[0]
+        self.assertEqual(headers[SIGNATURE_HEADER], sign("s3cret", body))
+        self.endpoint.refresh_from_db()
+        self.assertEqual(self.endpoint.last_event_id, OutboxEvent.objects.latest("id").id)
+
+        self.assertEqual(prune_delivered_events(), 3)
+
+    def test_prune_keeps_events_not_delivered_to_every_endpoint(self):
+        """
+        Un webhook inactif garde ses événements pour sa réactivation ; sans
+        webhook, rien n'est supprimé.
+        """
+        for i in range(2):
+            self.create_issue(f"Issue {i}")
+        deliver_pending()
+        WebhookEndpoint.objects.create(url="http://127.0.0.1:9/paused", secret="s", is_active=False)
+        self.assertEqual(prune_delivered_events(), 0)
+        self.assertEqual(OutboxEvent.objects.count(), 2)
+
+        WebhookEndpoint.objects.all().delete()
+        self.assertEqual(prune_delivered_events(), 0)
+        self.assertEqual(OutboxEvent.objects.count(), 2)
+
+    def test_endpoint_scoped_to_quiet_project_does_not_pin_pruning(self):
+        """
+        Un webhook limité à un projet sans activité avance son curseur sur les
+        événements des autres projets, qui peuvent alors être purgés.
+        """
+        quiet = Project.objects.create(
+            title="Calme", description="d", type="Back-End", author=self.user_author
+        )
+        scoped = WebhookEndpoint.objects.create(
+            url=self.endpoint.url, secret="s", project=quiet
+        )
+        for i in range(3):
+            self.create_issue(f"Issue {i}")
+
+        self.assertEqual(deliver_pending(), {"delivered": 3, "failed": 0})
+        scoped.refresh_from_db()
+        self.assertEqual(scoped.last_event_id, OutboxEvent.objects.latest("id").id)
+        self.assertEqual(len(self.server.received), 1)
+        self.assertEqual(prune_delivered_events(), 3)
+
+    def test_failed_delivery_backs_off_and_retries(self):
+        """
+        Un échec HTTP laisse le curseur en place et repousse la tentative suivante.
+        """
+        self.create_issue("Issue")
+        self.server.status_code = 500
+        with self.assertLogs("projects.webhooks", level="WARNING"):
+            self.assertEqual(deliver_pending(), {"delivered": 0, "failed": 1})
+        self.endpoint.refresh_from_db()
+        self.assertEqual(self.endpoint.last_event_id, 0)
+        self.assertEqual(self.endpoint.failures, 1)
+        self.assertIsNotNone(self.endpoint.next_attempt_time)
+
+        # Tant que le backoff court, aucune tentative n'est faite
+        self.assertEqual(deliver_pending(), {"delivered": 0, "failed": 0})
+        self.assertEqual(len(self.server.received), 1)
+
+        self.server.status_code = 200
+        WebhookEndpoint.objects.update(next_attempt_time=timezone.now())
+        self.assertEqual(deliver_pending(), {"delivered": 1, "failed": 0})
+        self.endpoint.refresh_from_db()
+        self.assertEqual(self.endpoint.failures, 0)
+
+
+class CommentStreamTests(BaseAPITestCase):
+    """
+    Tests du flux SSE des nouveaux commentaires d'une issue.
+
+    Vérifie les règles d'accès, le partage d'un seul polling par issue
+    entre les abonnés et la reprise via Last-Event-ID.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_stranger = self.create_user("stranger")
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        Contributor.objects.create(user=self.user_author, project=self.project)
+        self.issue = Issue.objects.create(
+            title="Issue suivie", description="d", tag=Tag.BUG, priority=Priority.LOW,
+            project=self.project, author=self.user_author,
+        )
+        self.url = reverse(
+            "projects:issue-comments-stream", args=[self.project.id, self.issue.id]
+        )
+
+    def add_comment(self, text):
+        comment = Comment.objects.create(
+            description=text, author=self.user_author, issue=self.issue
+        )
+        record_change(comment)
+        return comment
+
+    def test_stream_applies_contributor_rules(self):
+        """
+        Sans jeton : 401 ; étranger : 403 ; issue d'un autre projet : 404.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+        self.authenticate(self.user_stranger)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        other = reverse("projects:issue-comments-stream", args=[self.project.id + 1, self.issue.id])
+        self.assertEqual(self.client.get(other).status_code, 404)
+
+    def test_hub_shares_one_poll_and_resumes_from_last_event_id(self):
+        """
+        Deux abonnés de la même issue partagent un seul canal ; un abonné qui
+        reprend avec Last-Event-ID reçoit les commentaires manqués.
+        """
+        first = self.add_comment("Avant l'abonnement")
+
+        async def scenario():
+            hub = CommentHub(poll_interval=0.01)
+            subscribers = [hub.subscribe(self.issue.pk, self.project.pk) for _ in range(2)]
+            pending = [asyncio.ensure_future(s.__anext__()) for s in subscribers]
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(hub.channels), 1)
+
+            await sync_to_async(self.add_comment)("En direct")
+            received = [await asyncio.wait_for(task, timeout=2) for task in pending]
+
+            resumed = hub.subscribe(self.issue.pk, self.project.pk, last_event_id=0)
+            replayed = await asyncio.wait_for(resumed.__anext__(), timeout=2)
+
+            for subscriber in subscribers + [resumed]:
+                await subscriber.aclose()
+            for channel in list(hub.channels.values()):
+                channel.task.cancel()
+            return received, replayed
+
+        received, replayed = async_to_sync(scenario)()
+        self.assertEqual([data["description"] for _, data in received], ["En direct"] * 2)
+        self.assertEqual(received[0][0], received[1][0])
+        self.assertEqual(replayed[1]["id"], str(first.id))
+
+    def test_event_format(self):
+        """
+        Les événements suivent le format text/event-stream (id, event, data).
+        """
+        self.assertEqual(
+            format_event(7, {"a": 1}),
+            'id: 7\nevent: comment\ndata: {"a": 1}\n\n',
+        )
+
+
+class CommentIdTests(BaseAPITestCase):
+    """
+    Tests des identifiants de commentaires ordonnés dans le temps (UUIDv7).
+
+    Vérifie que les ids suivent l'ordre de création et permettent une
+    pagination par clé (?after=<id>).
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        Contributor.objects.create(user=self.user_author, project=self.project)
+        self.issue = Issue.objects.create(
+            title="Issue", description="d", tag=Tag.BUG, priority=Priority.LOW,
+            project=self.project, author=self.user_author,
+        )
+
+    def test_uuid7_is_versioned_and_strictly_increasing(self):
+        """
+        Les identifiants générés sont des UUIDv7 strictement croissants,
+        y compris dans une même milliseconde.
+        """
+        ids = [uuid7() for _ in range(5000)]
+        self.assertTrue(all(value.version == 7 for value in ids))
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_comments_list_in_creation_order_with_keyset_pagination(self):
+        """
+        La liste est triée par id (ordre de création) et ?after=<id> renvoie
+        les commentaires suivants.
+        """
+        comments = [
+            Comment.objects.create(description=f"c{i}", author=self.user_author, issue=self.issue)
+            for i in range(5)
+        ]
+        self.authenticate(self.user_author)
+        url = reverse("projects:issue-comments-list", args=[self.project.id, self.issue.id])
+
+        response = self.client.get(url)
+        self.assertEqual(
+            [c["description"] for c in response.data["results"]], [c.description for c in comments]
+        )
+
+        response = self.client.get(url, {"after": str(comments[1].id)})
+        self.assertEqual(
+            [c["description"] for c in response.data["results"]], ["c2", "c3", "c4"]
+        )
+
+        response = self.client.get(url, {"after": "pas-un-uuid"})
+        self.assertEqual(response.status_code, 400)
+
+
+class IssueArchiveTests(BaseAPITestCase):
+    """
+    Tests de l'archivage des issues terminées.
+
+    Vérifie que seules les issues terminées anciennes sont déplacées avec leurs
+    commentaires, que les listes les ignorent et que les routes de détail
+    les renvoient en lecture seule.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_stranger = self.create_user("stranger")
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        Contributor.objects.create(user=self.user_author, project=self.project)
+        self.old = self.create_issue("Ancienne", Status.FINISHED)
+        self.recent = self.create_issue("Récente", Status.FINISHED)
+        self.open = self.create_issue("Ouverte", Status.IN_PROGRESS)
+        self.comments = [
+            Comment.objects.create(description=f"c{i}", author=self.user_author, issue=self.old)
+            for i in range(2)
+        ]
+        long_ago = timezone.now() - timezone.timedelta(days=365)
+        Issue.objects.filter(pk__in=[self.old.pk, self.open.pk]).update(updated_time=long_ago)
+
+    def create_issue(self, title, issue_status):
+        return Issue.objects.create(
+            title=title, description="d", tag=Tag.BUG, priority=Priority.LOW,
+            status=issue_status, project=self.project, author=self.user_author,
+        )
+
+    def test_archive_moves_only_old_finished_issues_with_comments(self):
+        """
+        Seule l'issue terminée depuis plus de N jours est déplacée, avec ses
+        commentaires et ses identifiants d'origine.
+        """
+        self.assertEqual(archive_finished_issues(older_than_days=90, batch_size=1), 1)
+
+        self.assertFalse(Issue.objects.filter(pk=self.old.pk).exists())
+        self.assertFalse(Comment.objects.filter(issue_id=self.old.pk).exists())
+        self.assertEqual(
+            set(Issue.objects.values_list("pk", flat=True)), {self.recent.pk, self.open.pk}
+        )
+        archived = ArchivedIssue.objects.get(pk=self.old.pk)
+        self.assertEqual(archived.title, "Ancienne")
+        self.assertEqual(
+            set(ArchivedComment.objects.filter(issue=archived).values_list("pk", flat=True)),
+            {c.pk for c in self.comments},
+        )
+        # Une seconde passe n'a plus rien à archiver
+        self.assertEqual(archive_finished_issues(older_than_days=90), 0)
+
+    def test_archived_issue_retrievable_but_not_listed(self):
+        """
+        Les listes ignorent l'issue archivée ; les routes de détail (issue et
+        commentaire) la renvoient en lecture seule, avec les mêmes règles d'accès.
+        """
+        archive_finished_issues(older_than_days=90)
+        self.authenticate(self.user_author)
+
+        response = self.client.get(reverse("projects:project-issues-list", args=[self.project.id]))
+        self.assertNotIn(self.old.pk, [i["id"] for i in response.data["results"]])
+
+        response = self.client.get(
+            reverse("projects:project-issues-detail", args=[self.project.id, self.old.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["archived"])
+        self.assertEqual(len(response.data["comments"]), 2)
+
+        response = self.client.get(
+            reverse("projects:comment-detail", args=[self.comments[0].pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["issue"], self.old.pk)
+
+        response = self.client.patch(
+            reverse("projects:issue-detail", args=[self.old.pk]), {"title": "x"}, format="json"
+        )
+        self.assertEqual(response.status_code, 404)
+
+        self.authenticate(self.user_stranger)
+        response = self.client.get(reverse("projects:issue-detail", args=[self.old.pk]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_archived_objects_are_upserted_in_change_feed(self):
+        """
+        Le flux de synchronisation renvoie l'issue et les commentaires archivés
+        dans leur représentation archivée, pas comme des suppressions.
+        """
+        archive_finished_issues(older_than_days=90)
+        self.authenticate(self.user_author)
+        response = self.client.get(reverse("projects:changes"), {"since": 0})
+        changes = {(c["type"], c["id"]): c for c in response.data["changes"]}
+
+        issue = changes[(ChangeType.ISSUE, str(self.old.pk))]
+        self.assertEqual(issue["action"], ChangeAction.UPSERT)
+        self.assertTrue(issue["data"]["archived"])
+        for comment in self.comments:
+            entry = changes[(ChangeType.COMMENT, str(comment.pk))]
+            self.assertEqual(entry["action"], ChangeAction.UPSERT)
+            self.assertTrue(entry["data"]["archived"])
+
+
+class AssignedInboxTests(BaseAPITestCase):
+    """
+    Tests de la boîte « travail assigné » (/issues/assigned-to-me/).
+
+    Vérifie le tri par priorité puis ancienneté et la mise à jour de la table
+    InboxEntry lors des changements d'assignation, de statut et d'appartenance.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_assignee = self.create_user("assignee")
+        self.projects = []
+        for title in ("Projet A", "Projet B"):
+            project = Project.objects.create(
+                title=title, description="d", type="Back-End", author=self.user_author
+            )
+            Contributor.objects.create(user=self.user_author, project=project)
+            Contributor.objects.create(user=self.user_assignee, project=project)
+            self.projects.append(project)
+        self.url = reverse("projects:issue-assigned-to-me")
+
+    def create_issue(self, project, title, priority):
+        self.authenticate(self.user_author)
+        response = self.client.post(
+            reverse("projects:project-issues-list", args=[project.id]),
+            {"title": title, "description": "d", "tag": Tag.BUG, "priority": priority,
+             "assignee_user": self.user_assignee.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def inbox_titles(self):
+        self.authenticate(self.user_assignee)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [issue["title"] for issue in response.data["results"]]
+
+    def test_inbox_sorted_by_priority_then_age_across_projects(self):
+        """
+        Les issues assignées de tous les projets sont triées par priorité
+        (High d'abord) puis par ancienneté.
+        """
+        self.create_issue(self.projects[0], "Low ancienne", Priority.LOW)
+        self.create_issue(self.projects[1], "High", Priority.HIGH)
+        self.create_issue(self.projects[0], "Low récente", Priority.LOW)
+        self.create_issue(self.projects[1], "Medium", Priority.MEDIUM)
+
+        self.assertEqual(self.inbox_titles(), ["High", "Medium", "Low ancienne", "Low récente"])
+
+        # L'auteur n'a rien d'assigné
+        self.authenticate(self.user_author)
+        self.assertEqual(self.client.get(self.url).data["results"], [])
+
+    def test_inbox_follows_status_assignment_and_membership(self):
+        """
+        Une issue terminée ou désassignée quitte la boîte ; un contributeur
+        retiré du projet n'y voit plus les issues de ce projet.
+        """
+        finished = self.create_issue(self.projects[0], "Terminée", Priority.HIGH)
+        unassigned = self.create_issue(self.projects[0], "Désassignée", Priority.HIGH)
+        self.create_issue(self.projects[1], "Autre projet", Priority.LOW)
+        self.create_issue(self.projects[0], "Reste", Priority.LOW)
+
+        self.authenticate(self.user_author)
+        self.client.patch(
+            reverse("projects:issue-detail", args=[finished]), {"status": Status.FINISHED}, format="json"
+        )
+        self.client.patch(
+            reverse("projects:issue-detail", args=[unassigned]), {"assignee_user": None}, format="json"
+        )
+        self.assertEqual(self.inbox_titles(), ["Autre projet", "Reste"])
+
+        # Réouverture : l'issue revient
+        self.authenticate(self.user_author)
+        self.client.patch(
+            reverse("projects:issue-detail", args=[finished]), {"status": Status.IN_PROGRESS}, format="json"
+        )
+        self.assertEqual(self.inbox_titles(), ["Terminée", "Autre projet", "Reste"])
+
+        contributor = Contributor.objects.get(user=self.user_assignee, project=self.projects[1])
+        self.authenticate(self.user_author)
+        response = self.client.delete(reverse("projects:contributor-detail", args=[contributor.id]))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.inbox_titles(), ["Terminée", "Reste"])
+        self.assertEqual(InboxEntry.objects.filter(user=self.user_assignee).count(), 2)
+
+
+class ContributorScopeTests(BaseAPITestCase):
+    """
+    Tests de la liste des contributeurs et de la gestion groupée des membres.
+
+    Vérifie que la liste plate se limite aux projets de l'utilisateur et que
+    l'ajout/retrait groupé valide les utilisateurs et applique les changements.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_other = self.create_user("other")
+        self.members = [self.create_user(f"member{i}") for i in range(3)]
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        Contributor.objects.create(user=self.user_author, project=self.project)
+        self.other_project = Project.objects.create(
+            title="Autre", description="d", type="Back-End", author=self.user_other
+        )
+        Contributor.objects.create(user=self.user_other, project=self.other_project)
+        self.bulk_url = reverse("projects:project-contributors-bulk", args=[self.project.id])
+
+    def test_flat_list_scoped_to_my_projects(self):
+        """
+        La liste plate ne contient que les contributeurs des projets de l'utilisateur.
+        """
+        self.authenticate(self.user_author)
+        response = self.client.get(reverse("projects:contributor-list"))
+        self.assertEqual(
+            {c["project"] for c in response.data["results"]}, {self.project.id}
+        )
+
+        other = Contributor.objects.get(project=self.other_project)
+        response = self.client.delete(reverse("projects:contributor-detail", args=[other.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_bulk_add_and_remove(self):
+        """
+        Les ajouts et retraits sont appliqués ; un ajout déjà membre est ignoré.
+        """
+        self.authenticate(self.user_author)
+        ids = [m.id for m in self.members]
+        response = self.client.post(self.bulk_url, {"add": ids}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["added"], ids)
+
+        response = self.client.post(
+            self.bulk_url, {"add": [ids[0]], "remove": ids[1:]}, format="json"
+        )
+        self.assertEqual(response.data, {"added": [], "removed": ids[1:]})
+        self.assertEqual(
+            set(Contributor.objects.filter(project=self.project).values_list("user_id", flat=True)),
+            {self.user_author.id, ids[0]},
+        )
+        # Le membre retiré reçoit une tombstone dans son flux de synchronisation
+        self.authenticate(self.members[1])
+        response = self.client.get(reverse("projects:changes"), {"since": 0})
+        self.assertEqual(
+            [(c["type"], c["action"]) for c in response.data["changes"]],
+            [(ChangeType.PROJECT, ChangeAction.DELETE)],
+        )
+
+    def test_bulk_validation_and_permissions(self):
+        """
+        Utilisateur inconnu : 400 sans aucun changement ; auteur retiré : 400 ;
+        non-auteur : 403.
+        """
+        self.authenticate(self.user_author)
+        response = self.client.post(
+            self.bulk_url, {"add": [self.members[0].id, 999999]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Contributor.objects.filter(project=self.project).count(), 1)
+
+        response = self.client.post(self.bulk_url, {"remove": [self.user_author.id]}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        self.authenticate(self.user_other)
+        response = self.client.post(self.bulk_url, {"add": [self.members[0].id]}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+
+class RelatedResolutionTests(BaseAPITestCase):
+    """
+    Tests de la résolution des objets liés mise en commun par requête.
+
+    Vérifie que projet et issue parents ne sont lus qu'une fois (permission
+    puis validation), que l'assigné doit être contributeur et que la
+    validation d'un lot charge les objets liés en une requête.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_contributor = self.create_user("contributor")
+        self.user_stranger = self.create_user("stranger")
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        for user in (self.user_author, self.user_contributor):
+            Contributor.objects.create(user=user, project=self.project)
+
+    def issue_payload(self, **extra):
+        return {"title": "Issue", "description": "d", "tag": Tag.BUG, "priority": Priority.LOW, **extra}
+
+    @staticmethod
+    def selects(queries, table):
+        return [q for q in queries if q["sql"].startswith("SELECT") and f'FROM "{table}"' in q["sql"]]
+
+    def test_parent_objects_loaded_once_per_request(self):
+        """
+        Le projet (flat) et l'issue (commentaire flat) sont lus une seule fois
+        pour la permission et la validation.
+        """
+        self.authenticate(self.user_contributor)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse("projects:issue-list"),
+                self.issue_payload(project=self.project.id, assignee_user=self.user_author.id),
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.selects(ctx.captured_queries, "projects_project")), 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse("projects:comment-list"),
+                {"description": "c", "issue": response.data["id"]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.selects(ctx.captured_queries, "projects_issue")), 1)
+
+    def test_assignee_must_be_contributor(self):
+        """
+        Un assigné qui n'est pas contributeur du projet est refusé (400).
+        """
+        self.authenticate(self.user_author)
+        url = reverse("projects:project-issues-list", args=[self.project.id])
+        response = self.client.post(url, self.issue_payload(assignee_user=self.user_stranger.id), format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("assignee_user", response.data)
+
+        response = self.client.post(url, self.issue_payload(assignee_user=999999), format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_many_items_validated_with_batched_lookups(self):
+        """
+        La validation d'un lot lit projets et appartenances en une requête chacun.
+        """
+        other = Project.objects.create(
+            title="Autre", description="d", type="Back-End", author=self.user_author
+        )
+        Contributor.objects.create(user=self.user_author, project=other)
+        items = [
+            self.issue_payload(project=project.id, assignee_user=user.id)
+            for project in (self.project, other)
+            for user in (self.user_author, self.user_contributor)
+        ]
+        serializer = IssueSerializer(data=items, many=True)
+        with CaptureQueriesContext(connection) as ctx:
+            valid = serializer.is_valid()
+        self.assertFalse(valid)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        # Seul le contributeur absent du second projet est refusé
+        errors = serializer.errors
+        if isinstance(errors, dict):
+            failed = sorted(errors)
+        else:
+            failed = [index for index, item_errors in enumerate(errors) if item_errors]
+        self.assertEqual(failed, [3])
+
+
+class AnnotatedAccessTests(BaseAPITestCase):
+    """
+    Tests de l'autorisation lue sur les annotations du queryset.
+
+    Vérifie qu'un retrieve coûte une seule requête au-delà du chargement de
+    l'utilisateur du jeton, et que les refus restent inchangés.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_contributor = self.create_user("contributor")
+        self.user_stranger = self.create_user("stranger")
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        for user in (self.user_author, self.user_contributor):
+            Contributor.objects.create(user=user, project=self.project)
+        self.issue = Issue.objects.create(
+            title="Issue", description="d", tag=Tag.BUG, priority=Priority.LOW,
+            project=self.project, author=self.user_author,
+        )
+        self.comment = Comment.objects.create(
+            description="c", author=self.user_author, issue=self.issue
+        )
+
+    def test_retrieve_and_authorization_in_one_query(self):
+        """
+        Projet, issue et commentaire : une requête pour l'utilisateur du jeton,
+        une pour l'objet, son auteur et les drapeaux d'accès.
+        """
+        self.authenticate(self.user_contributor)
+        for url in (
+            reverse("projects:project-detail", args=[self.project.id]),
+            reverse("projects:issue-detail", args=[self.issue.id]),
+            reverse("projects:comment-detail", args=[self.comment.id]),
+        ):
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_annotations_drive_permissions(self):
+        """
+        Un étranger est refusé en lecture (403) et un contributeur non auteur
+        en écriture (403).
+        """
+        self.authenticate(self.user_stranger)
+        response = self.client.get(reverse("projects:comment-detail", args=[self.comment.id]))
+        self.assertEqual(response.status_code, 403)
+
+        self.authenticate(self.user_contributor)
+        response = self.client.patch(
+            reverse("projects:comment-detail", args=[self.comment.id]),
+            {"description": "modifié"}, format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+        self.authenticate(self.user_author)
+        response = self.client.patch(
+            reverse("projects:comment-detail", args=[self.comment.id]),
+            {"description": "modifié"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(EXPAND_MAX_CHILDREN=3)
+class ExpandTests(BaseAPITestCase):
+    """
+    Tests de l'expansion ?expand= des projets et des issues.
+
+    Vérifie le contenu inclus, la limite d'enfants, le nombre constant de
+    requêtes SQL et le refus des expansions inconnues.
+    """
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_contributor = self.create_user("contributor")
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        for user in (self.user_author, self.user_contributor):
+            Contributor.objects.create(user=user, project=self.project)
+        self.issues = [
+            Issue.objects.create(
+                title=f"Issue {index}", description="d", tag=Tag.BUG, priority=Priority.LOW,
+                project=self.project, author=self.user_author,
+            )
+            for index in range(4)
+        ]
+        self.issue = self.issues[0]
+        self.comments = [
+            Comment.objects.create(description=f"c{index}", author=self.user_contributor, issue=self.issue)
+            for index in range(5)
+        ]
+        self.authenticate(self.user_contributor)
+
+    def test_issue_detail_with_comments_and_project_in_constant_queries(self):
+        """
+        Issue, commentaires et projet en une requête HTTP : utilisateur du jeton,
+        issue (avec projet et auteurs) et commentaires.
+        """
+        url = reverse("projects:issue-detail", args=[self.issue.id])
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {"expand": "comments,project"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["project"]["id"], self.project.id)
+        self.assertEqual(data["project"]["author"], "author")
+        # Les premiers commentaires, dans l'ordre de création, dans la limite fixée
+        self.assertEqual(
+            [comment["id"] for comment in data["comments"]],
+            [str(comment.id) for comment in self.comments[:3]],
+        )
+        self.assertEqual(data["comments"][0]["author"], "contributor")
+
+    def test_issue_list_expansion_does_not_grow_with_rows(self):
+        """
+        En liste, les commentaires de toutes les issues de la page sont chargés ensemble.
+        """
+        url = reverse("projects:project-issues-list", args=[self.project.id])
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {"expand": "comments"})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all("comments" in issue for issue in results))
+
+    def test_project_detail_with_contributors_and_issues(self):
+        """
+        Projet, contributeurs et issues (limitées) en une requête HTTP.
+        """
+        url = reverse("projects:project-detail", args=[self.project.id])
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {"expand": "contributors,issues"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            [contributor["user"] for contributor in data["contributors"]],
+            ["author", "contributor"],
+        )
+        self.assertEqual(
+            [issue["id"] for issue in data["issues"]],
+            [issue.id for issue in self.issues[:3]],
+        )
+
+    def test_without_expand_response_is_unchanged(self):
+        """
+        Sans ?expand=, la réponse garde ses clés et le projet reste un ID.
+        """
+        response = self.client.get(reverse("projects:issue-detail", args=[self.issue.id]))
+        self.assertEqual(response.json()["project"], self.project.id)
+        self.assertNotIn("comments", response.json())
+
+    def test_unknown_expansion_is_rejected(self):
+        """
+        Une expansion inconnue renvoie 400 avec la liste des expansions disponibles.
+        """
+        response = self.client.get(
+            reverse("projects:issue-detail", args=[self.issue.id]), {"expand": "comments,author"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("author", response.json()["expand"])
+
+
+# Tâches de test : enregistrées une fois, elles notent leurs exécutions ici
+TASK_CALLS = []
+
+
+@register("tests.record")
+def record_task(value):
+    TASK_CALLS.append(value)
+
+
+@register("tests.fail")
+def failing_task(value):
+    raise RuntimeError(value)
+
+
+class BackgroundTaskTests(APITestCase):
+    """
+    Tests de la file de tâches d'arrière-plan.
+
+    Vérifie le lien avec la transaction, l'exécution et la suppression des
+    tâches réussies, les relances et l'échec définitif, et la reprise des
+    tâches dont la réservation a expiré.
+    """
+
+    def setUp(self):
+        TASK_CALLS.clear()
+
+    def test_task_follows_enclosing_transaction(self):
+        """
+        Une tâche mise en file dans une transaction annulée n'existe pas.
+        """
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            background.enqueue("tests.record", value="annulée")
+            raise RuntimeError
+        self.assertFalse(BackgroundTask.objects.exists())
+
+    def test_pending_tasks_are_executed_and_removed(self):
+        """
+        Les tâches prêtes sont exécutées avec leurs arguments puis supprimées ;
+        les tâches différées attendent leur date.
+        """
+        background.enqueue("tests.record", value=1)
+        background.enqueue("tests.record", value=2)
+        delayed = background.enqueue("tests.record", delay=60, value=3)
+
+        # Une tâche par passe sans pool de threads (le pool est testé à part)
+        results = [background.run_pending(concurrency=1) for _ in range(3)]
+
+        self.assertEqual([result["succeeded"] for result in results], [1, 1, 0])
+        self.assertEqual(TASK_CALLS, [1, 2])
+        self.assertEqual(list(BackgroundTask.objects.all()), [delayed])
+
+    def test_failures_are_retried_then_marked_failed(self):
+        """
+        Une tâche en erreur est relancée plus tard, puis marquée Failed
+        après max_attempts exécutions.
+        """
+        task = background.enqueue("tests.fail", max_attempts=2, value="boom")
+
+        with self.assertLogs("projects.background", "ERROR"):
+            self.assertEqual(background.run_pending(concurrency=1), {"succeeded": 0, "failed": 1})
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (JobStatus.PENDING, 1))
+        self.assertGreater(task.run_after, timezone.now())
+        self.assertIn("boom", task.last_error)
+
+        BackgroundTask.objects.filter(pk=task.pk).update(run_after=timezone.now())
+        with self.assertLogs("projects.background", "ERROR"):
+            background.run_pending(concurrency=1)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (JobStatus.FAILED, 2))
+
+    def test_expired_reservation_is_claimed_again(self):
+        """
+        Une tâche dont la réservation a expiré est reprise ; le premier worker
+        ne peut plus la conclure.
+        """
+        background.enqueue("tests.record", value="reprise")
+        [first] = background.claim(1, visibility_timeout=60)
+        self.assertEqual(background.claim(1), [])
+
+        BackgroundTask.objects.filter(pk=first.pk).update(locked_until=timezone.now())
+        [second] = background.claim(1)
+        self.assertEqual(second.attempts, 2)
+        self.assertNotEqual(second.locked_by, first.locked_by)
+
+        # Le premier worker termine : son résultat n'est plus pris en compte
+        background.execute(first)
+        self.assertTrue(BackgroundTask.objects.filter(pk=second.pk).exists())
+        background.execute(second)
+        self.assertFalse(BackgroundTask.objects.exists())
+
+    def test_unknown_task_fails_immediately(self):
+        """
+        Une tâche sans fonction enregistrée échoue définitivement sans relance.
+        """
+        task = background.enqueue("tests.inconnue")
+        with self.assertLogs("projects.background", "ERROR"):
+            background.run_pending(concurrency=1)
+        task.refresh_from_db()
+        self.assertEqual(task.status, JobStatus.FAILED)
+
+
+class BackgroundTaskPoolTests(TransactionTestCase):
+    """
+    Exécution des tâches dans le pool de threads du worker.
+    """
+
+    def test_thread_pool_runs_each_task_once(self):
+        TASK_CALLS.clear()
+        for value in range(6):
+            background.enqueue("tests.record", value=value)
+
+        call_command("run_tasks", concurrency=3, stdout=io.StringIO())
+        call_command("run_tasks", concurrency=3, stdout=io.StringIO())
+
+        self.assertEqual(sorted(TASK_CALLS), list(range(6)))
+        self.assertFalse(BackgroundTask.objects.exists())
+
+
+@override_settings(NOTIFICATION_DIGEST_WINDOW=300)
+class NotificationDigestTests(BaseAPITestCase):
+    """
+    Tests des notifications d'assignation et de commentaire.
+
+    Vérifie le respect de can_be_contacted, le regroupement d'une rafale en un
+    seul résumé par utilisateur et la reprise après un échec d'envoi.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        background.discover_tasks()
+
+    def setUp(self):
+        self.user_author = self.create_user("author")
+        self.user_assignee = User.objects.create_user(
+            username="assignee", password="pass", age=20,
+            email="assignee@example.com", can_be_contacted=True,
+        )
+        self.user_silent = User.objects.create_user(
+            username="silent", password="pass", age=20,
+            email="silent@example.com", can_be_contacted=False,
+        )
+        self.project = Project.objects.create(
+            title="Projet", description="d", type="Back-End", author=self.user_author
+        )
+        for user in (self.user_author, self.user_assignee, self.user_silent):
+            Contributor.objects.create(user=user, project=self.project)
+        self.authenticate(self.user_author)
+
+    def create_issue(self, assignee):
+        response = self.client.post(
+            reverse("projects:project-issues-list", args=[self.project.id]),
+            {"title": "Issue", "description": "d", "tag": "Bug", "priority": "High",
+             "assignee_user": assignee.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return Issue.objects.get(pk=response.json()["id"])
+
+    def comment(self, issue, description):
+        response = self.client.post(
+            reverse("projects:issue-comments-list", args=[self.project.id, issue.id]),
+            {"description": description},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def send_after_window(self):
+        """
+        Vieillit les notifications au-delà de la fenêtre puis exécute les tâches prêtes.
+        """
+        past = timezone.now() - timezone.timedelta(seconds=301)
+        Notification.objects.update(created_time=past)
+        BackgroundTask.objects.update(run_after=past)
+        background.run_pending(concurrency=1)
+
+    def test_only_users_who_opted_in_are_notified(self):
+        """
+        L'assignation notifie un utilisateur qui accepte d'être contacté, pas les autres.
+        """
+        self.create_issue(self.user_silent)
+        self.assertFalse(Notification.objects.exists())
+
+        issue = self.create_issue(self.user_assignee)
+        notification = Notification.objects.get()
+        self.assertEqual(
+            (notification.user, notification.kind, notification.issue),
+            (self.user_assignee, NotificationKind.ASSIGNED, issue),
+        )
+        # Aucun e-mail pendant la requête : une tâche d'envoi est programmée après la fenêtre
+        self.assertEqual(len(mail.outbox), 0)
+        task = BackgroundTask.objects.get()
+        self.assertGreater(task.run_after, timezone.now() + timezone.timedelta(seconds=250))
+
+    def test_burst_of_comments_produces_a_single_digest(self):
+        """
+        Une rafale de commentaires ne programme qu'une tâche et n'envoie qu'un résumé.
+        """
+        issue = self.create_issue(self.user_assignee)
+        for index in range(30):
+            self.comment(issue, f"Commentaire {index}")
+        self.assertEqual(Notification.objects.count(), 31)
+        self.assertEqual(BackgroundTask.objects.count(), 1)
+
+        self.send_after_window()
+
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ["assignee@example.com"])
+        self.assertIn("31 notification(s)", message.subject)
+        self.assertIn("vous a été assignée par author", message.body)
+        self.assertIn("« Commentaire 29 »", message.body)
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(BackgroundTask.objects.exists())
+
+    def test_own_comments_and_opt_out_before_sending_are_skipped(self):
+        """
+        L'assigné n'est pas notifié de ses propres commentaires, et plus rien
+        ne lui est envoyé s'il retire son consentement avant l'envoi.
+        """
+        issue = self.create_issue(self.user_assignee)
+        self.authenticate(self.user_assignee)
+        self.comment(issue, "Mon propre commentaire")
+        self.assertEqual(Notification.objects.count(), 1)
+
+        User.objects.filter(pk=self.user_assignee.pk).update(can_be_contacted=False)
+        self.send_after_window()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_failed_send_keeps_notifications_for_retry(self):
+        """
+        Si le backend e-mail échoue, les notifications restent en attente et la
+        tâche est relancée.
+        """
+        self.create_issue(self.user_assignee)
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=ConnectionError("SMTP indisponible"),
+        ), self.assertLogs("projects.background", "ERROR"):
+            self.send_after_window()
+
+        notification = Notification.objects.get()
+        self.assertIsNone(notification.sending_time)
+        task = BackgroundTask.objects.get()
+        self.assertEqual((task.status, task.attempts), (JobStatus.PENDING, 1))
+
+        self.send_after_window()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_abandoned_claim_is_sent_again(self):
+        """
+        Des notifications réservées par un worker arrêté avant l'envoi sont
+        renvoyées une fois le délai de visibilité des tâches écoulé.
+        """
+        self.create_issue(self.user_assignee)
+        now = timezone.now()
+        Notification.objects.update(
+            created_time=now - timezone.timedelta(seconds=301),
+            sending_time=now - timezone.timedelta(seconds=60),
+        )
+        self.assertEqual(send_due_digests(), 0)
+        self.assertTrue(Notification.objects.exists())
+
+        Notification.objects.update(sending_time=now - timezone.timedelta(seconds=301))
+        self.assertEqual(send_due_digests(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(Notification.objects.exists())
+
+
+@override_settings(PROJECT_SHARDS=["default", "shard1"])
+class ShardingTests(BaseAPITestCase):
+    """
+    Tests de la répartition des projets sur deux bases (default et shard1).
+
+    Vérifie l'attribution des shards, le routage des routes imbriquées et
+    flat, et la fusion des listes flat interrogées sur tous les shards.
+    """
+    databases = {"default", "shard1"}
+
+    def setUp(self):
+        self.user = self.create_user("author")
+        self.authenticate(self.user)
+        self.projects = [self.create_project(f"Projet {index}") for index in range(2)]
+
+    def create_project(self, title):
+        response = self.client.post(
+            reverse("projects:project-list"),
+            {"title": title, "description": "d", "type": "Back-End"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def create_issue(self, project_id, title):
+        response = self.client.post(
+            reverse("projects:project-issues-list", args=[project_id]),
+            {"title": title, "description": "d", "tag": Tag.BUG, "priority": Priority.LOW},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def shard_of(self, project_id):
+        return ProjectShard.objects.get(pk=project_id).alias
+
+    def test_projects_are_spread_across_shards(self):
+        """
+        Les projets sont attribués aux shards à tour de rôle ; le projet et son
+        contributeur sont écrits sur la base indiquée par l'annuaire.
+        """
+        aliases = {self.shard_of(project_id) for project_id in self.projects}
+        self.assertEqual(aliases, {"default", "shard1"})
+        for project_id in self.projects:
+            alias = self.shard_of(project_id)
+            self.assertTrue(Project.objects.using(alias).filter(pk=project_id).exists())
+            self.assertTrue(
+                Contributor.objects.using(alias).filter(project_id=project_id, user=self.user).exists()
+            )
+
+        response = self.client.get(reverse("projects:project-list"))
+        self.assertEqual(response.data["total_items"], 2)
+        self.assertEqual(
+            [project["id"] for project in response.data["results"]], self.projects
+        )
+
+    def test_nested_and_flat_routes_use_the_project_shard(self):
+        """
+        Une issue créée sous un projet est stockée sur son shard, et reste
+        accessible par les routes imbriquées et flat.
+        """
+        project_id = next(pk for pk in self.projects if self.shard_of(pk) == "shard1")
+        issue_id = self.create_issue(project_id, "Sur shard1")
+        self.assertTrue(Issue.objects.using("shard1").filter(pk=issue_id).exists())
+        self.assertFalse(Issue.objects.using("default").filter(pk=issue_id).exists())
+
+        response = self.client.get(
+            reverse("projects:project-issues-detail", args=[project_id, issue_id])
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse("projects:issue-detail", args=[issue_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "Sur shard1")
+
+        response = self.client.post(
+            reverse("projects:comment-list"),
+            {"description": "Commentaire", "issue": issue_id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Comment.objects.using("shard1").filter(pk=response.data["id"]).exists())
+
+    def test_flat_issue_list_merges_shards_by_creation_time(self):
+        """
+        /issues/ interroge tous les shards et fusionne les issues par date de
+        création ; la pagination porte sur le résultat fusionné.
+        """
+        created = [
+            self.create_issue(self.projects[index % 2], f"Issue {index}") for index in range(5)
+        ]
+        response = self.client.get(reverse("projects:issue-list"), {"page_size": 3})
+        self.assertEqual(response.data["total_items"], 5)
+        self.assertEqual([issue["id"] for issue in response.data["results"]], created[:3])
+
+        response = self.client.get(reverse("projects:issue-list"), {"page_size": 3, "page": 2})
+        self.assertEqual([issue["id"] for issue in response.data["results"]], created[3:])
+
+    def test_issue_and_contributor_ids_are_unique_across_shards(self):
+        """
+        Deux issues créées en même temps sur deux shards reçoivent des
+        identifiants distincts : chaque auteur accède à la sienne par la route
+        flat, et le journal des modifications ne confond pas les deux.
+        """
+        other = self.create_user("other")
+        self.authenticate(other)
+        other_project = self.create_project("Projet de other")
+        other_issue = self.create_issue(other_project, "Issue de other")
+
+        self.authenticate(self.user)
+        project_id = next(
+            pk for pk in self.projects if self.shard_of(pk) != self.shard_of(other_project)
+        )
+        issue_id = self.create_issue(project_id, "Issue de author")
+
+        self.assertNotEqual(issue_id, other_issue)
+        self.assertEqual(
+            {IssueShard.objects.get(pk=pk).alias for pk in (issue_id, other_issue)},
+            {"default", "shard1"},
+        )
+        for user, pk in ((self.user, issue_id), (other, other_issue)):
+            self.authenticate(user)
+            url = reverse("projects:issue-detail", args=[pk])
+            self.assertEqual(self.client.get(url).status_code, 200)
+            response = self.client.patch(url, {"title": "Modifiée"}, format="json")
+            self.assertEqual(response.status_code, 200)
+
+        object_ids = Change.objects.filter(type=ChangeType.ISSUE).values_list("object_id", flat=True)
+        self.assertEqual(set(object_ids), {str(issue_id), str(other_issue)})
+        contributor_ids = [
+            pk for alias in ("default", "shard1")
+            for pk in Contributor.objects.using(alias).values_list("pk", flat=True)
+        ]
+        self.assertEqual(len(contributor_ids), len(set(contributor_ids)))
+
+    def test_inbox_feed_digest_and_archive_read_every_shard(self):
+        """
+        Une issue stockée sur shard1 apparaît dans la boîte « travail assigné »
+        et le journal des modifications, déclenche un résumé par e-mail et
+        peut être archivée.
+        """
+        assignee = User.objects.create_user(
+            username="assignee", password="pass", age=20,
+            email="assignee@example.com", can_be_contacted=True,
+        )
+        project_id = next(pk for pk in self.projects if self.shard_of(pk) == "shard1")
+        with use_shard("shard1"):
+            Contributor.objects.create(user=assignee, project_id=project_id)
+        response = self.client.post(
+            reverse("projects:project-issues-list", args=[project_id]),
+            {"title": "Sur shard1", "description": "d", "tag": Tag.BUG,
+             "priority": Priority.LOW, "assignee_user": assignee.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        issue_id = response.data["id"]
+
+        self.authenticate(assignee)
+        response = self.client.get(reverse("projects:issue-assigned-to-me"))
+        self.assertEqual([issue["id"] for issue in response.data["results"]], [issue_id])
+        changes = self.client.get(reverse("projects:changes")).data["changes"]
+        self.assertIn(("issue", str(issue_id)), [(c["type"], c["id"]) for c in changes])
+
+        Notification.objects.update(created_time=timezone.now() - timezone.timedelta(seconds=301))
+        self.assertEqual(send_due_digests(), 1)
+        self.assertIn("Sur shard1", mail.outbox[0].body)
+
+        Issue.objects.using("shard1").filter(pk=issue_id).update(
+            status=Status.FINISHED, updated_time=timezone.now() - timezone.timedelta(days=91)
+        )
+        self.assertEqual(archive_finished_issues(older_than_days=90), 1)
+        self.assertFalse(Issue.objects.using("shard1").filter(pk=issue_id).exists())
+        self.assertTrue(ArchivedIssue.objects.filter(pk=issue_id).exists())
+
+    def test_project_on_other_shard_is_purged_in_shard_transactions(self):
+        """
+        La purge d'un projet stocké sur shard1 supprime ses lignes sur ce shard,
+        chaque lot étant dans une transaction ouverte sur shard1.
+        """
+        project_id = next(pk for pk in self.projects if self.shard_of(pk) == "shard1")
+        self.create_issue(project_id, "À purger")
+        response = self.client.delete(reverse("projects:project-detail", args=[project_id]))
+        self.assertEqual(response.status_code, 202)
+
+        with mock.patch("projects.deletion.multi_atomic", wraps=writes.multi_atomic) as atomic:
+            self.assertEqual(process_pending_jobs(), 1)
+        self.assertTrue(atomic.call_args_list)
+        self.assertTrue(all("shard1" in call.args[0] for call in atomic.call_args_list))
+        self.assertFalse(Project.objects.using("shard1").filter(pk=project_id).exists())
+        self.assertFalse(Issue.objects.using("shard1").filter(project_id=project_id).exists())
+
+    def test_unknown_issue_is_not_found(self):
+        """
+        Une issue introuvable sur tous les shards donne une 404.
+        """
+        response = self.client.get(reverse("projects:issue-detail", args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(PROJECT_SHARDS=["default", "shard1"])
+class ShardedFanOutTests(TransactionTestCase):
+    """
+    Interrogation parallèle des shards (hors transaction : un thread par shard).
+    """
+    databases = {"default", "shard1"}
+
+    def test_parallel_fan_out_merges_sorted_pages(self):
+        user = User.objects.create_user(username="author", password="pass", age=20)
+        created = []
+        for index in range(4):
+            project = Project.objects.create(
+                title=f"Projet {index}", description="d", type="Back-End", author=user
+            )
+            with use_shard(project._state.db):
+                created.append(Issue.objects.create(
+                    title=f"Issue {index}", description="d", tag=Tag.BUG,
+                    priority=Priority.LOW, project=project, author=user,
+                ).pk)
+
+        results = ShardedResults(Issue.objects.all(), ("created_time", "id"))
+        self.assertEqual(results.count(), 4)
+        self.assertEqual([issue.pk for issue in results[1:3]], created[1:3])
+        self.assertEqual({issue._state.db for issue in results}, {"default", "shard1"})
+
+
+@override_settings(PROJECT_SHARDS=["default", "shard1"])
+class ShardedWriteRetryTests(TransactionTestCase):
+    """
+    Reprise d'une écriture répartie entre un shard et la base par défaut
+    (hors transaction de test : write_transaction ouvre ses transactions).
+    """
+    databases = {"default", "shard1"}
+
+    def test_locked_write_is_rolled_back_on_every_database(self):
+        """
+        Une erreur de verrou sur la base par défaut annule aussi l'issue écrite
+        sur le shard : la reprise ne la crée qu'une fois.
+        """
+        user = User.objects.create_user(username="author", password="pass", age=20)
+        client = APIClient()
+        client.force_authenticate(user)
+        projects = [
+            client.post(
+                reverse("projects:project-list"),
+                {"title": f"Projet {index}", "description": "d", "type": "Back-End"},
+                format="json",
+            ).data["id"]
+            for index in range(2)
+        ]
+        project_id = next(
+            pk for pk in projects if ProjectShard.objects.get(pk=pk).alias == "shard1"
+        )
+
+        calls = []
+
+        def locked_once(instance, *args, **kwargs):
+            calls.append(instance.pk)
+            if len(calls) == 1:
+                raise OperationalError("database is locked")
+            return record_change(instance, *args, **kwargs)
+
+        with mock.patch("projects.views.record_change", side_effect=locked_once), \
+                mock.patch("softdesk.writes.time.sleep"):
+            response = client.post(
+                reverse("projects:project-issues-list", args=[project_id]),
+                {"title": "Issue", "description": "d", "tag": Tag.BUG, "priority": Priority.LOW},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            list(Issue.objects.using("shard1").values_list("pk", flat=True)), [response.data["id"]]
+        )
+        self.assertEqual(Issue.objects.using("default").count(), 0)
+
+
+class SerializerFieldCacheTests(SimpleTestCase):
+    """
+    Tests du cache des champs de sérialiseurs (CachedFieldsMixin).
+    """
+
+    def test_fields_are_built_once_per_class(self):
+        IssueSerializer().fields
+        with mock.patch.object(
+            serializers.ModelSerializer, "get_fields", side_effect=AssertionError("reconstruit")
+        ):
+            first, second = IssueSerializer(), IssueSerializer()
+            self.assertEqual(list(first.fields), list(second.fields))
+        # Chaque instance a ses propres champs, liés à elle
+        self.assertIsNot(first.fields["title"], second.fields["title"])
+        self.assertIs(first.fields["title"].parent, first)
+        first.fields["title"].required = False
+        self.assertTrue(second.fields["title"].required)
+
+    def test_route_variants_are_cached_separately(self):
+        self.assertTrue(IssueSerializer().fields["project"].required)
+        self.assertFalse(NestedIssueSerializer().fields["project"].required)
+        self.assertTrue(IssueSerializer().fields["project"].required)
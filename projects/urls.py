@@ -7,6 +7,9 @@ from .views import (
     ContributorViewSet,
     IssueViewSet,
     CommentViewSet,
+    ProjectDeletionJobViewSet,
+    ChangeFeedView,
+    comment_stream,
 )
 
 # --------------------------------------------------------------------
@@ -21,6 +24,10 @@ router.register(r"contributors", ContributorViewSet, basename="contributor")
 router.register(r"issues", IssueViewSet, basename="issue")
 # Commentaire : /comments/ et /comments/{id}/
 router.register(r"comments", CommentViewSet, basename="comment")
+# Suivi des suppressions : /deletion-jobs/ et /deletion-jobs/{id}/
+router.register(
+    r"deletion-jobs", ProjectDeletionJobViewSet, basename="deletion-job"
+)
 
 # --------------------------------------------------------------------
 # Routeurs imbriqués sous /projects/{project_pk}/...
@@ -45,6 +52,14 @@ issues_router.register(r"comments", CommentViewSet, basename="issue-comments")
 # - Les deux sets (plats et imbriqués) coexistent
 # --------------------------------------------------------------------
 urlpatterns = [
+    # Flux de synchronisation incrémentale : /changes/?since=<curseur>
+    path("changes/", ChangeFeedView.as_view(), name="changes"),
+    # Flux SSE des nouveaux commentaires (déclaré avant le détail des commentaires)
+    path(
+        "projects/<int:project_pk>/issues/<int:issue_pk>/comments/stream/",
+        comment_stream,
+        name="issue-comments-stream",
+    ),
     # Endpoints CRUD classiques
     path("", include(router.urls)),
     # Endpoints imbriqués projet->subresources
@@ -1,24 +1,144 @@
-from rest_framework import viewsets
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import (
+    APIException,
+    NotAuthenticated,
+    NotFound,
+    PermissionDenied,
+    ValidationError,
+)
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework import permissions as drf_permissions
-from .permissions import IsAuthor, IsContributor
-from .models import Project, Contributor, Issue, Comment
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from softdesk.writes import write_transaction
+from .permissions import IsAuthor, IsContributor, annotate_access
+from .models import (
+    Project,
+    Contributor,
+    Issue,
+    Comment,
+    ArchivedIssue,
+    ArchivedComment,
+    InboxEntry,
+    ProjectDeletionJob,
+)
+from .changes import (
+    build_feed,
+    record_change,
+    record_project_grants,
+    record_project_tombstones,
+)
+from .constants import ChangeAction
+from .deletion import schedule_project_deletion
+from .expand import ISSUE_EXPANSIONS, PROJECT_EXPANSIONS, ExpandMixin
+from .inbox import add_contributors, remove_projects, sync_issue
+from .notifications import notify_assignment, notify_comment
+from .outbox import enqueue_event
+from .related import get_related_objects
+from .streams import event_stream
+from .sharding import (
+    ShardedViewMixin,
+    allocate_ids,
+    current_shard,
+    is_sharded,
+    load_related,
+    select_users,
+    use_shard,
+)
 from .serializers import (
     ProjectSerializer,
     ContributorSerializer,
+    ContributorBulkSerializer,
     IssueSerializer,
+    NestedIssueSerializer,
     CommentSerializer,
+    ArchivedIssueSerializer,
+    ArchivedCommentSerializer,
+    ProjectDeletionJobSerializer,
 )
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class RecordChangesMixin:
+    """
+    Enregistre dans le journal des modifications (flux /changes/) et dans
+    l'outbox des webhooks les mises à jour et suppressions, dans la même
+    transaction que l'écriture.
+
+    Les créations sont enregistrées par le perform_create de chaque viewset.
+    """
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            super().perform_update(serializer)
+            record_change(serializer.instance)
+            enqueue_event(serializer.instance, "updated")
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            record_change(instance, ChangeAction.DELETE)
+            enqueue_event(instance, "deleted")
+            super().perform_destroy(instance)
+
+
+class ArchiveFallbackMixin:
+    """
+    Repli transparent sur la table d'archive pour la route de détail (retrieve).
+
+    Les listes n'interrogent que la table active ; un objet introuvable en
+    détail est recherché dans l'archive avec les mêmes règles d'accès, et
+    renvoyé en lecture seule. Les écritures sur un objet archivé donnent 404.
+    """
+    archive_queryset = None
+    archive_serializer_class = None
+
+    def get_archive_queryset(self):
+        """
+        Objets archivés consultables ; les sous-classes définissent
+        archive_queryset ou surchargent cette méthode (filtres d'accès).
+        """
+        if self.archive_queryset is None:
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} doit définir archive_queryset "
+                "ou surcharger get_archive_queryset()."
+            )
+        return self.archive_queryset.all()
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            instance = get_object_or_404(
+                self.get_archive_queryset(), pk=self.kwargs[lookup_url_kwarg]
+            )
+            self.check_object_permissions(request, instance)
+            serializer = self.archive_serializer_class(
+                instance, context=self.get_serializer_context()
+            )
+            return Response(serializer.data)
+
+
+class ProjectViewSet(ShardedViewMixin, ExpandMixin, RecordChangesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les opérations CRUD sur les projets.
 
     - list/retrieve : l'utilisateur doit être contributeur du projet.
     - create : tout utilisateur authentifié peut créer un projet.
     - update/partial_update/destroy : seul l'auteur du projet peut modifier ou supprimer.
+    - destroy : la suppression est différée, la réponse 202 pointe vers la tâche de purge.
+    - list/retrieve acceptent ?expand=contributors,issues (voir projects/expand.py).
     """
     serializer_class = ProjectSerializer
+    sharded_model = Project
+    expansions = PROJECT_EXPANSIONS
     permission_classes = [drf_permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -26,13 +146,17 @@ class ProjectViewSet(viewsets.ModelViewSet):
         Retourne les projets accessibles à l'utilisateur.
 
         - En génération de schéma Swagger, renvoie un queryset vide pour éviter les erreurs.
-        - Sinon, filtre les projets où l'utilisateur est contributeur.
+        - Sinon, filtre les projets où l'utilisateur est contributeur,
+          hors projets en attente de suppression.
+        Les drapeaux is_contributor/is_author (annotate_access) sont lus par
+        les permissions : lecture et autorisation en une requête.
         """
         if getattr(self, 'swagger_fake_view', False):
             return Project.objects.none()
 
-        user = self.request.user
-        return Project.objects.filter(contributors__user=user).distinct()
+        qs = select_users(Project.objects.filter(pending_deletion=False), "author")
+        qs = annotate_access(qs, self.request.user, "pk").filter(is_contributor=True)
+        return self.expand_queryset(qs)
 
     def get_permissions(self):
         """
@@ -52,18 +176,64 @@ class ProjectViewSet(viewsets.ModelViewSet):
         Lors de la création, l'utilisateur devient l'auteur du projet
         et est automatiquement ajouté comme contributeur.
         """
-        project = serializer.save(author=self.request.user)
-        Contributor.objects.create(user=self.request.user, project=project)
+        with transaction.atomic():
+            project = serializer.save(author=self.request.user)
+            # Le shard du projet n'est connu qu'après son attribution
+            with use_shard(project._state.db):
+                Contributor.objects.create(user=self.request.user, project=project)
+            record_change(project)
 
+    def destroy(self, request, *args, **kwargs):
+        """
+        Marque le projet pour suppression et délègue la purge en cascade
+        au worker (commande purge_deleted_projects).
+
+        Returns:
+            Response: 202 avec la tâche créée et son URL de suivi.
+        """
+        project = self.get_object()
+        job = schedule_project_deletion(project, request.user)
+        serializer = ProjectDeletionJobSerializer(
+            job, context=self.get_serializer_context()
+        )
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": serializer.data["status_url"]},
+        )
 
-class ContributorViewSet(viewsets.ModelViewSet):
+
+class ProjectDeletionJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet en lecture seule pour suivre les suppressions de projets.
+
+    - list/retrieve : uniquement les tâches demandées par l'utilisateur.
+    """
+    serializer_class = ProjectDeletionJobSerializer
+    permission_classes = [drf_permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Retourne les tâches de suppression de l'utilisateur, les plus récentes d'abord.
+        """
+        if getattr(self, 'swagger_fake_view', False):
+            return ProjectDeletionJob.objects.none()
+
+        return ProjectDeletionJob.objects.filter(
+            requested_by=self.request.user
+        ).order_by("-created_time", "-id")
+
+
+class ContributorViewSet(ShardedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les contributeurs d'un projet.
 
-    - Sans paramètre project_pk : renvoie tous les contributeurs (flat routes).
-    - Avec project_pk : renvoie les contributeurs de ce projet uniquement.
+    - Sans paramètre project_pk : contributeurs des projets de l'utilisateur (flat routes).
+    - Avec project_pk : contributeurs de ce projet, si l'utilisateur y contribue.
+    - bulk (nested) : ajout/retrait groupé, réservé à l'auteur du projet.
     """
     serializer_class = ContributorSerializer
+    sharded_model = Contributor
     permission_classes = [drf_permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -71,18 +241,92 @@ class ContributorViewSet(viewsets.ModelViewSet):
         Retourne le queryset de Contributor selon le contexte :
         - Swagger : vide
         - project_pk fourni : contributeurs de ce projet
-        - sinon : tous les contributeurs
+        - sinon : contributeurs de tous les projets de l'utilisateur
+        Dans les deux cas, seuls les projets dont l'utilisateur est contributeur
+        sont visibles (sous-requête servie par l'index unique (user, project)),
+        hors projets en attente de suppression.
         """
         if getattr(self, 'swagger_fake_view', False):
             return Contributor.objects.none()
 
+        my_projects = Contributor.objects.filter(
+            user=self.request.user, project__pending_deletion=False
+        ).values("project_id")
+        qs = Contributor.objects.filter(project_id__in=my_projects).order_by("id")
         project_id = self.kwargs.get("project_pk")
         if project_id is None:
-            return Contributor.objects.all()
-        return Contributor.objects.filter(project__id=project_id)
+            return qs
+        return qs.filter(project__id=project_id)
+
+    def perform_destroy(self, instance):
+        """
+        Retire le contributeur et lui signale la perte d'accès au projet
+        dans le flux de synchronisation.
+        """
+        with transaction.atomic():
+            record_project_tombstones([instance.project_id], users=[instance.user_id])
+            remove_projects([instance.project_id], user_ids=[instance.user_id])
+            instance.delete()
+
+    @action(detail=False, methods=["post"], serializer_class=ContributorBulkSerializer)
+    def bulk(self, request, project_pk=None):
+        """
+        Ajoute et retire des contributeurs en une requête :
+        {"add": [ids], "remove": [ids]}.
+
+        Les utilisateurs sont validés en une requête ; les ajouts sont faits par
+        bulk_create et les retraits par un seul DELETE. L'auteur du projet ne
+        peut pas être retiré.
+
+        Returns:
+            Response: {"added": [ids], "removed": [ids]}.
+        """
+        if project_pk is None:
+            raise NotFound("Disponible uniquement sur /projects/{id}/contributors/bulk/.")
+        project = get_object_or_404(
+            Project.objects.filter(pending_deletion=False), pk=project_pk
+        )
+        if project.author_id != request.user.id:
+            raise PermissionDenied("Seul l'auteur du projet peut gérer ses contributeurs.")
+
+        serializer = ContributorBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        add = serializer.validated_data["add"]
+        remove = serializer.validated_data["remove"]
+        if project.author_id in remove:
+            raise ValidationError({"remove": "L'auteur du projet ne peut pas être retiré."})
+
+        with transaction.atomic():
+            members = Contributor.objects.filter(project=project)
+            existing = set(
+                members.filter(user_id__in=add + remove).values_list("user_id", flat=True)
+            )
+            added = [user_id for user_id in add if user_id not in existing]
+            removed = [user_id for user_id in remove if user_id in existing]
+
+            # bulk_create n'appelle pas save() : les identifiants globaux sont réservés ici
+            ids = allocate_ids(Contributor, project._state.db, len(added)) if added else []
+            Contributor.objects.bulk_create(
+                [
+                    Contributor(pk=pk, user_id=user_id, project=project)
+                    for pk, user_id in zip(ids, added)
+                ],
+                ignore_conflicts=True,
+            )
+            record_project_grants(project.pk, added)
+            add_contributors(project.pk, added)
 
+            if removed:
+                record_project_tombstones([project.pk], users=removed)
+                remove_projects([project.pk], user_ids=removed)
+                members.filter(user_id__in=removed).delete()
 
-class IssueViewSet(viewsets.ModelViewSet):
+        return Response({"added": added, "removed": removed})
+
+
+class IssueViewSet(
+    ShardedViewMixin, ExpandMixin, ArchiveFallbackMixin, RecordChangesMixin, viewsets.ModelViewSet
+):
     """
     ViewSet pour gérer les issues.
 
@@ -90,8 +334,13 @@ class IssueViewSet(viewsets.ModelViewSet):
     - list/retrieve (nested)        : limité au projet parent.
     - create (flat/nested)          : l'utilisateur doit être contributeur.
     - update/partial_update/destroy : seul l'auteur de l'issue peut modifier.
+    - retrieve d'une issue archivée : lecture seule, avec ses commentaires.
+    - list/retrieve acceptent ?expand=comments,project (voir projects/expand.py).
     """
     serializer_class = IssueSerializer
+    archive_serializer_class = ArchivedIssueSerializer
+    sharded_model = Issue
+    expansions = ISSUE_EXPANSIONS
 
     def get_queryset(self):
         """
@@ -99,20 +348,46 @@ class IssueViewSet(viewsets.ModelViewSet):
         - Swagger : queryset vide
         - nested (project_pk) : issues du projet où l'utilisateur contribue
         - flat list           : issues de tous les projets de l'utilisateur
+        Les projets en attente de suppression sont exclus.
+        Les drapeaux is_contributor/is_author (annotate_access) sont lus par
+        les permissions : lecture et autorisation en une requête.
         """
         if getattr(self, 'swagger_fake_view', False):
             return Issue.objects.none()
 
-        qs = Issue.objects.all().distinct()
+        qs = annotate_access(
+            select_users(Issue.objects.filter(project__pending_deletion=False), "author"),
+            self.request.user,
+            "project_id",
+        )
         project_pk = self.kwargs.get("project_pk")
         if project_pk:
-            qs = qs.filter(
-                project__id=project_pk,
-                project__contributors__user=self.request.user
-            )
+            qs = qs.filter(project__id=project_pk, is_contributor=True)
         elif self.action == "list":
-            qs = qs.filter(project__contributors__user=self.request.user)
-        return qs
+            qs = qs.filter(is_contributor=True)
+        return self.expand_queryset(qs)
+
+    def get_serializer_class(self):
+        """
+        Routes imbriquées : variante dont le projet vient de l'URL.
+        """
+        if self.kwargs.get("project_pk") is not None:
+            return NestedIssueSerializer
+        return super().get_serializer_class()
+
+    def get_archive_queryset(self):
+        """
+        Issues archivées, filtrées comme get_queryset pour la route de détail.
+        """
+        qs = annotate_access(
+            ArchivedIssue.objects.filter(project__pending_deletion=False).select_related("author"),
+            self.request.user,
+            "project_id",
+        )
+        project_pk = self.kwargs.get("project_pk")
+        if project_pk:
+            qs = qs.filter(project__id=project_pk, is_contributor=True)
+        return qs.prefetch_related("comments__author")
 
     def get_permissions(self):
         """
@@ -131,16 +406,67 @@ class IssueViewSet(viewsets.ModelViewSet):
         À la création, détermine le projet :
         - nested : via project_pk
         - flat   : via le champ project du serializer
+        L'écriture est coordonnée par write_transaction (softdesk/writes.py).
         """
         project_pk = self.kwargs.get("project_pk")
         if project_pk:
-            project = Project.objects.get(pk=project_pk)
+            project = get_related_objects(self.request).get(Project, project_pk)
         else:
             project = serializer.validated_data.get("project")
-        serializer.save(author=self.request.user, project=project)
 
+        def create():
+            # Une tentative annulée (base verrouillée) ne doit pas laisser d'instance
+            serializer.instance = None
+            issue = serializer.save(author=self.request.user, project=project)
+            record_change(issue)
+            enqueue_event(issue, "created")
+            sync_issue(issue)
+            notify_assignment(issue, self.request.user)
 
-class CommentViewSet(viewsets.ModelViewSet):
+        # L'issue est écrite sur le shard, son journal et ses événements sur la base par défaut
+        write_transaction(create, using=(DEFAULT_DB_ALIAS, current_shard()))
+
+    def perform_update(self, serializer):
+        """
+        Répercute le changement d'assignation, de statut ou de priorité
+        dans la boîte « travail assigné », et notifie le nouvel assigné.
+        """
+        previous_assignee = serializer.instance.assignee_user_id
+        with transaction.atomic():
+            super().perform_update(serializer)
+            sync_issue(serializer.instance)
+            if serializer.instance.assignee_user_id != previous_assignee:
+                notify_assignment(serializer.instance, self.request.user)
+
+    @action(detail=False, url_path="assigned-to-me")
+    def assigned_to_me(self, request, project_pk=None):
+        """
+        Issues ouvertes assignées à l'utilisateur, tous projets confondus,
+        par priorité (High d'abord) puis ancienneté (les plus anciennes d'abord).
+
+        Lu dans la table InboxEntry, dont l'index suit exactement ce tri.
+        """
+        entries = InboxEntry.objects.filter(user=request.user)
+        if project_pk is not None:
+            entries = entries.filter(project_id=project_pk)
+        entries = entries.order_by("priority_rank", "issue_created_time", "issue_id")
+        if not is_sharded():
+            entries = entries.select_related("issue__author")
+        page = self.paginate_queryset(entries)
+        entries = list(page if page is not None else entries)
+        if is_sharded():
+            # Les issues sont sur leurs shards, les entrées sur la base par défaut
+            load_related(entries, "issue", select_users(Issue.objects.all(), "author"))
+        issues = [entry.issue for entry in entries if entry.issue is not None]
+        serializer = self.get_serializer(issues, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+
+class CommentViewSet(
+    ShardedViewMixin, ArchiveFallbackMixin, RecordChangesMixin, viewsets.ModelViewSet
+):
     """
     ViewSet pour gérer les commentaires d'une issue.
 
@@ -148,8 +474,12 @@ class CommentViewSet(viewsets.ModelViewSet):
     - list/retrieve (nested)   : commentaires d'une issue précise.
     - create (flat/nested)     : IsContributor
     - update/partial_update/destroy : IsAuthor
+    - retrieve d'un commentaire archivé : lecture seule.
     """
     serializer_class = CommentSerializer
+    archive_serializer_class = ArchivedCommentSerializer
+    sharded_model = Comment
+    sharded_ordering = ("id",)
     permission_classes = [drf_permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -158,33 +488,74 @@ class CommentViewSet(viewsets.ModelViewSet):
         - Swagger : queryset vide
         - nested (issue_pk) : commentaires de cette issue si contributeur
         - flat list         : tous les commentaires pour les projets contrib.
+        Les projets en attente de suppression sont exclus.
+        Les drapeaux is_contributor/is_author (annotate_access) sont lus par
+        les permissions : lecture et autorisation en une requête.
+
+        Les listes sont triées par id (UUIDv7, donc par ordre de création) et
+        acceptent ?after=<id> pour une pagination par clé : le client passe
+        le dernier id reçu et le parcours reste stable malgré les insertions.
         """
         if getattr(self, 'swagger_fake_view', False):
             return Comment.objects.none()
 
-        qs = Comment.objects.all().distinct()
+        qs = annotate_access(
+            select_users(Comment.objects.filter(issue__project__pending_deletion=False), "author"),
+            self.request.user,
+            "issue__project_id",
+        )
         issue_pk = self.kwargs.get("issue_pk")
         if issue_pk:
-            qs = qs.filter(
-                issue__id=issue_pk,
-                issue__project__contributors__user=self.request.user
-            )
+            qs = qs.filter(issue__id=issue_pk, is_contributor=True)
         elif self.action == "list":
-            qs = qs.filter(issue__project__contributors__user=self.request.user)
-        return qs
+            qs = qs.filter(is_contributor=True)
+
+        if self.action == "list":
+            after = self.request.query_params.get("after")
+            if after:
+                try:
+                    qs = qs.filter(id__gt=uuid.UUID(after))
+                except ValueError:
+                    raise ValidationError(
+                        {"after": "after doit être un identifiant de commentaire."}
+                    )
+        return qs.order_by("id")
+
+    def get_archive_queryset(self):
+        """
+        Commentaires archivés, filtrés comme get_queryset pour la route de détail.
+        """
+        qs = annotate_access(
+            ArchivedComment.objects.filter(issue__project__pending_deletion=False),
+            self.request.user,
+            "issue__project_id",
+        )
+        issue_pk = self.kwargs.get("issue_pk")
+        if issue_pk:
+            qs = qs.filter(issue__id=issue_pk, is_contributor=True)
+        return qs.select_related("author")
 
     def perform_create(self, serializer):
         """
         Lors de la création :
         - nested : récupère l'issue via issue_pk
         - flat   : issue fourni dans le payload
+        L'écriture est coordonnée par write_transaction (softdesk/writes.py).
         """
         issue_id = self.kwargs.get("issue_pk")
         if issue_id:
-            issue = Issue.objects.get(pk=issue_id)
+            issue = get_related_objects(self.request).get(Issue, issue_id)
         else:
             issue = serializer.validated_data.get("issue")
-        serializer.save(author=self.request.user, issue=issue)
+
+        def create():
+            serializer.instance = None
+            comment = serializer.save(author=self.request.user, issue=issue)
+            record_change(comment)
+            enqueue_event(comment, "created")
+            notify_comment(comment, self.request.user)
+
+        write_transaction(create, using=(DEFAULT_DB_ALIAS, current_shard()))
 
     def get_permissions(self):
         """
@@ -197,3 +568,103 @@ class CommentViewSet(viewsets.ModelViewSet):
         elif self.action in ["update", "partial_update", "destroy"]:
             return [drf_permissions.IsAuthenticated(), IsAuthor()]
         return [drf_permissions.IsAuthenticated()]
+
+
+class ChangeFeedView(APIView):
+    """
+    Flux de synchronisation incrémentale : /changes/?since=<curseur>.
+
+    Renvoie, dans l'ordre du journal, les projets, issues et commentaires créés,
+    modifiés ou supprimés (tombstones) depuis le curseur, limités aux projets
+    visibles par l'utilisateur. Le client rejoue les entrées puis conserve
+    le champ "cursor" de la réponse pour sa prochaine synchronisation ;
+    "has_more" indique qu'une autre page est disponible immédiatement.
+
+    Paramètres :
+        since (int) : dernier curseur reçu (0 pour rejouer tout le journal).
+        limit (int) : nombre maximal d'entrées lues (défaut 200, max 1000).
+    """
+    permission_classes = [drf_permissions.IsAuthenticated]
+    default_limit = 200
+    max_limit = 1000
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get("since", 0))
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            raise ValidationError({"since": "since et limit doivent être des entiers."})
+        if since < 0 or limit < 1:
+            raise ValidationError({"since": "since doit être ≥ 0 et limit ≥ 1."})
+
+        feed = build_feed(
+            request.user,
+            since,
+            min(limit, self.max_limit),
+            {"request": request},
+        )
+        return Response(feed)
+
+
+def _authorize_comment_stream(request, project_pk, issue_pk):
+    """
+    Authentifie la requête (JWT) et applique les règles d'IsContributor à l'issue.
+
+    Le jeton est lu dans l'en-tête Authorization ou, à défaut, dans le paramètre
+    ?token= (l'API EventSource des navigateurs ne permet pas d'en-têtes).
+
+    Returns:
+        Issue: issue à suivre.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token is None and request.GET.get("token"):
+        raw_token = request.GET["token"].encode()
+    if raw_token is None:
+        raise NotAuthenticated()
+    request.user = auth.get_user(auth.get_validated_token(raw_token))
+
+    issue = Issue.objects.filter(
+        pk=issue_pk, project_id=project_pk, project__pending_deletion=False
+    ).first()
+    if issue is None:
+        raise NotFound("Issue introuvable.")
+    if not IsContributor().has_object_permission(request, None, issue):
+        raise PermissionDenied("Vous n'êtes pas contributeur de ce projet.")
+    return issue
+
+
+async def comment_stream(request, project_pk, issue_pk):
+    """
+    Flux Server-Sent Events des nouveaux commentaires d'une issue :
+    /projects/{project_pk}/issues/{issue_pk}/comments/stream/.
+
+    - Réservé aux contributeurs du projet (mêmes règles qu'IsContributor).
+    - Reprise après coupure via l'en-tête Last-Event-ID.
+    - Servi par l'application ASGI (softdesk/asgi.py) : la connexion reste
+      ouverte sans bloquer de thread.
+    """
+    try:
+        issue = await sync_to_async(_authorize_comment_stream)(
+            request, project_pk, issue_pk
+        )
+    except APIException as exc:
+        # Vue Django (non DRF) : les erreurs sont rendues comme le ferait DRF
+        data = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        return JsonResponse(data, status=exc.status_code)
+
+    last_event_id = request.headers.get("Last-Event-ID")
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        event_stream(issue.pk, issue.project_id, last_event_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Désactive la mise en tampon des proxys (nginx)
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,208 @@
+"""
+Livraison des webhooks à partir de l'outbox.
+
+Chaque webhook possède un curseur (last_event_id) dans l'outbox : une passe
+de livraison lit, pour chaque webhook dû, le lot d'événements suivant son
+curseur et l'envoie en un seul POST JSON. Les appels HTTP sont faits en
+parallèle dans un pool de threads borné ; les lectures et écritures en base
+restent dans le thread principal.
+
+En cas d'échec, le curseur n'avance pas (ordre préservé) et la prochaine
+tentative est repoussée selon un backoff exponentiel avec jitter.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import random
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import OutboxEvent, WebhookEndpoint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 5.0
+BASE_BACKOFF_SECONDS = 2
+MAX_BACKOFF_SECONDS = 3600
+
+SIGNATURE_HEADER = "X-Softdesk-Signature"
+
+
+@dataclass
+class Delivery:
+    """
+    Lot d'événements prêt à être envoyé à un webhook.
+    """
+    endpoint: WebhookEndpoint
+    last_event_id: int
+    count: int
+    body: bytes
+
+
+def sign(secret, body):
+    """
+    Signature HMAC-SHA256 hexadécimale du corps, vérifiable par le destinataire.
+    """
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def backoff_delay(failures):
+    """
+    Délai avant la tentative suivante : exponentiel, plafonné, avec jitter ±50 %.
+    """
+    delay = min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** (failures - 1))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.5))
+
+
+def _pending_events(endpoint, batch_size):
+    """
+    Prochain lot d'événements du webhook et position atteinte dans l'outbox.
+
+    Pour un webhook limité à un projet, la position est le dernier événement
+    parcouru, même s'il concerne un autre projet : le curseur avance pendant
+    que le projet est calme et ne bloque pas la purge de l'outbox.
+
+    Returns:
+        tuple: (liste d'OutboxEvent, identifiant du dernier événement parcouru).
+    """
+    events = OutboxEvent.objects.filter(id__gt=endpoint.last_event_id)
+    if endpoint.project_id is None:
+        batch = list(events.order_by("id")[:batch_size])
+        return batch, batch[-1].id if batch else endpoint.last_event_id
+    latest = events.order_by("-id").values_list("id", flat=True).first()
+    if latest is None:
+        return [], endpoint.last_event_id
+    batch = list(
+        events.filter(id__lte=latest, project_id=endpoint.project_id).order_by("id")[:batch_size]
+    )
+    # Lot plein : les événements suivants du projet restent à parcourir
+    return batch, batch[-1].id if len(batch) == batch_size else latest
+
+
+def _build_delivery(endpoint, events, last_event_id):
+    body = json.dumps(
+        {
+            "events": [
+                {
+                    "id": event.id,
+                    "type": event.event_type,
+                    "project": event.project_id,
+                    "object_id": event.object_id,
+                    "time": event.created_time,
+                    "data": event.payload,
+                }
+                for event in events
+            ]
+        },
+        cls=DjangoJSONEncoder,
+    ).encode()
+    return Delivery(endpoint, last_event_id, len(events), body)
+
+
+def _post(delivery, timeout):
+    """
+    Envoie un lot (exécuté dans le pool de threads, sans accès à la base).
+
+    Returns:
+        str|None: message d'erreur, ou None si le destinataire a répondu 2xx.
+    """
+    headers = {"Content-Type": "application/json"}
+    if delivery.endpoint.secret:
+        headers[SIGNATURE_HEADER] = sign(delivery.endpoint.secret, delivery.body)
+    request = urllib.request.Request(
+        delivery.endpoint.url, data=delivery.body, headers=headers, method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            if 200 <= response.status < 300:
+                return None
+            return f"HTTP {response.status}"
+    except urllib.error.HTTPError as exc:
+        return f"HTTP {exc.code}"
+    except (urllib.error.URLError, OSError) as exc:
+        return str(getattr(exc, "reason", exc))
+
+
+def _record_result(delivery, error, now):
+    endpoint = delivery.endpoint
+    if error is None:
+        endpoint.last_event_id = delivery.last_event_id
+        endpoint.failures = 0
+        endpoint.next_attempt_time = None
+        endpoint.last_error = ""
+    else:
+        endpoint.failures += 1
+        endpoint.next_attempt_time = now + backoff_delay(endpoint.failures)
+        endpoint.last_error = error
+        logger.warning("Échec de livraison du webhook %s : %s", endpoint.url, error)
+    endpoint.save(
+        update_fields=["last_event_id", "failures", "next_attempt_time", "last_error"]
+    )
+
+
+def deliver_pending(
+    batch_size=DEFAULT_BATCH_SIZE,
+    concurrency=DEFAULT_CONCURRENCY,
+    timeout=DEFAULT_TIMEOUT,
+):
+    """
+    Effectue une passe de livraison : au plus un lot par webhook dû.
+
+    Returns:
+        dict: {"delivered": nombre d'événements livrés, "failed": nombre de lots en échec}.
+    """
+    now = timezone.now()
+    endpoints = WebhookEndpoint.objects.filter(is_active=True).filter(
+        Q(next_attempt_time__isnull=True) | Q(next_attempt_time__lte=now)
+    )
+    deliveries = []
+    for endpoint in endpoints:
+        events, scanned = _pending_events(endpoint, batch_size)
+        if events:
+            deliveries.append(_build_delivery(endpoint, events, scanned))
+        elif scanned > endpoint.last_event_id:
+            # Aucun événement du projet : rien à envoyer, le curseur avance
+            endpoint.last_event_id = scanned
+            endpoint.save(update_fields=["last_event_id"])
+    if not deliveries:
+        return {"delivered": 0, "failed": 0}
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(deliveries))) as pool:
+        errors = list(pool.map(lambda d: _post(d, timeout), deliveries))
+
+    result = {"delivered": 0, "failed": 0}
+    for delivery, error in zip(deliveries, errors):
+        _record_result(delivery, error, now)
+        if error is None:
+            result["delivered"] += delivery.count
+        else:
+            result["failed"] += 1
+    return result
+
+
+def prune_delivered_events():
+    """
+    Supprime les événements déjà livrés à tous les webhooks, actifs ou non :
+    un webhook suspendu reprend à son curseur lorsqu'il est réactivé.
+
+    Sans webhook enregistré, rien n'est supprimé (un webhook ajouté plus tard
+    reçoit les événements conservés).
+
+    Returns:
+        int: nombre d'événements supprimés.
+    """
+    cursor = WebhookEndpoint.objects.aggregate(cursor=Min("last_event_id"))["cursor"]
+    if cursor is None:
+        return 0
+    return OutboxEvent.objects.filter(id__lte=cursor).delete()[0]
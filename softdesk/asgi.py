@@ -3,14 +3,27 @@ ASGI config for softdesk project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Les flux Server-Sent Events (projects.views.comment_stream) sont des vues
+asynchrones : servies par cette application (ex. ``uvicorn softdesk.asgi:application``),
+elles gardent la connexion ouverte sans bloquer de thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
 import os
 
+from django.apps import apps
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'softdesk.settings')
 
 application = get_asgi_application()
+
+# Prépare le schéma OpenAPI au démarrage du worker plutôt qu'à la première requête
+# (uniquement sur les workers qui servent la documentation)
+if getattr(settings, "OPENAPI_SCHEMA_WARM_ON_STARTUP", False) and apps.is_installed("drf_yasg"):
+    from softdesk.schema import warm_schema
+
+    warm_schema()
@@ -0,0 +1,186 @@
+"""
+Endpoint de requêtes groupées : POST /api/batch/.
+
+Exécute une liste de sous-requêtes contre l'URLconf existant en un seul aller-retour.
+La requête englobante est authentifiée une seule fois (JWT) ; l'utilisateur est
+ensuite transmis aux vues des sous-requêtes sans nouveau décodage du jeton ni
+nouveau passage dans les middlewares.
+"""
+
+import io
+import json
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from projects.sharding import get_shards
+from softdesk.writes import multi_atomic
+
+# Entrées de META propres au corps de la requête englobante, non transmises
+_BODY_META = ("CONTENT_TYPE", "CONTENT_LENGTH", "wsgi.input", "QUERY_STRING")
+
+
+def get_max_requests():
+    """
+    Nombre maximal de sous-requêtes par appel (settings.BATCH_MAX_REQUESTS, 20 par défaut).
+    """
+    return getattr(settings, "BATCH_MAX_REQUESTS", 20)
+
+
+class _Rollback(Exception):
+    """
+    Interrompt le bloc atomique après l'échec d'une sous-requête.
+    """
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=["GET", "POST", "PUT", "PATCH", "DELETE"],
+        default="GET",
+        help_text="Méthode HTTP de la sous-requête",
+    )
+    path = serializers.CharField(
+        help_text="Chemin de l'API, query string comprise (ex. /api/projects/projects/1/)"
+    )
+    body = serializers.JSONField(
+        required=False,
+        help_text="Corps JSON de la sous-requête",
+    )
+
+    def validate_path(self, value):
+        if not value.startswith("/api/"):
+            raise serializers.ValidationError("Le chemin doit commencer par /api/.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(many=True, help_text="Sous-requêtes, exécutées dans l'ordre")
+    atomic = serializers.BooleanField(
+        default=False,
+        help_text="Exécute les sous-requêtes dans une seule transaction, "
+                  "annulée entièrement au premier échec",
+    )
+
+    def validate_requests(self, value):
+        if not value:
+            raise serializers.ValidationError("Au moins une sous-requête est requise.")
+        if len(value) > get_max_requests():
+            raise serializers.ValidationError(
+                f"Au plus {get_max_requests()} sous-requêtes par appel."
+            )
+        return value
+
+
+def _build_request(request, item):
+    """
+    Construit la requête Django d'une sous-requête à partir de la requête englobante.
+
+    L'utilisateur déjà authentifié est imposé via le mécanisme d'authentification
+    forcée de DRF : les vues appelées ne redécodent pas le JWT.
+    """
+    url = urlsplit(item["path"])
+    body = b""
+    if "body" in item:
+        body = json.dumps(item["body"]).encode()
+    environ = {
+        key: value for key, value in request.META.items() if key not in _BODY_META
+    }
+    environ.update(
+        {
+            "REQUEST_METHOD": item["method"],
+            "PATH_INFO": url.path,
+            "SCRIPT_NAME": "",
+            "QUERY_STRING": url.query,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.url_scheme": request.scheme,
+        }
+    )
+    sub_request = WSGIRequest(environ)
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def _response_body(response):
+    """
+    Corps d'une réponse : données DRF telles quelles, sinon JSON décodé ou texte.
+    """
+    if hasattr(response, "data"):
+        return response.data
+    content = response.content.decode(response.charset or "utf-8")
+    if response.get("Content-Type", "").startswith("application/json"):
+        return json.loads(content) if content else None
+    return content
+
+
+def _error(status_code, detail):
+    return {"status": status_code, "body": {"detail": detail}}
+
+
+def run_item(request, item):
+    """
+    Exécute une sous-requête et renvoie {"status": ..., "body": ...}.
+    """
+    url = urlsplit(item["path"])
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return _error(status.HTTP_404_NOT_FOUND, "Pas trouvé.")
+    view_class = getattr(match.func, "view_class", None) or getattr(match.func, "cls", None)
+    if view_class is BatchView or iscoroutinefunction(match.func):
+        # Ni requêtes groupées imbriquées, ni flux (SSE)
+        return _error(status.HTTP_400_BAD_REQUEST, "Chemin non supporté dans un batch.")
+
+    response = match.func(_build_request(request, item), *match.args, **match.kwargs)
+    if getattr(response, "streaming", False):
+        response.close()
+        return _error(status.HTTP_400_BAD_REQUEST, "Chemin non supporté dans un batch.")
+    return {"status": response.status_code, "body": _response_body(response)}
+
+
+class BatchView(APIView):
+    """
+    Exécute plusieurs appels à l'API en une seule requête HTTP.
+
+    Chaque sous-requête reçoit son propre code de statut et son propre corps.
+    Avec "atomic": true, les sous-requêtes partagent une transaction ouverte sur
+    la base par défaut et sur chaque shard : au premier échec (statut >= 400),
+    tout est annulé et les sous-requêtes suivantes ne sont pas exécutées
+    (statut 424).
+    """
+
+    serializer_class = BatchSerializer
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["requests"]
+
+        if not serializer.validated_data["atomic"]:
+            results = [run_item(request, item) for item in items]
+            return Response({"atomic": False, "results": results})
+
+        results = []
+        try:
+            with multi_atomic([DEFAULT_DB_ALIAS, *get_shards()]):
+                for item in items:
+                    result = run_item(request, item)
+                    results.append(result)
+                    if result["status"] >= 400:
+                        raise _Rollback
+        except _Rollback:
+            results += [
+                _error(status.HTTP_424_FAILED_DEPENDENCY, "Non exécutée : batch annulé.")
+                for _ in items[len(results):]
+            ]
+            return Response({"atomic": True, "committed": False, "results": results})
+        return Response({"atomic": True, "committed": True, "results": results})
@@ -0,0 +1,326 @@
+"""
+Métriques de l'API au format texte Prometheus : GET /metrics.
+
+MetricsMiddleware mesure chaque requête et l'étiquette par viewset, action et
+style de route (« flat » pour /api/projects/issues/, « nested » pour
+/api/projects/projects/{id}/issues/) :
+
+- softdesk_http_requests_total : nombre de requêtes, par classe de statut
+  (2xx, 4xx, 5xx...) ; le taux d'erreur s'en déduit ;
+- softdesk_http_request_duration_seconds : histogramme des latences ;
+- softdesk_http_request_queries : histogramme du nombre de requêtes SQL.
+
+Chaque thread écrit dans son propre fragment (aucun verrou sur le chemin de la
+requête) ; les fragments sont fusionnés à la lecture. Chaque processus
+(worker) écrit périodiquement son instantané dans settings.METRICS_DIR, et
+/metrics additionne les instantanés de tous les processus. Les instantanés non
+réécrits depuis settings.METRICS_STALE_AFTER secondes (worker arrêté ou
+redémarré) sont supprimés à la lecture.
+
+/metrics exige le jeton settings.METRICS_TOKEN s'il est défini, sinon un
+utilisateur staff (session ou JWT).
+"""
+
+import hmac
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from utils.ids import uuid7
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_STALE_AFTER = 3600
+LABELS = ("viewset", "action", "route_style")
+
+# Nom, type, aide et bornes (histogrammes) de chaque métrique
+REQUESTS = "softdesk_http_requests_total"
+DURATION = "softdesk_http_request_duration_seconds"
+QUERIES = "softdesk_http_request_queries"
+METRICS = {
+    REQUESTS: ("counter", "Requêtes HTTP traitées.", None),
+    DURATION: (
+        "histogram",
+        "Durée de traitement des requêtes HTTP, en secondes.",
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    ),
+    QUERIES: (
+        "histogram",
+        "Nombre de requêtes SQL par requête HTTP.",
+        (1, 2, 3, 5, 10, 20, 50, 100),
+    ),
+}
+
+
+class _Shard:
+    """
+    Compteurs et histogrammes d'un thread : seul ce thread y écrit.
+    """
+
+    def __init__(self):
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    def inc(self, name, labels, value=1):
+        self.counters[(name, labels)] += value
+
+    def observe(self, name, labels, value):
+        bounds = METRICS[name][2]
+        series = self.histograms.get((name, labels))
+        if series is None:
+            # Un compteur par borne, puis somme et nombre d'observations
+            series = self.histograms[(name, labels)] = [0] * len(bounds) + [0.0, 0]
+        for index, bound in enumerate(bounds):
+            if value <= bound:
+                series[index] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+
+class Registry:
+    """
+    Métriques du processus courant, fragmentées par thread.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._pid = os.getpid()
+        # Identifiant propre à ce démarrage du processus (un PID peut être réutilisé)
+        self.process_key = f"{self._pid}-{uuid7().hex[:12]}"
+        self._local = threading.local()
+        self._shards = []
+        self._last_flush = time.monotonic()
+
+    def shard(self):
+        if os.getpid() != self._pid:
+            # Processus issu d'un fork : il repart de zéro
+            self.reset()
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            self._shards.append(shard)
+        return shard
+
+    def snapshot(self):
+        """
+        Fusion des fragments, sous une forme sérialisable en JSON.
+        """
+        counters = defaultdict(float)
+        histograms = {}
+        for shard in list(self._shards):
+            for (name, labels), value in list(shard.counters.items()):
+                counters[json.dumps([name, *labels])] += value
+            for (name, labels), series in list(shard.histograms.items()):
+                key = json.dumps([name, *labels])
+                merged = histograms.setdefault(key, [0] * len(series))
+                for index, value in enumerate(series):
+                    merged[index] += value
+        return {"counters": dict(counters), "histograms": histograms}
+
+    def flush(self, force=False):
+        """
+        Écrit l'instantané du processus dans settings.METRICS_DIR (au plus une
+        fois par METRICS_FLUSH_INTERVAL secondes, sauf si force).
+        """
+        now = time.monotonic()
+        if not force and now - self._last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 5):
+            return
+        self._last_flush = now
+        directory = get_metrics_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.process_key}.json"
+        temporary = path.with_suffix(f".{threading.get_ident()}.tmp")
+        temporary.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        # Remplacement atomique : un lecteur ne voit jamais un fichier partiel
+        os.replace(temporary, path)
+
+
+registry = Registry()
+
+
+def get_metrics_dir():
+    return Path(getattr(settings, "METRICS_DIR", Path(settings.BASE_DIR) / "metrics"))
+
+
+def remove_stale_snapshots(directory):
+    """
+    Supprime les instantanés (et fichiers temporaires) non réécrits depuis
+    settings.METRICS_STALE_AFTER secondes : leur processus s'est arrêté. Un
+    worker resté inactif aussi longtemps réapparaît à sa prochaine requête.
+    """
+    cutoff = time.time() - getattr(settings, "METRICS_STALE_AFTER", DEFAULT_STALE_AFTER)
+    for path in [*directory.glob("*.json"), *directory.glob("*.tmp")]:
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            # Supprimé entre-temps par un autre processus
+            continue
+
+
+def collect():
+    """
+    Additionne les instantanés de tous les processus (celui du processus
+    courant est réécrit avant lecture), après suppression des instantanés périmés.
+    """
+    registry.flush(force=True)
+    directory = get_metrics_dir()
+    remove_stale_snapshots(directory)
+    counters = defaultdict(float)
+    histograms = {}
+    for path in directory.glob("*.json"):
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        for key, value in snapshot["counters"].items():
+            counters[key] += value
+        for key, series in snapshot["histograms"].items():
+            merged = histograms.setdefault(key, [0] * len(series))
+            for index, value in enumerate(series):
+                merged[index] += value
+    return counters, histograms
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(values, extra=()):
+    pairs = [*zip(LABELS, values), *extra]
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if isinstance(value, float) and not value.is_integer():
+        return repr(float(value))
+    return str(int(value))
+
+
+def render(counters, histograms):
+    """
+    Texte Prometheus (format d'exposition 0.0.4) des métriques agrégées.
+    """
+    series = defaultdict(list)
+    for key, value in counters.items():
+        name, *labels = json.loads(key)
+        series[name].append((labels, value))
+    for key, value in histograms.items():
+        name, *labels = json.loads(key)
+        series[name].append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, bounds) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for labels, value in sorted(series.get(name, ()), key=lambda item: item[0]):
+            if kind == "counter":
+                status_label = [("status", labels[-1])]
+                lines.append(f"{name}{_labels(labels[:-1], status_label)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {value[-1]}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value[-2])}")
+            lines.append(f"{name}_count{_labels(labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def route_labels(request):
+    """
+    (viewset, action, style de route) de la requête résolue.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return ("unmatched", "", "")
+    view = match.func
+    view_class = getattr(view, "cls", None) or getattr(view, "view_class", None)
+    viewset = view_class.__name__ if view_class else getattr(view, "__name__", "unknown")
+    # Les vues DRF des viewsets exposent la correspondance méthode -> action
+    actions = getattr(view, "actions", None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    nested = any(name.endswith("_pk") for name in match.kwargs)
+    return (viewset, action, "nested" if nested else "flat")
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Mesure durée, nombre de requêtes SQL et statut de chaque requête HTTP.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = _QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        labels = route_labels(request)
+        shard = registry.shard()
+        shard.inc(REQUESTS, (*labels, f"{response.status_code // 100}xx"))
+        shard.observe(DURATION, labels, duration)
+        shard.observe(QUERIES, labels, counter.count)
+        registry.flush()
+        return response
+
+
+def _is_staff(request):
+    """
+    Vrai si la requête vient d'un utilisateur staff (session ou JWT).
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return authenticated is not None and authenticated[0].is_staff
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Expose les métriques agrégées de tous les workers. Si settings.METRICS_TOKEN
+    est défini, l'en-tête « Authorization: Bearer <METRICS_TOKEN> » est requis ;
+    sinon, l'accès est réservé aux utilisateurs staff.
+    """
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if token:
+        # Comparaison en temps constant : le jeton ne fuit pas par la durée de la réponse
+        allowed = hmac.compare_digest(
+            request.META.get("HTTP_AUTHORIZATION", "").encode(), f"Bearer {token}".encode()
+        )
+    else:
+        allowed = _is_staff(request)
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render(*collect()), content_type=CONTENT_TYPE)
@@ -0,0 +1,24 @@
+"""
+Middlewares du projet.
+"""
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compression gzip des réponses volumineuses (grandes pages de listes).
+
+    Seules les réponses d'au moins settings.RESPONSE_COMPRESSION_MIN_BYTES
+    octets sont compressées : en dessous, le gain ne couvre pas le coût CPU.
+    Les réponses en flux (SSE) ne sont jamais compressées, pour que chaque
+    événement parte dès qu'il est produit.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming:
+            return response
+        if len(response.content) < getattr(settings, "RESPONSE_COMPRESSION_MIN_BYTES", 1024):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,261 @@
+"""
+Profilage à la demande des requêtes, réservé au staff.
+
+Un membre du staff obtient un jeton signé (POST /api/profiles/token/) puis
+l'envoie dans l'en-tête X-Profile d'une requête vers n'importe quelle route.
+La requête est alors exécutée sous cProfile, pendant qu'un thread échantillonne
+sa pile d'appels ; deux fichiers sont écrits dans settings.PROFILING_DIR :
+
+- <id>.pstats : statistiques cProfile (pstats, snakeviz...) ;
+- <id>.collapsed : piles repliées (« a;b;c N »), pour flamegraph.pl ou speedscope.
+
+L'identifiant est renvoyé dans l'en-tête X-Profile-Id de la réponse. Les profils
+se consultent et se téléchargent via /api/profiles/. Sans en-tête X-Profile, le
+middleware ne fait rien d'autre que tester sa présence.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from utils.ids import uuid7
+
+HEADER = "HTTP_X_PROFILE"
+SIGNING_SALT = "softdesk.profiling"
+# Fichiers d'un profil, par format téléchargeable
+FORMATS = {
+    "pstats": ("pstats", "application/octet-stream"),
+    "collapsed": ("collapsed", "text/plain; charset=utf-8"),
+}
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def get_profiles_dir():
+    return Path(getattr(settings, "PROFILING_DIR", Path(settings.BASE_DIR) / "profiles"))
+
+
+def make_token(user):
+    """
+    Jeton signé autorisant le profilage des requêtes pour un membre du staff.
+    """
+    return signing.dumps({"user": user.pk}, salt=SIGNING_SALT)
+
+
+def token_user(token):
+    """
+    Utilisateur staff actif désigné par un jeton valide et non expiré, sinon None.
+    """
+    try:
+        payload = signing.loads(
+            token,
+            salt=SIGNING_SALT,
+            max_age=getattr(settings, "PROFILING_TOKEN_MAX_AGE", 3600),
+        )
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(
+        pk=payload.get("user"), is_staff=True, is_active=True
+    ).first()
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        filename = os.path.relpath(filename, base)
+    # co_qualname n'existe qu'à partir de Python 3.11 (Pipfile : 3.10)
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """
+    Échantillonne périodiquement la pile d'un thread, jusqu'à une frame d'ancrage
+    (exclue) : seules les frames sous le middleware sont comptées.
+    """
+
+    def __init__(self, thread_id, anchor, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.anchor = anchor
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            outermost = None
+            while frame is not None and frame is not self.anchor:
+                stack.append(_frame_label(frame.f_code))
+                outermost = frame.f_code
+                frame = frame.f_back
+            # Pile prise pendant l'arrêt de l'échantillonneur : ignorée (comparaison
+            # par code objet, le libellé dépend de la version de Python)
+            if stack and outermost is not StackSampler.stop.__code__:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _save(profile_id, profiler, sampler, metadata):
+    directory = get_profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f"{profile_id}.pstats")
+    (directory / f"{profile_id}.collapsed").write_text(sampler.collapsed(), encoding="utf-8")
+    (directory / f"{profile_id}.json").write_text(json.dumps(metadata), encoding="utf-8")
+
+
+class ProfilingMiddleware:
+    """
+    Exécute sous profilage les requêtes portant un jeton X-Profile valide.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = request.META.get(HEADER)
+        if not token:
+            return self.get_response(request)
+        user = token_user(token)
+        if user is None:
+            return self.get_response(request)
+        return self.profile(request, user)
+
+    def profile(self, request, user):
+        profile_id = uuid7().hex
+        sampler = StackSampler(
+            threading.get_ident(),
+            sys._getframe(),
+            getattr(settings, "PROFILING_SAMPLE_INTERVAL", 0.001),
+        )
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            response = profiler.runcall(self.get_response, request)
+        finally:
+            duration = time.perf_counter() - started
+            sampler.stop()
+        _save(profile_id, profiler, sampler, {
+            "id": profile_id,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "user": user.username,
+            "duration_ms": round(duration * 1000, 3),
+            "samples": sum(sampler.stacks.values()),
+            "created_time": timezone.now().isoformat(),
+        })
+        response["X-Profile-Id"] = profile_id
+        return response
+
+
+def _metadata(profile_id):
+    if not _PROFILE_ID.match(profile_id):
+        raise Http404
+    path = get_profiles_dir() / f"{profile_id}.json"
+    if not path.exists():
+        raise Http404
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def top_functions(profile_id, limit=30):
+    """
+    Fonctions les plus coûteuses d'un profil, triées par temps cumulé.
+    """
+    stats = pstats.Stats(str(get_profiles_dir() / f"{profile_id}.pstats"))
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    rows = []
+    for function in stats.fcn_list[:limit]:
+        calls, primitive_calls, tottime, cumtime, _ = stats.stats[function]
+        filename, line, name = function
+        rows.append({
+            "function": f"{name} ({filename}:{line})",
+            "ncalls": calls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        })
+    return rows
+
+
+class ProfileTokenView(APIView):
+    """
+    Délivre un jeton X-Profile au membre du staff authentifié.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        return Response({
+            "token": make_token(request.user),
+            "header": "X-Profile",
+            "expires_in": getattr(settings, "PROFILING_TOKEN_MAX_AGE", 3600),
+        })
+
+
+class ProfileListView(APIView):
+    """
+    Liste les profils enregistrés, du plus récent au plus ancien.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        directory = get_profiles_dir()
+        if not directory.exists():
+            return Response([])
+        names = sorted((path.stem for path in directory.glob("*.json")), reverse=True)
+        return Response([_metadata(name) for name in names if _PROFILE_ID.match(name)])
+
+
+class ProfileDetailView(APIView):
+    """
+    Résumé d'un profil : métadonnées et fonctions les plus coûteuses.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        metadata = _metadata(profile_id)
+        return Response({**metadata, "top_functions": top_functions(profile_id)})
+
+
+class ProfileDownloadView(APIView):
+    """
+    Télécharge un profil au format pstats ou en piles repliées.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id, file_format):
+        _metadata(profile_id)
+        if file_format not in FORMATS:
+            raise Http404
+        extension, content_type = FORMATS[file_format]
+        path = get_profiles_dir() / f"{profile_id}.{extension}"
+        return FileResponse(
+            path.open("rb"),
+            as_attachment=True,
+            filename=path.name,
+            content_type=content_type,
+        )
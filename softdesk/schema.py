@@ -0,0 +1,169 @@
+"""
+Schéma OpenAPI précalculé.
+
+Le schéma est généré une seule fois (au démarrage du worker ou par la commande
+build_openapi_schema), conservé en mémoire sous forme d'octets JSON avec son ETag,
+puis servi tel quel : aucune introspection des viewsets n'a lieu par requête.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_INFO = openapi.Info(
+    title="SoftDesk API",
+    default_version="v1",
+    description="Documentation de l'API SoftDesk",
+)
+
+
+@dataclass(frozen=True)
+class SchemaDocument:
+    """
+    Schéma sérialisé prêt à être servi.
+
+    Attributs :
+        content (bytes) : document JSON.
+        etag (str) : ETag fort calculé sur le contenu.
+        generation_seconds (float) : durée de génération (0 si chargé depuis un fichier).
+    """
+    content: bytes
+    etag: str
+    generation_seconds: float
+
+
+_document = None
+_lock = threading.Lock()
+
+
+def get_schema_path():
+    """
+    Emplacement de l'artefact (settings.OPENAPI_SCHEMA_PATH), ou None.
+    """
+    path = getattr(settings, "OPENAPI_SCHEMA_PATH", None)
+    return Path(path) if path else None
+
+
+def generate_schema():
+    """
+    Introspecte l'URLconf et renvoie le schéma encodé en JSON.
+
+    Le schéma est généré sans requête : il ne contient pas d'hôte,
+    l'interface Swagger utilise donc celui de la page qui l'affiche.
+    """
+    generator = OpenAPISchemaGenerator(SCHEMA_INFO)
+    schema = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def _make_document(content, generation_seconds):
+    etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+    return SchemaDocument(content, etag, generation_seconds)
+
+
+def write_schema(path):
+    """
+    Génère le schéma et l'écrit dans `path` (artefact de build).
+
+    Returns:
+        SchemaDocument: document écrit.
+    """
+    started = time.perf_counter()
+    content = generate_schema()
+    document = _make_document(content, time.perf_counter() - started)
+    Path(path).write_bytes(content)
+    return document
+
+
+def get_schema_document():
+    """
+    Renvoie le schéma en mémoire, en le chargeant depuis l'artefact
+    ou en le générant au premier appel seulement.
+    """
+    global _document
+    if _document is not None:
+        return _document
+    with _lock:
+        if _document is None:
+            path = get_schema_path()
+            if path is not None and path.exists():
+                content = path.read_bytes()
+                # Vérifie que l'artefact est un JSON valide avant de le servir
+                json.loads(content)
+                _document = _make_document(content, 0.0)
+                logger.info("Schéma OpenAPI chargé depuis %s", path)
+            else:
+                started = time.perf_counter()
+                content = generate_schema()
+                _document = _make_document(content, time.perf_counter() - started)
+                logger.info(
+                    "Schéma OpenAPI généré en %.1f ms",
+                    _document.generation_seconds * 1000,
+                )
+    return _document
+
+
+def warm_schema():
+    """
+    Prépare le schéma au démarrage du worker, hors du chemin des requêtes.
+    """
+    return get_schema_document()
+
+
+def reset_schema():
+    """
+    Oublie le schéma en mémoire (utile aux tests et après un rebuild).
+    """
+    global _document
+    with _lock:
+        _document = None
+
+
+_BaseSchemaView = get_schema_view(
+    SCHEMA_INFO,
+    public=True,
+    permission_classes=[permissions.AllowAny],
+)
+
+
+class CachedSchemaView(_BaseSchemaView):
+    """
+    Vue de documentation servant le schéma JSON depuis la mémoire.
+
+    - Format JSON/OpenAPI : renvoie les octets précalculés avec leur ETag,
+      et 304 Not Modified si le client possède déjà cette version.
+    - Pages Swagger/ReDoc et YAML : comportement standard de drf_yasg
+      (les pages HTML ne font pas d'introspection, elles chargent le JSON).
+    """
+
+    def get(self, request, version="", format=None):
+        if not isinstance(
+            request.accepted_renderer, (OpenAPIRenderer, SwaggerJSONRenderer)
+        ):
+            return super().get(request, version, format)
+
+        document = get_schema_document()
+        if request.META.get("HTTP_IF_NONE_MATCH") == document.etag:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                document.content, content_type=request.accepted_renderer.media_type
+            )
+        response["ETag"] = document.etag
+        response["Cache-Control"] = "no-cache"
+        return response
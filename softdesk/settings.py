@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
 from pathlib import Path
 
 # A ajouter pour utiliser le modèle d'utilisateur personnalisé
@@ -49,6 +50,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Métriques Prometheus par viewset et action (voir softdesk/metrics.py)
+    "softdesk.metrics.MetricsMiddleware",
+    # Profilage à la demande (en-tête X-Profile, voir softdesk/profiling.py)
+    "softdesk.profiling.ProfilingMiddleware",
+    # Journal des requêtes SQL lentes (voir softdesk/slow_queries.py)
+    "softdesk.slow_queries.SlowQueryMiddleware",
+    # Compresse les grandes réponses (voir softdesk/middleware.py)
+    "softdesk.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -84,9 +93,31 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+        # Verrou d'écriture pris dès le début des transactions (voir softdesk/writes.py)
+        "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 5},
+    },
+    # Shard supplémentaire pour les données de projets (voir projects/sharding.py),
+    # à migrer avec « migrate --database=shard1 » avant de l'ajouter à PROJECT_SHARDS
+    "shard1": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_shard1.sqlite3",
+        "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 5},
+    },
 }
 
+# Bases qui stockent les projets, leurs contributeurs, issues et commentaires ;
+# ex. ["default", "shard1"] pour répartir les nouveaux projets sur deux fichiers
+PROJECT_SHARDS = ["default"]
+DATABASE_ROUTERS = ["projects.sharding.ProjectShardRouter"]
+
+# Coordination des écritures SQLite (voir softdesk/writes.py)
+# Nouvelles tentatives d'une transaction dont le verrou d'écriture reste indisponible
+SQLITE_WRITE_RETRIES = 5
+# Regroupement des écritures concurrentes du processus en une transaction (group commit)
+SQLITE_GROUP_COMMIT = False
+SQLITE_GROUP_COMMIT_WINDOW_MS = 2
+SQLITE_GROUP_COMMIT_MAX_SIZE = 50
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -138,4 +169,88 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "utils.pagination.CustomPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
+
+# Format binaire MessagePack (voir utils/renderers.py), négocié via Accept /
+# Content-Type: application/msgpack ; activé seulement si msgpack est installé
+if importlib.util.find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append("utils.renderers.MessagePackRenderer")
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append("utils.renderers.MessagePackParser")
+
+# File de tâches d'arrière-plan (voir projects/background.py)
+# Durée (s) de réservation d'une tâche par un worker avant qu'elle puisse être reprise
+TASK_VISIBILITY_TIMEOUT = 300
+
+# Délai (s) sans progression après lequel une purge de projet Running est reprise
+# (worker interrompu, voir projects/deletion.py)
+PROJECT_DELETION_STALE_AFTER = 600
+
+# Notifications par e-mail (voir projects/notifications.py)
+# Fenêtre (s) de regroupement des notifications d'un utilisateur en un seul résumé
+NOTIFICATION_DIGEST_WINDOW = 300
+DEFAULT_FROM_EMAIL = "SoftDesk <notifications@softdesk.local>"
+# En local, les e-mails sont écrits dans des fichiers (les tests utilisent locmem)
+EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
+
+# Nombre maximal d'enfants inclus par expansion ?expand= (voir projects/expand.py)
+EXPAND_MAX_CHILDREN = 20
+
+# Taille minimale (octets) d'une réponse pour qu'elle soit compressée en gzip
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+
+# Profilage à la demande (voir softdesk/profiling.py)
+# Dossier des profils, durée de validité (s) des jetons et intervalle (s) d'échantillonnage
+PROFILING_DIR = BASE_DIR / "profiles"
+PROFILING_TOKEN_MAX_AGE = 3600
+PROFILING_SAMPLE_INTERVAL = 0.001
+
+# Journal des requêtes lentes (voir softdesk/slow_queries.py)
+# Seuil en ms (None pour désactiver), intervalle (s) et taille du rapport agrégé
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_REPORT_INTERVAL = 300
+SLOW_QUERY_REPORT_TOP = 10
+
+# Métriques Prometheus (voir softdesk/metrics.py)
+# Dossier des instantanés par worker, intervalle (s) d'écriture, âge (s) au-delà duquel
+# un instantané est supprimé, jeton de /metrics (sans jeton : utilisateurs staff uniquement)
+METRICS_DIR = BASE_DIR / "metrics"
+METRICS_FLUSH_INTERVAL = 5
+METRICS_STALE_AFTER = 3600
+METRICS_TOKEN = None
+
+# Effacement différé des comptes (voir users/erasure.py)
+# Taille de lot initiale et durée maximale visée pour une transaction d'effacement
+USER_ERASURE_CHUNK_SIZE = 500
+USER_ERASURE_MAX_LOCK_SECONDS = 0.25
+
+# Schéma OpenAPI précalculé (voir softdesk/schema.py)
+# Artefact produit par `python manage.py build_openapi_schema`, chargé s'il existe
+OPENAPI_SCHEMA_PATH = BASE_DIR / "openapi.json"
+# Génère le schéma au démarrage du worker (wsgi/asgi) plutôt qu'à la première requête
+OPENAPI_SCHEMA_WARM_ON_STARTUP = True
+
+# Budget de démarrage à froid d'un worker API (django.setup() + résolveur d'URL),
+# vérifié par les tests (voir softdesk/startup.py et `manage.py profile_startup`)
+COLD_START_BUDGET_SECONDS = 2.0
+
+# Flux SSE des commentaires (voir projects/streams.py) : intervalle de polling
+# partagé par issue et délai entre deux commentaires keep-alive
+SSE_POLL_INTERVAL = 1.0
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Archivage des issues terminées (voir projects/archive.py) : ancienneté minimale,
+# en jours sans modification, avant déplacement vers les tables d'archive
+ISSUE_ARCHIVE_AFTER_DAYS = 90
+
+# Requêtes groupées (voir softdesk/batch.py) : nombre maximal de sous-requêtes par appel
+BATCH_MAX_REQUESTS = 20
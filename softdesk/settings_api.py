@@ -0,0 +1,21 @@
+"""
+Profil de settings pour les workers API.
+
+Ces workers ne servent ni la documentation ni l'admin : drf_yasg et
+django.contrib.admin ne sont donc pas chargés, ce qui réduit le démarrage
+à froid. Les routes correspondantes ne sont pas déclarées (voir softdesk/urls.py).
+
+Usage :
+    DJANGO_SETTINGS_MODULE=softdesk.settings_api gunicorn softdesk.wsgi
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS
+
+# Applications réservées aux workers de documentation / d'administration
+DOCS_AND_ADMIN_APPS = ("django.contrib.admin", "drf_yasg")
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DOCS_AND_ADMIN_APPS]
+
+# Pas de documentation servie : inutile de générer le schéma au démarrage
+OPENAPI_SCHEMA_WARM_ON_STARTUP = False
@@ -0,0 +1,233 @@
+"""
+Journal des requêtes SQL lentes, avec capture automatique du plan d'exécution.
+
+SlowQueryMiddleware installe, pour chaque requête HTTP, un wrapper
+(connection.execute_wrapper) sur toutes les connexions. Toute requête SQL plus
+longue que settings.SLOW_QUERY_THRESHOLD_MS est journalisée (logger
+« softdesk.slow_queries ») avec :
+
+- la vue (view_name de l'URL) et l'action DRF qui l'ont émise ;
+- son empreinte : le SQL normalisé (valeurs et listes IN remplacées), puis haché ;
+- son plan (EXPLAIN QUERY PLAN sous SQLite, EXPLAIN ailleurs), capturé une fois
+  par empreinte.
+
+Les empreintes sont agrégées par processus ; toutes les
+SLOW_QUERY_REPORT_INTERVAL secondes, les SLOW_QUERY_REPORT_TOP plus coûteuses
+(temps cumulé) font l'objet d'un rapport, puis les compteurs repartent de zéro.
+L'échéance est vérifiée à chaque requête lente et à la fin de chaque requête
+HTTP (signal request_finished) : le rapport paraît même si plus aucune requête
+lente n'arrive.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES \((?:\?, )*\?\)(?:, \((?:\?, )*\?\))*", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """
+    Forme normalisée d'une requête : littéraux et paramètres remplacés par ?,
+    listes IN et VALUES réduites, espaces uniformisés.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _SPACES.sub(" ", sql).strip()
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _VALUES_LIST.sub("VALUES (...)", sql)
+
+
+def fingerprint(sql):
+    """
+    Empreinte courte (16 caractères hexadécimaux) du SQL normalisé.
+    """
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def explain(connection, sql, params):
+    """
+    Plan d'exécution d'une requête SELECT, sous forme de liste de lignes.
+
+    Returns:
+        list[str]|None: lignes du plan, ou None si le plan n'a pu être obtenu.
+    """
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+    except DatabaseError:
+        return None
+
+
+class SlowQueryReport:
+    """
+    Agrégation par empreinte des requêtes lentes du processus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.entries = {}
+        self.started = time.monotonic()
+
+    def known_plan(self, key):
+        entry = self.entries.get(key)
+        return entry["plan"] if entry else None
+
+    def add(self, key, sql, duration_ms, view, plan):
+        with self._lock:
+            entry = self.entries.setdefault(key, {
+                "fingerprint": key,
+                "sql": normalize_sql(sql),
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "views": set(),
+                "plan": plan,
+            })
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["views"].add(view)
+
+    def top(self, limit):
+        with self._lock:
+            entries = sorted(self.entries.values(), key=lambda entry: -entry["total_ms"])
+            return entries[:limit]
+
+    def flush_if_due(self):
+        """
+        Journalise le rapport et remet les compteurs à zéro si l'intervalle est écoulé.
+        """
+        interval = getattr(settings, "SLOW_QUERY_REPORT_INTERVAL", 300)
+        if time.monotonic() - self.started < interval:
+            return
+        top = self.top(getattr(settings, "SLOW_QUERY_REPORT_TOP", 10))
+        with self._lock:
+            self.reset()
+        if not top:
+            return
+        lines = [
+            f"{index}. {entry['fingerprint']} x{entry['count']} "
+            f"total={entry['total_ms']:.1f}ms max={entry['max_ms']:.1f}ms "
+            f"vues={','.join(sorted(entry['views']))} : {entry['sql']}"
+            for index, entry in enumerate(top, start=1)
+        ]
+        logger.info(
+            "Requêtes lentes, top %s :\n%s",
+            len(top),
+            "\n".join(lines),
+            extra={"slow_query_report": top},
+        )
+
+
+report = SlowQueryReport()
+
+
+def _flush_report(sender, **kwargs):
+    report.flush_if_due()
+
+
+request_finished.connect(_flush_report, dispatch_uid="softdesk.slow_queries.flush_report")
+
+
+def _view_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "-", None
+    # Les vues DRF des viewsets exposent la correspondance méthode -> action
+    actions = getattr(match.func, "actions", None) or {}
+    return match.view_name, actions.get(request.method.lower())
+
+
+class SlowQueryLogger:
+    """
+    Wrapper d'exécution SQL qui mesure chaque requête d'une requête HTTP.
+    """
+
+    def __init__(self, request, threshold_ms):
+        self.request = request
+        self.threshold_ms = threshold_ms
+        self._explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self._explaining:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.record(context["connection"], sql, params, many, duration_ms)
+
+    def record(self, connection, sql, params, many, duration_ms):
+        key = fingerprint(sql)
+        view, action = _view_label(self.request)
+        plan = report.known_plan(key)
+        if plan is None and not many and sql.lstrip().upper().startswith("SELECT"):
+            self._explaining = True
+            try:
+                plan = explain(connection, sql, params)
+            finally:
+                self._explaining = False
+        label = f"{view}:{action}" if action else view
+        report.add(key, sql, duration_ms, label, plan)
+        logger.warning(
+            "Requête lente (%.1f ms) %s [%s] %s",
+            duration_ms,
+            label,
+            key,
+            normalize_sql(sql),
+            extra={
+                "slow_query": {
+                    "duration_ms": round(duration_ms, 3),
+                    "view": view,
+                    "action": action,
+                    "fingerprint": key,
+                    "sql": normalize_sql(sql),
+                    "plan": plan,
+                    "database": connection.alias,
+                }
+            },
+        )
+        report.flush_if_due()
+
+
+class SlowQueryMiddleware:
+    """
+    Mesure les requêtes SQL de chaque requête HTTP (désactivé si
+    settings.SLOW_QUERY_THRESHOLD_MS vaut None).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold_ms = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None)
+        if threshold_ms is None:
+            return self.get_response(request)
+        wrapper = SlowQueryLogger(request, threshold_ms)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            return self.get_response(request)
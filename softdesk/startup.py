@@ -0,0 +1,116 @@
+"""
+Mesure du démarrage à froid d'un worker.
+
+La mesure est faite dans un interpréteur neuf (python -X importtime) afin de
+ne pas être faussée par les modules déjà chargés dans le processus courant :
+  - durée de django.setup() ;
+  - durée de construction du résolveur d'URL (import de tout l'URLconf) ;
+  - temps d'import de chaque module (self et cumulé, en microsecondes).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+# Script exécuté dans l'interpréteur neuf ; le module de settings est passé en argument
+_PROBE = """
+import json, os, sys, time
+os.environ["DJANGO_SETTINGS_MODULE"] = sys.argv[1]
+started = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+from django.urls import get_resolver
+get_resolver()._populate()
+urls_done = time.perf_counter()
+print(json.dumps({
+    "setup_seconds": setup_done - started,
+    "urls_seconds": urls_done - setup_done,
+}))
+"""
+
+
+@dataclass
+class ModuleImport:
+    """
+    Temps d'import d'un module (microsecondes).
+    """
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+@dataclass
+class StartupReport:
+    """
+    Résultat d'une mesure de démarrage à froid.
+
+    Attributs :
+        settings_module (str) : module de settings mesuré.
+        setup_seconds (float) : durée de django.setup().
+        urls_seconds (float) : durée de construction du résolveur d'URL.
+        imports (list[ModuleImport]) : modules importés, dans l'ordre d'import.
+    """
+    settings_module: str
+    setup_seconds: float
+    urls_seconds: float
+    imports: list = field(default_factory=list)
+
+    @property
+    def total_seconds(self):
+        return self.setup_seconds + self.urls_seconds
+
+    def imported(self, module):
+        """
+        Indique si `module` (ou l'un de ses sous-modules) a été importé.
+        """
+        prefix = module + "."
+        return any(i.name == module or i.name.startswith(prefix) for i in self.imports)
+
+    def top(self, count=20, key="cumulative_us"):
+        return sorted(self.imports, key=lambda i: getattr(i, key), reverse=True)[:count]
+
+
+def _parse_importtime(stderr):
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            # En-tête "self [us] | cumulative | imported package"
+            continue
+        imports.append(
+            ModuleImport(parts[2].strip(), int(parts[0]), int(parts[1]))
+        )
+    return imports
+
+
+def measure_cold_start(settings_module=None):
+    """
+    Démarre un interpréteur neuf avec `settings_module` et mesure son démarrage.
+
+    Returns:
+        StartupReport: durées mesurées et temps d'import par module.
+    """
+    settings_module = settings_module or os.environ.get(
+        "DJANGO_SETTINGS_MODULE", "softdesk.settings"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, settings_module],
+        capture_output=True,
+        text=True,
+        cwd=settings.BASE_DIR,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return StartupReport(
+        settings_module=settings_module,
+        setup_seconds=timings["setup_seconds"],
+        urls_seconds=timings["urls_seconds"],
+        imports=_parse_importtime(result.stderr),
+    )
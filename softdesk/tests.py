@@ -0,0 +1,708 @@
+import decimal
+import gzip
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from projects.models import Project
+
+from softdesk import metrics, schema, slow_queries, writes
+from softdesk.startup import measure_cold_start
+from utils import renderers
+
+
+@override_settings(OPENAPI_SCHEMA_PATH=None)
+class CachedSchemaTests(TestCase):
+    """
+    Tests du schéma OpenAPI précalculé.
+
+    Vérifie que le schéma est généré une seule fois au démarrage,
+    puis servi depuis la mémoire avec un ETag sans nouvelle introspection.
+    """
+
+    def setUp(self):
+        schema.reset_schema()
+        self.addCleanup(schema.reset_schema)
+
+    def test_schema_is_not_generated_on_request_path(self):
+        """
+        Après le warm-up, une requête sur le schéma ne déclenche aucune génération.
+        """
+        document = schema.warm_schema()
+        # Mesure du démarrage : la génération a bien eu lieu, hors requête
+        self.assertGreater(document.generation_seconds, 0)
+
+        with mock.patch.object(
+            schema, "generate_schema", side_effect=AssertionError("génération par requête")
+        ):
+            response = self.client.get("/", {"format": "openapi"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["ETag"], document.etag)
+            self.assertIn("paths", json.loads(response.content))
+
+            response = self.client.get("/redoc/", {"format": "openapi"})
+            self.assertEqual(response.status_code, 200)
+
+    def test_matching_etag_returns_304(self):
+        """
+        Un client qui possède déjà la version courante reçoit 304 sans corps.
+        """
+        etag = schema.warm_schema().etag
+        response = self.client.get("/", {"format": "openapi"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_build_artifact_is_loaded_without_generation(self):
+        """
+        L'artefact produit par build_openapi_schema est chargé tel quel.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            path = f.name
+        self.addCleanup(os.remove, path)
+        built = schema.write_schema(path)
+
+        with override_settings(OPENAPI_SCHEMA_PATH=path), mock.patch.object(
+            schema, "generate_schema", side_effect=AssertionError("génération inattendue")
+        ):
+            document = schema.get_schema_document()
+        self.assertEqual(document.etag, built.etag)
+        self.assertEqual(document.generation_seconds, 0.0)
+
+
+class ColdStartTests(SimpleTestCase):
+    """
+    Tests du démarrage à froid des workers API (profil softdesk.settings_api).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = measure_cold_start("softdesk.settings_api")
+
+    def test_api_worker_skips_docs_and_admin(self):
+        """
+        Le profil API n'importe pas drf_yasg et ne déclenche pas l'autodiscover
+        de l'admin (django.contrib.admin reste importé par rest_framework.schemas).
+        """
+        self.assertFalse(self.report.imported("drf_yasg"))
+        self.assertFalse(self.report.imported("users.admin"))
+        self.assertTrue(self.report.imported("projects.views"))
+
+    def test_api_worker_cold_start_within_budget(self):
+        """
+        django.setup() et la construction du résolveur d'URL tiennent dans le budget.
+        """
+        self.assertLess(
+            self.report.total_seconds,
+            settings.COLD_START_BUDGET_SECONDS,
+            f"Démarrage à froid : {self.report.total_seconds:.2f} s",
+        )
+
+
+class BatchTests(APITestCase):
+    """
+    Tests de l'endpoint de requêtes groupées.
+
+    Vérifie l'authentification unique, les statuts par sous-requête et
+    l'annulation complète d'un batch atomique au premier échec.
+    """
+    databases = {"default", "shard1"}
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="author", password="pass", age=20)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("batch")
+
+    def project_payload(self, title):
+        return {"title": title, "description": "d", "type": "Back-End"}
+
+    def test_batch_runs_sub_requests_with_single_authentication(self):
+        """
+        Les sous-requêtes s'exécutent dans l'ordre, avec l'utilisateur authentifié
+        une seule fois, et chacune renvoie son propre statut.
+        """
+        payload = {
+            "requests": [
+                {"method": "POST", "path": "/api/projects/projects/",
+                 "body": self.project_payload("Batch")},
+                {"path": "/api/projects/projects/?page=1"},
+                {"path": "/api/projects/projects/999999/"},
+                {"path": "/api/inconnu/"},
+                {"path": "/api/batch/"},
+            ]
+        }
+        with mock.patch.object(
+            JWTAuthentication, "authenticate", autospec=True,
+            side_effect=JWTAuthentication.authenticate,
+        ) as authenticate:
+            response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(authenticate.call_count, 1)
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(statuses, [201, 200, 404, 404, 400])
+        created = response.data["results"][0]["body"]
+        self.assertEqual(Project.objects.get(pk=created["id"]).author, self.user)
+        listed = response.data["results"][1]["body"]["results"]
+        self.assertEqual([p["title"] for p in listed], ["Batch"])
+
+    def test_atomic_batch_rolls_back_on_failure(self):
+        """
+        En mode atomique, un échec annule les sous-requêtes déjà exécutées
+        et les suivantes ne sont pas lancées.
+        """
+        payload = {
+            "atomic": True,
+            "requests": [
+                {"method": "POST", "path": "/api/projects/projects/",
+                 "body": self.project_payload("Annulé")},
+                {"method": "POST", "path": "/api/projects/projects/", "body": {}},
+                {"method": "POST", "path": "/api/projects/projects/",
+                 "body": self.project_payload("Jamais créé")},
+            ],
+        }
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["committed"])
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(statuses, [201, 400, 424])
+        self.assertFalse(Project.objects.exists())
+
+    @override_settings(PROJECT_SHARDS=["default", "shard1"])
+    def test_atomic_batch_rolls_back_every_shard(self):
+        """
+        Avec plusieurs shards, l'annulation couvre aussi les projets écrits
+        sur un autre shard que la base par défaut.
+        """
+        payload = {
+            "atomic": True,
+            "requests": [
+                {"method": "POST", "path": "/api/projects/projects/",
+                 "body": self.project_payload(f"Annulé {index}")}
+                for index in range(2)
+            ] + [{"method": "POST", "path": "/api/projects/projects/", "body": {}}],
+        }
+        response = self.client.post(self.url, payload, format="json")
+
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(statuses, [201, 201, 400])
+        for alias in ("default", "shard1"):
+            self.assertFalse(Project.objects.using(alias).exists())
+
+    def test_batch_requires_authentication_and_limits_size(self):
+        """
+        Sans jeton : 401 ; au-delà de BATCH_MAX_REQUESTS sous-requêtes : 400.
+        """
+        self.client.credentials()
+        response = self.client.post(self.url, {"requests": [{"path": "/api/projects/projects/"}]}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with override_settings(BATCH_MAX_REQUESTS=2):
+            response = self.client.post(
+                self.url, {"requests": [{"path": "/api/projects/projects/"}] * 3}, format="json"
+            )
+        self.assertEqual(response.status_code, 400)
+
+
+@skipUnless(importlib.util.find_spec("msgpack"), "msgpack n'est pas installé")
+class MessagePackTests(APITestCase):
+    """
+    Tests du format MessagePack et de la compression des grandes réponses.
+
+    Vérifie la négociation de contenu dans les deux sens, l'encodage des
+    types non natifs identique au JSON, et le seuil de compression gzip.
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="author", password="pass", age=20)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("projects:project-list")
+
+    def create_projects(self, count, description="d"):
+        for index in range(count):
+            response = self.client.post(
+                self.url,
+                {"title": f"Projet {index}", "description": description, "type": "Back-End"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+
+    def test_list_is_rendered_as_msgpack_on_request(self):
+        """
+        Avec Accept: application/msgpack, la liste est encodée en MessagePack
+        et contient les mêmes données qu'en JSON.
+        """
+        self.create_projects(3)
+        as_json = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        as_msgpack = self.client.get(self.url, HTTP_ACCEPT=renderers.MEDIA_TYPE)
+
+        self.assertEqual(as_msgpack.status_code, 200)
+        self.assertEqual(as_msgpack["Content-Type"], renderers.MEDIA_TYPE)
+        self.assertEqual(renderers.unpackb(as_msgpack.content), as_json.json())
+        self.assertLess(len(as_msgpack.content), len(as_json.content))
+
+    def test_msgpack_request_body_is_parsed(self):
+        """
+        Un corps de requête MessagePack est accepté ; un corps invalide donne 400.
+        """
+        body = renderers.packb({"title": "Binaire", "description": "d", "type": "iOS"})
+        response = self.client.post(self.url, body, content_type=renderers.MEDIA_TYPE)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Project.objects.filter(title="Binaire").exists())
+
+        response = self.client.post(self.url, b"\xc1", content_type=renderers.MEDIA_TYPE)
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_native_types_are_encoded_like_json(self):
+        """
+        Datetimes, UUID et Decimal hors serializer sont encodés en texte,
+        exactement comme par le renderer JSON.
+        """
+        data = {"at": timezone.now(), "id": uuid.uuid4(), "amount": decimal.Decimal("1.50")}
+        self.assertEqual(
+            renderers.unpackb(renderers.packb(data)), json.loads(JSONRenderer().render(data))
+        )
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+    def test_only_large_responses_are_compressed(self):
+        """
+        Une grande page est compressée en gzip ; une petite réponse ne l'est pas.
+        """
+        small = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", small)
+
+        self.create_projects(10, description="Description détaillée. " * 10)
+        large = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(large["Content-Encoding"], "gzip")
+        self.assertEqual(
+            json.loads(gzip.decompress(large.content)),
+            self.client.get(self.url).json(),
+        )
+
+
+class ProfilingTests(APITestCase):
+    """
+    Tests du profilage à la demande.
+
+    Vérifie que seul un jeton staff valide déclenche le profilage, que les
+    fichiers pstats et piles repliées sont écrits, puis consultables par le staff.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        override = override_settings(PROFILING_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        users = get_user_model().objects
+        self.staff = users.create_user(username="staff", password="pass", age=30, is_staff=True)
+        self.user = users.create_user(username="user", password="pass", age=30)
+        self.url = reverse("projects:project-list")
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_staff_token_profiles_request(self):
+        """
+        Une requête portant un jeton X-Profile staff est profilée, et le profil
+        se consulte et se télécharge ensuite.
+        """
+        self.authenticate(self.staff)
+        token = self.client.post(reverse("profile-token")).json()["token"]
+
+        response = self.client.get(self.url, HTTP_X_PROFILE=token)
+        self.assertEqual(response.status_code, 200)
+        profile_id = response["X-Profile-Id"]
+        self.assertTrue((self.directory / f"{profile_id}.pstats").exists())
+        self.assertTrue((self.directory / f"{profile_id}.collapsed").exists())
+
+        listing = self.client.get(reverse("profile-list")).json()
+        self.assertEqual([profile["id"] for profile in listing], [profile_id])
+        self.assertEqual(listing[0]["path"], self.url)
+
+        detail = self.client.get(reverse("profile-detail", args=[profile_id])).json()
+        self.assertTrue(detail["top_functions"])
+
+        download = self.client.get(reverse("profile-download", args=[profile_id, "pstats"]))
+        self.assertEqual(download.status_code, 200)
+        self.assertIn("attachment", download["Content-Disposition"])
+        download.close()
+
+    def test_requests_without_valid_staff_token_are_not_profiled(self):
+        """
+        Sans jeton, avec un jeton invalide ou celui d'un non-staff, rien n'est profilé.
+        """
+        from softdesk.profiling import make_token
+
+        self.authenticate(self.user)
+        for header in ({}, {"HTTP_X_PROFILE": "invalide"},
+                       {"HTTP_X_PROFILE": make_token(self.user)}):
+            response = self.client.get(self.url, **header)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+        # Les endpoints de profilage sont réservés au staff
+        self.assertEqual(self.client.post(reverse("profile-token")).status_code, 403)
+        self.assertEqual(self.client.get(reverse("profile-list")).status_code, 403)
+
+    def test_sampler_records_collapsed_stacks(self):
+        """
+        L'échantillonneur produit des piles repliées sous la frame d'ancrage.
+        """
+        import sys
+        import threading
+        import time
+
+        from softdesk.profiling import StackSampler
+
+        def busy_wait():
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+
+        sampler = StackSampler(threading.get_ident(), sys._getframe(), 0.001)
+        sampler.start()
+        busy_wait()
+        sampler.stop()
+        lines = sampler.collapsed().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all("busy_wait" in line.split(";")[0] for line in lines))
+
+    def test_sampler_ignores_stacks_taken_while_stopping(self):
+        """
+        Les piles prises dans StackSampler.stop sont ignorées, y compris avec
+        les libellés sans nom qualifié de Python 3.10.
+        """
+        import sys
+        import threading
+        import time
+        from types import SimpleNamespace
+
+        from softdesk import profiling
+
+        def busy_wait():
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+
+        # Un faux échantillonneur dont l'arrêt dure : la pile passe par StackSampler.stop
+        stopping = SimpleNamespace(_stop_event=SimpleNamespace(set=busy_wait), join=lambda: None)
+        with mock.patch.object(
+            profiling, "_frame_label", lambda code: f"{code.co_name} (fichier:1)"
+        ):
+            sampler = profiling.StackSampler(threading.get_ident(), sys._getframe(), 0.001)
+            sampler.start()
+            profiling.StackSampler.stop(stopping)
+            busy_wait()
+            sampler.stop()
+        lines = sampler.collapsed().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.startswith("busy_wait ") for line in lines))
+
+
+class SlowQueryLogTests(APITestCase):
+    """
+    Tests du journal des requêtes lentes.
+
+    Vérifie l'empreinte normalisée, la capture du plan et de la vue émettrice,
+    et le rapport agrégé par empreinte.
+    """
+
+    def setUp(self):
+        slow_queries.report.reset()
+        self.addCleanup(slow_queries.report.reset)
+        self.user = get_user_model().objects.create_user(username="author", password="pass", age=20)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("projects:project-list")
+
+    def test_fingerprint_ignores_values_and_list_lengths(self):
+        """
+        Deux requêtes ne différant que par leurs valeurs ont la même empreinte.
+        """
+        first = 'SELECT "a" FROM "t" WHERE "id" IN (%s, %s) AND "x" = \'b\' LIMIT 21'
+        second = 'SELECT "a"  FROM "t" WHERE "id" IN (%s) AND "x" = \'c\' LIMIT 5'
+        self.assertEqual(slow_queries.fingerprint(first), slow_queries.fingerprint(second))
+        self.assertEqual(
+            slow_queries.normalize_sql(first),
+            'SELECT "a" FROM "t" WHERE "id" IN (...) AND "x" = ? LIMIT ?',
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_REPORT_INTERVAL=3600)
+    def test_slow_queries_are_logged_with_view_and_plan(self):
+        """
+        Au-delà du seuil, chaque requête est journalisée avec sa vue, son action et son plan.
+        """
+        with self.assertLogs("softdesk.slow_queries", "WARNING") as logs:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        entries = [record.slow_query for record in logs.records]
+        selects = [entry for entry in entries if entry["sql"].startswith("SELECT")]
+        self.assertTrue(selects)
+        for entry in selects:
+            self.assertEqual(entry["view"], "projects:project-list")
+            self.assertEqual(entry["action"], "list")
+            self.assertTrue(entry["plan"])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=None)
+    def test_disabled_without_threshold(self):
+        """
+        Sans seuil, aucun wrapper n'est installé.
+        """
+        with mock.patch.object(slow_queries.SlowQueryLogger, "record") as record:
+            self.client.get(self.url)
+        record.assert_not_called()
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_REPORT_INTERVAL=0, SLOW_QUERY_REPORT_TOP=3)
+    def test_report_aggregates_repeated_fingerprints(self):
+        """
+        Le rapport périodique agrège les répétitions d'une empreinte et se limite au top N.
+        """
+        with mock.patch.object(slow_queries.report, "flush_if_due"), \
+                self.assertLogs("softdesk.slow_queries", "WARNING"):
+            self.client.get(self.url)
+            self.client.get(self.url)
+        with self.assertLogs("softdesk.slow_queries", "INFO") as logs:
+            slow_queries.report.flush_if_due()
+
+        top = logs.records[-1].slow_query_report
+        self.assertLessEqual(len(top), 3)
+        self.assertTrue(all(entry["count"] >= 2 for entry in top))
+        self.assertEqual(slow_queries.report.entries, {})
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=None, SLOW_QUERY_REPORT_INTERVAL=0)
+    def test_report_is_flushed_when_a_request_finishes(self):
+        """
+        Le rapport échu est publié à la fin d'une requête HTTP, même si elle
+        n'émet aucune requête lente.
+        """
+        slow_queries.report.add("abc", "SELECT 1", 150.0, "projects:project-list", None)
+        with self.assertLogs("softdesk.slow_queries", "INFO") as logs:
+            self.client.get(self.url)
+
+        self.assertEqual(logs.records[-1].slow_query_report[0]["fingerprint"], "abc")
+        self.assertEqual(slow_queries.report.entries, {})
+
+
+class MetricsTests(APITestCase):
+    """
+    Tests de l'endpoint /metrics.
+
+    Vérifie les étiquettes viewset / action / style de route, les histogrammes
+    de latence et de requêtes SQL, et l'agrégation des instantanés des workers.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        override = override_settings(METRICS_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+
+        self.user = get_user_model().objects.create_user(username="author", password="pass", age=20)
+        self.staff = get_user_model().objects.create_user(
+            username="staff", password="pass", age=20, is_staff=True
+        )
+        self.user_token = f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.user_token)
+        self.project = self.client.post(
+            reverse("projects:project-list"),
+            {"title": "Projet", "description": "d", "type": "Back-End"},
+            format="json",
+        ).json()
+
+    def scrape(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.staff).access_token}"
+        )
+        response = self.client.get(reverse("metrics"))
+        self.client.credentials(HTTP_AUTHORIZATION=self.user_token)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if line and not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                samples[name] = float(value)
+        return samples
+
+    def test_requests_are_labeled_by_viewset_action_and_route_style(self):
+        """
+        Les routes plates et imbriquées d'un même viewset sont distinguées.
+        """
+        self.client.get(reverse("projects:issue-list"))
+        self.client.get(reverse("projects:project-issues-list", args=[self.project["id"]]))
+        self.client.get(reverse("projects:project-detail", args=[999999]))
+        samples = self.scrape()
+
+        flat = 'viewset="IssueViewSet",action="list",route_style="flat"'
+        nested = 'viewset="IssueViewSet",action="list",route_style="nested"'
+        self.assertEqual(samples[f'softdesk_http_requests_total{{{flat},status="2xx"}}'], 1)
+        self.assertEqual(samples[f'softdesk_http_requests_total{{{nested},status="2xx"}}'], 1)
+        self.assertEqual(
+            samples['softdesk_http_requests_total{viewset="ProjectViewSet",action="retrieve",'
+                    'route_style="flat",status="4xx"}'],
+            1,
+        )
+        self.assertEqual(samples[f'softdesk_http_request_duration_seconds_count{{{nested}}}'], 1)
+        self.assertEqual(samples[f'softdesk_http_request_duration_seconds_bucket{{{nested},le="+Inf"}}'], 1)
+        self.assertGreater(samples[f'softdesk_http_request_queries_sum{{{nested}}}'], 0)
+
+    def test_snapshots_of_all_workers_are_summed(self):
+        """
+        Les instantanés écrits par les autres processus sont additionnés.
+        """
+        self.client.get(reverse("projects:issue-list"))
+        # Un autre worker a traité la même requête
+        (self.directory / "autre-worker.json").write_text(json.dumps(metrics.registry.snapshot()))
+
+        samples = self.scrape()
+        key = ('softdesk_http_requests_total{viewset="IssueViewSet",action="list",'
+               'route_style="flat",status="2xx"}')
+        self.assertEqual(samples[key], 2)
+
+    def test_stale_snapshots_are_removed(self):
+        """
+        L'instantané d'un worker arrêté depuis plus de METRICS_STALE_AFTER
+        secondes est supprimé et n'est plus additionné.
+        """
+        self.client.get(reverse("projects:issue-list"))
+        stale = self.directory / "worker-arrete.json"
+        stale.write_text(json.dumps(metrics.registry.snapshot()))
+        old = time.time() - 3601
+        os.utime(stale, (old, old))
+
+        samples = self.scrape()
+        key = ('softdesk_http_requests_total{viewset="IssueViewSet",action="list",'
+               'route_style="flat",status="2xx"}')
+        self.assertEqual(samples[key], 1)
+        self.assertFalse(stale.exists())
+
+    def test_only_staff_can_read_metrics_without_token(self):
+        """
+        Sans METRICS_TOKEN, /metrics est réservé aux utilisateurs staff.
+        """
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token_is_required_when_configured(self):
+        """
+        Avec METRICS_TOKEN, /metrics exige le jeton correspondant.
+        """
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+
+
+class WriteCoordinationTests(TransactionTestCase):
+    """
+    Tests de la coordination des écritures SQLite (softdesk/writes.py).
+
+    Hors transaction de test : les reprises et le group commit ouvrent leurs
+    propres transactions.
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="author", age=20)
+
+    def create_project(self, title):
+        return Project.objects.create(
+            title=title, description="d", type="Back-End", author=self.user
+        ).pk
+
+    def test_locked_transaction_is_rolled_back_and_retried(self):
+        calls = []
+
+        def create():
+            calls.append(1)
+            project_id = self.create_project(f"Projet {len(calls)}")
+            if len(calls) == 1:
+                raise OperationalError("database is locked")
+            return project_id
+
+        with mock.patch("softdesk.writes.time.sleep") as sleep:
+            project_id = writes.retry_on_lock(create)
+        self.assertEqual(len(calls), 2)
+        sleep.assert_called_once()
+        self.assertEqual(list(Project.objects.values_list("pk", flat=True)), [project_id])
+
+    def test_retries_are_bounded_and_limited_to_lock_errors(self):
+        def locked():
+            raise OperationalError("database is locked")
+
+        with mock.patch("softdesk.writes.time.sleep") as sleep, self.assertRaises(OperationalError):
+            writes.retry_on_lock(locked, retries=2)
+        self.assertEqual(sleep.call_count, 2)
+
+        def broken():
+            raise OperationalError("no such table: x")
+
+        with mock.patch("softdesk.writes.time.sleep") as sleep, self.assertRaises(OperationalError):
+            writes.retry_on_lock(broken)
+        sleep.assert_not_called()
+
+    def test_group_commit_isolates_failed_writes(self):
+        """
+        Les écritures concurrentes sont exécutées en lot ; l'échec de l'une
+        n'annule pas les autres.
+        """
+        committer = writes.GroupCommitter(window_ms=50)
+        barrier = threading.Barrier(4)
+
+        def create(index):
+            if index == 3:
+                raise ValueError("refusée")
+            return self.create_project(f"Projet {index}")
+
+        def submit(index):
+            barrier.wait()
+            try:
+                return committer.submit(lambda: create(index))
+            except ValueError as exc:
+                return exc
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(submit, range(4)))
+
+        self.assertIsInstance(results[3], ValueError)
+        self.assertEqual(
+            sorted(Project.objects.values_list("pk", flat=True)), sorted(results[:3])
+        )
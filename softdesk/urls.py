@@ -1,44 +1,43 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
-from rest_framework import permissions
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="SoftDesk API",
-        default_version="v1",
-        description="Documentation de l'API SoftDesk",
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
+
+from .batch import BatchView
+from .metrics import metrics_view
+from .profiling import (
+    ProfileDetailView,
+    ProfileDownloadView,
+    ProfileListView,
+    ProfileTokenView,
 )
 
 urlpatterns = [
-    # Swagger
+    # Apps
     path(
-        "",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
+        "api/projects/",
+        include(("projects.urls", "projects"), namespace="projects"),
     ),
+    path("api/users/", include(("users.urls", "users"), namespace="users")),
+
+    # Requêtes groupées
+    path("api/batch/", BatchView.as_view(), name="batch"),
 
-    # Redoc
+    # Profilage à la demande (staff)
+    path("api/profiles/", ProfileListView.as_view(), name="profile-list"),
+    path("api/profiles/token/", ProfileTokenView.as_view(), name="profile-token"),
     path(
-        "redoc/",
-        schema_view.with_ui("redoc", cache_timeout=0),
-        name="schema-redoc",
+        "api/profiles/<str:profile_id>/",
+        ProfileDetailView.as_view(),
+        name="profile-detail",
     ),
-
-    # Admin
-    path("admin/", admin.site.urls),
-
-    # Apps
     path(
-        "api/projects/",
-        include(("projects.urls", "projects"), namespace="projects"),
+        "api/profiles/<str:profile_id>/<str:file_format>/",
+        ProfileDownloadView.as_view(),
+        name="profile-download",
     ),
-    path("api/users/", include(("users.urls", "users"), namespace="users")),
+
+    # Métriques Prometheus
+    path("metrics", metrics_view, name="metrics"),
 
     # JWT
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
@@ -47,4 +46,34 @@ urlpatterns = [
         TokenRefreshView.as_view(),
         name="token_refresh",
     ),
-]
\ No newline at end of file
+]
+
+# Documentation et admin ne sont routés (et importés) que si leurs applications
+# sont installées : les workers API (softdesk.settings_api) en sont dispensés.
+if apps.is_installed("drf_yasg"):
+    # Le schéma JSON est précalculé et servi depuis la mémoire (voir softdesk/schema.py)
+    from .schema import CachedSchemaView
+
+    urlpatterns += [
+        # Swagger
+        path(
+            "",
+            CachedSchemaView.with_ui("swagger", cache_timeout=0),
+            name="schema-swagger-ui",
+        ),
+
+        # Redoc
+        path(
+            "redoc/",
+            CachedSchemaView.with_ui("redoc", cache_timeout=0),
+            name="schema-redoc",
+        ),
+    ]
+
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns += [
+        # Admin
+        path("admin/", admin.site.urls),
+    ]
@@ -0,0 +1,260 @@
+"""
+Coordination des écritures sur SQLite.
+
+SQLite n'accepte qu'un écrivain à la fois. Une transaction ouverte en mode
+DEFERRED (par défaut) qui lit puis écrit doit promouvoir son verrou : si un
+autre écrivain est actif, SQLite échoue aussitôt (« database is locked »)
+plutôt que d'attendre, pour éviter un interblocage. Les bases sont donc
+configurées en transaction_mode IMMEDIATE (settings.DATABASES) : le verrou
+d'écriture est pris dès le BEGIN, où le délai d'attente (timeout) s'applique.
+
+write_transaction(function) exécute function() dans une transaction
+d'écriture :
+
+- si le verrou reste indisponible au-delà du délai d'attente, la transaction
+  est rejouée après un délai exponentiel aléatoire (jitter), au plus
+  settings.SQLITE_WRITE_RETRIES fois ;
+- si settings.SQLITE_GROUP_COMMIT est vrai, les écritures concurrentes du
+  processus sont regroupées en une seule transaction (group commit) : un seul
+  BEGIN/COMMIT, donc une seule synchronisation disque, pour tout le lot.
+  Chaque écriture s'exécute dans son propre point de sauvegarde : l'échec de
+  l'une n'annule pas les autres.
+
+Dans une transaction déjà ouverte (requêtes groupées atomiques, tests),
+function() est exécutée directement : la transaction englobante détient le
+verrou, et seule elle pourrait être rejouée.
+
+`using` peut désigner plusieurs bases (écriture répartie sur un shard et la
+base par défaut) : une transaction est ouverte sur chacune, et toutes sont
+annulées avant de rejouer. Une erreur de verrou pendant la validation n'est
+alors pas rejouée : les bases déjà validées recevraient l'écriture deux fois.
+
+Comparaison des modes sous concurrence :
+python manage.py benchmark_writes --threads 8 --writes 50
+"""
+
+import contextvars
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRIES = 5
+DEFAULT_GROUP_WINDOW_MS = 2
+DEFAULT_GROUP_MAX_SIZE = 50
+BACKOFF_BASE = 0.05
+BACKOFF_CAP = 1.0
+
+
+def is_lock_error(exc):
+    """
+    Vrai si l'erreur signale un verrou SQLite indisponible.
+    """
+    message = str(exc).lower()
+    return isinstance(exc, OperationalError) and ("locked" in message or "busy" in message)
+
+
+def backoff_delay(attempt):
+    """
+    Délai (en secondes) avant la nouvelle tentative : tiré au hasard entre 0 et
+    50 ms, 100 ms, 200 ms... plafonné à 1 s, pour désynchroniser les écrivains.
+    """
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def _aliases(using):
+    """
+    Alias des bases d'une écriture, sans doublon (`using` : alias ou séquence).
+    """
+    if isinstance(using, str):
+        return (using,)
+    return tuple(dict.fromkeys(using))
+
+
+def _in_atomic_block(aliases):
+    return any(connections[alias].in_atomic_block for alias in aliases)
+
+
+@contextmanager
+def multi_atomic(using=DEFAULT_DB_ALIAS):
+    """
+    Bloc atomic ouvert sur chacune des bases de `using` (alias ou séquence
+    d'alias) : une erreur annule les écritures de toutes ces bases.
+    """
+    with ExitStack() as stack:
+        for alias in _aliases(using):
+            stack.enter_context(transaction.atomic(using=alias))
+        yield
+
+
+def retry_on_lock(function, *, using=DEFAULT_DB_ALIAS, retries=None):
+    """
+    Exécute function() dans une transaction (une par base de `using`),
+    rejouée si le verrou d'écriture reste indisponible.
+
+    Returns:
+        Le résultat de function().
+
+    Raises:
+        OperationalError: si le verrou est toujours indisponible après `retries`
+            nouvelles tentatives, ou pendant la validation d'une écriture
+            répartie sur plusieurs bases.
+    """
+    aliases = _aliases(using)
+    if retries is None:
+        retries = getattr(settings, "SQLITE_WRITE_RETRIES", DEFAULT_RETRIES)
+    if _in_atomic_block(aliases):
+        with multi_atomic(aliases):
+            return function()
+    for attempt in itertools.count(1):
+        committing = False
+        try:
+            with multi_atomic(aliases):
+                result = function()
+                committing = True
+            return result
+        except OperationalError as exc:
+            if not is_lock_error(exc) or attempt > retries:
+                raise
+            if committing and len(aliases) > 1:
+                # Une partie des bases a pu être validée : rejouer dupliquerait
+                raise
+            delay = backoff_delay(attempt)
+            logger.info("Base verrouillée, tentative %s dans %.0f ms", attempt + 1, delay * 1000)
+            time.sleep(delay)
+
+
+class _Write:
+    """
+    Écriture en attente dans un GroupCommitter.
+    """
+
+    def __init__(self, function):
+        # L'écriture s'exécute dans le thread du meneur, avec le contexte de l'appelant
+        self.context = contextvars.copy_context()
+        self.function = function
+        self.ready = threading.Event()
+        self.leader = False
+        self.finished = False
+        self.result = None
+        self.error = None
+
+
+class GroupCommitter:
+    """
+    Regroupe les écritures concurrentes du processus en transactions communes.
+
+    Le premier appelant devient meneur : il attend `window_ms` que d'autres
+    écritures rejoignent la file, exécute le lot (au plus `max_size`) dans une
+    transaction, puis passe la main à la première écriture restée en file.
+    Les autres appelants attendent la validation de leur lot.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, window_ms=None, max_size=None):
+        self.using = _aliases(using)
+        if window_ms is None:
+            window_ms = getattr(settings, "SQLITE_GROUP_COMMIT_WINDOW_MS", DEFAULT_GROUP_WINDOW_MS)
+        if max_size is None:
+            max_size = getattr(settings, "SQLITE_GROUP_COMMIT_MAX_SIZE", DEFAULT_GROUP_MAX_SIZE)
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._queue = []
+        self._leading = False
+
+    def submit(self, function):
+        """
+        Exécute function() dans la prochaine transaction groupée.
+
+        Returns:
+            Le résultat de function().
+
+        Raises:
+            Exception: l'erreur levée par function(), ou l'erreur de validation du lot.
+        """
+        write = _Write(function)
+        with self._lock:
+            self._queue.append(write)
+            if not self._leading:
+                self._leading = True
+                write.leader = True
+                write.ready.set()
+        write.ready.wait()
+        if not write.finished:
+            # Promu meneur : l'écriture fait partie du lot qu'il exécute
+            self._run_batch()
+        if write.error is not None:
+            raise write.error
+        return write.result
+
+    def _run_batch(self):
+        time.sleep(self.window)
+        with self._lock:
+            batch = self._queue[:self.max_size]
+            del self._queue[:len(batch)]
+        try:
+            retry_on_lock(lambda: self._execute(batch), using=self.using)
+        except Exception as exc:
+            for write in batch:
+                write.result, write.error = None, exc
+        finally:
+            with self._lock:
+                if self._queue:
+                    following = self._queue[0]
+                    following.leader = True
+                    following.ready.set()
+                else:
+                    self._leading = False
+            for write in batch:
+                write.finished = True
+                write.ready.set()
+
+    def _execute(self, batch):
+        for write in batch:
+            write.error = None
+            try:
+                with multi_atomic(self.using):
+                    write.result = write.context.run(write.function)
+            except Exception as exc:
+                if is_lock_error(exc):
+                    # Le lot entier est rejoué par retry_on_lock
+                    raise
+                write.error = exc
+
+
+_committers = {}
+_committers_lock = threading.Lock()
+
+
+def get_committer(using=DEFAULT_DB_ALIAS):
+    aliases = _aliases(using)
+    with _committers_lock:
+        committer = _committers.get(aliases)
+        if committer is None:
+            committer = _committers[aliases] = GroupCommitter(aliases)
+        return committer
+
+
+def write_transaction(function, *, using=DEFAULT_DB_ALIAS):
+    """
+    Exécute function() dans une transaction d'écriture coordonnée : groupée
+    avec les écritures concurrentes si settings.SQLITE_GROUP_COMMIT, rejouée
+    en cas de verrou persistant.
+
+    function() peut être exécutée plusieurs fois : elle ne doit pas dépendre
+    d'un état modifié par une tentative annulée. `using` doit nommer toutes
+    les bases sur lesquelles elle écrit.
+
+    Returns:
+        Le résultat de function().
+    """
+    if getattr(settings, "SQLITE_GROUP_COMMIT", False) and not _in_atomic_block(_aliases(using)):
+        return get_committer(using).submit(function)
+    return retry_on_lock(function, using=using)
@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.apps import apps
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'softdesk.settings')
 
 application = get_wsgi_application()
+
+# Prépare le schéma OpenAPI au démarrage du worker plutôt qu'à la première requête
+# (uniquement sur les workers qui servent la documentation)
+if getattr(settings, "OPENAPI_SCHEMA_WARM_ON_STARTUP", False) and apps.is_installed("drf_yasg"):
+    from softdesk.schema import warm_schema
+
+    warm_schema()
@@ -0,0 +1,236 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from django.utils import timezone
+
+from projects.changes import record_changes, record_project_tombstones
+from projects.constants import ChangeAction, JobStatus
+from projects.inbox import remove_issues, remove_projects
+from projects.models import (
+    Project,
+    Contributor,
+    Issue,
+    Comment,
+    ArchivedIssue,
+    ArchivedComment,
+)
+from projects.outbox import enqueue_deletions
+from projects.sharding import current_shard, fan_out, get_shards, is_sharded_model, use_shard
+from softdesk.writes import multi_atomic
+from .models import CustomUser, AccountErasureJob
+
+logger = logging.getLogger(__name__)
+
+
+def get_chunk_size():
+    """
+    Taille de lot initiale (settings.USER_ERASURE_CHUNK_SIZE, 500 par défaut).
+    """
+    return getattr(settings, "USER_ERASURE_CHUNK_SIZE", 500)
+
+
+def get_max_lock_seconds():
+    """
+    Durée maximale visée pour une transaction d'effacement
+    (settings.USER_ERASURE_MAX_LOCK_SECONDS, 0.25 s par défaut).
+    """
+    return getattr(settings, "USER_ERASURE_MAX_LOCK_SECONDS", 0.25)
+
+
+def _delete(queryset):
+    model = queryset.model
+    if model in (Issue, Comment):
+        # Tombstones pour le flux de synchronisation (les projets du compte
+        # ont déjà reçu les leurs lors de la planification) et webhooks
+        pks = list(queryset.values_list("pk", flat=True))
+        record_changes(model, pks, ChangeAction.DELETE)
+        enqueue_deletions(model, pks)
+    return queryset.delete()[0]
+
+
+def _unassign(queryset):
+    pks = list(queryset.values_list("pk", flat=True))
+    count = Issue.objects.filter(pk__in=pks).update(
+        assignee_user=None, updated_time=timezone.now()
+    )
+    record_changes(Issue, pks, ChangeAction.UPSERT)
+    remove_issues(pks)
+    return count
+
+
+def _authored_project_ids(uid):
+    """
+    Projets de l'utilisateur, sur tous les shards : les archives, sur la base
+    par défaut, ne peuvent pas être jointes aux projets des autres shards.
+    """
+    found = fan_out(
+        lambda alias: list(
+            Project.objects.using(alias).filter(author_id=uid).values_list("pk", flat=True)
+        )
+    )
+    return [pk for pks in found.values() for pk in pks]
+
+
+# Étapes ordonnées de l'effacement : (nom, queryset des lignes restantes, opération).
+# Les feuilles (commentaires) sont supprimées avant leurs parents, si bien que
+# le collecteur de cascade de Django n'a plus rien à parcourir à chaque lot.
+# Les étapes qui portent sur des modèles shardés sont exécutées sur chaque shard.
+ERASURE_STEPS = [
+    ("unassign", lambda uid: Issue.objects.filter(assignee_user_id=uid), _unassign),
+    ("comments", lambda uid: Comment.objects.filter(author_id=uid), _delete),
+    ("issue_comments", lambda uid: Comment.objects.filter(issue__author_id=uid), _delete),
+    (
+        "project_comments",
+        lambda uid: Comment.objects.filter(issue__project__author_id=uid),
+        _delete,
+    ),
+    ("issues", lambda uid: Issue.objects.filter(author_id=uid), _delete),
+    ("project_issues", lambda uid: Issue.objects.filter(project__author_id=uid), _delete),
+    (
+        "archived_comments",
+        lambda uid: ArchivedComment.objects.filter(
+            Q(author_id=uid)
+            | Q(issue__author_id=uid)
+            | Q(issue__project_id__in=_authored_project_ids(uid))
+        ),
+        _delete,
+    ),
+    (
+        "archived_issues",
+        lambda uid: ArchivedIssue.objects.filter(
+            Q(author_id=uid) | Q(project_id__in=_authored_project_ids(uid))
+        ),
+        _delete,
+    ),
+    ("contributions", lambda uid: Contributor.objects.filter(user_id=uid), _delete),
+    (
+        "project_contributors",
+        lambda uid: Contributor.objects.filter(project__author_id=uid),
+        _delete,
+    ),
+    ("projects", lambda uid: Project.objects.filter(author_id=uid), _delete),
+    ("account", lambda uid: CustomUser.objects.filter(pk=uid), _delete),
+]
+STEP_NAMES = [name for name, _, _ in ERASURE_STEPS]
+
+
+def schedule_account_erasure(user):
+    """
+    Désactive le compte, masque ses projets et enregistre une tâche d'effacement.
+
+    Le compte désactivé ne peut plus s'authentifier ; l'effacement effectif
+    est réalisé par la commande erase_deleted_accounts.
+
+    Returns:
+        AccountErasureJob: tâche créée (ou tâche déjà en cours pour ce compte).
+    """
+    with multi_atomic([DEFAULT_DB_ALIAS, *get_shards()]):
+        existing = AccountErasureJob.objects.filter(
+            user=user, status__in=[JobStatus.PENDING, JobStatus.RUNNING]
+        ).first()
+        if existing is not None:
+            return existing
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        for alias in get_shards():
+            with use_shard(alias):
+                projects = Project.objects.filter(author=user)
+                project_ids = list(projects.values_list("pk", flat=True))
+                record_project_tombstones(project_ids)
+                remove_projects(project_ids)
+                projects.update(pending_deletion=True)
+        return AccountErasureJob.objects.create(
+            user=user, step=STEP_NAMES[0], chunk_size=get_chunk_size()
+        )
+
+
+def _run_step(job, queryset, operation, max_lock_seconds):
+    """
+    Applique l'opération par lots jusqu'à épuisement du queryset.
+
+    Chaque lot est une transaction courte (sur la base par défaut et le shard
+    courant) ; si un lot dépasse max_lock_seconds, la taille de lot est
+    divisée par deux pour les lots suivants.
+    """
+    model = queryset.model
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:job.chunk_size])
+        if not pks:
+            return
+        started = time.monotonic()
+        with multi_atomic((DEFAULT_DB_ALIAS, current_shard())):
+            job.processed_rows += operation(model.objects.filter(pk__in=pks))
+            job.save(update_fields=["processed_rows", "updated_time"])
+        if time.monotonic() - started > max_lock_seconds and job.chunk_size > 1:
+            job.chunk_size = max(1, job.chunk_size // 2)
+            job.save(update_fields=["chunk_size", "updated_time"])
+
+
+def run_erasure_job(job, max_lock_seconds=None):
+    """
+    Exécute (ou reprend) un effacement à partir de son étape courante.
+
+    La tâche doit déjà avoir été réclamée (statut Running).
+    """
+    if max_lock_seconds is None:
+        max_lock_seconds = get_max_lock_seconds()
+    uid = job.user_id
+    start = STEP_NAMES.index(job.step) if job.step in STEP_NAMES else 0
+    try:
+        if uid is not None:
+            for name, build_queryset, operation in ERASURE_STEPS[start:]:
+                job.step = name
+                job.save(update_fields=["step", "updated_time"])
+                model = build_queryset(uid).model
+                # Une étape reprise est rejouée sur tous les shards : les shards
+                # déjà traités n'ont plus de lignes à effacer
+                for alias in get_shards() if is_sharded_model(model) else [DEFAULT_DB_ALIAS]:
+                    with use_shard(alias):
+                        _run_step(job, build_queryset(uid), operation, max_lock_seconds)
+    except Exception as exc:
+        logger.exception("Échec de l'effacement %s", job.id)
+        job.status = JobStatus.FAILED
+        job.error = str(exc)
+        job.finished_time = timezone.now()
+        job.save(update_fields=["status", "error", "finished_time", "updated_time"])
+        return job
+
+    job.status = JobStatus.DONE
+    job.finished_time = timezone.now()
+    job.save(update_fields=["status", "finished_time", "updated_time"])
+    return job
+
+
+def process_erasure_jobs(stale_after=timedelta(minutes=10), limit=None):
+    """
+    Traite les effacements en attente, ainsi que ceux restés Running sans
+    progression depuis stale_after (worker interrompu), qui sont repris.
+
+    Returns:
+        int: nombre de tâches traitées.
+    """
+    stale_before = timezone.now() - stale_after
+    candidates = AccountErasureJob.objects.filter(
+        status=JobStatus.PENDING
+    ) | AccountErasureJob.objects.filter(
+        status=JobStatus.RUNNING, updated_time__lt=stale_before
+    )
+    candidates = candidates.order_by("created_time")
+    if limit is not None:
+        candidates = candidates[:limit]
+
+    processed = 0
+    for job in candidates:
+        claimed = AccountErasureJob.objects.filter(
+            pk=job.pk, status=job.status, updated_time=job.updated_time
+        ).update(status=JobStatus.RUNNING, updated_time=timezone.now())
+        if not claimed:
+            continue
+        job.refresh_from_db()
+        run_erasure_job(job)
+        processed += 1
+    return processed
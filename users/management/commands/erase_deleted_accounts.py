@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from users.erasure import process_erasure_jobs
+
+
+class Command(BaseCommand):
+    """
+    Worker d'effacement des comptes supprimés.
+
+    Usage :
+        python manage.py erase_deleted_accounts
+        python manage.py erase_deleted_accounts --loop --interval 5
+    """
+    help = "Efface par lots les comptes dont la suppression a été demandée."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Tourne en continu au lieu de traiter la file une seule fois.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Pause (en secondes) entre deux passes en mode --loop.",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help="Délai (en secondes) après lequel une tâche Running sans progression est reprise.",
+        )
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(seconds=options["stale_after"])
+        while True:
+            processed = process_erasure_jobs(stale_after=stale_after)
+            if processed:
+                self.stdout.write(f"{processed} compte(s) effacé(s).")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.provisioning import provision_users, read_rows
+
+
+class Command(BaseCommand):
+    """
+    Création en masse de comptes à partir d'un fichier CSV ou JSONL.
+
+    Usage :
+        python manage.py provision_users comptes.csv
+        python manage.py provision_users comptes.jsonl --workers 8
+    """
+    help = "Crée en masse des utilisateurs à partir d'un fichier CSV ou JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fichier CSV (avec en-tête) ou JSONL.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Format du fichier (déduit de l'extension par défaut).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Nombre de processus de hachage (tous les cœurs par défaut).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Nombre de lignes par INSERT.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        try:
+            with open(path, encoding="utf-8", newline="") as stream:
+                rows = read_rows(stream, fmt)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        report = provision_users(
+            rows, workers=options["workers"], batch_size=options["batch_size"]
+        )
+        for failure in report["failures"]:
+            self.stderr.write(json.dumps(failure, ensure_ascii=False))
+        self.stdout.write(
+            f"{report['created']} utilisateur(s) créé(s), "
+            f"{len(report['failures'])} ligne(s) rejetée(s)."
+        )
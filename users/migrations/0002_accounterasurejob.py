@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:00
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountErasureJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Identifiant unique de la tâche', primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Done', 'Done'), ('Failed', 'Failed')], db_index=True, default='Pending', help_text="Statut de la tâche d'effacement", max_length=10)),
+                ('step', models.CharField(blank=True, help_text="Étape d'effacement en cours", max_length=32)),
+                ('chunk_size', models.PositiveIntegerField(default=500, help_text='Nombre de lignes traitées par transaction')),
+                ('processed_rows', models.PositiveBigIntegerField(default=0, help_text='Nombre de lignes traitées')),
+                ('error', models.TextField(blank=True, help_text="Message d'erreur si l'effacement a échoué")),
+                ('created_time', models.DateTimeField(auto_now_add=True, help_text="Date et heure de la demande d'effacement")),
+                ('updated_time', models.DateTimeField(auto_now=True, help_text='Date et heure de la dernière progression')),
+                ('finished_time', models.DateTimeField(blank=True, help_text="Date et heure de fin de l'effacement", null=True)),
+                ('user', models.ForeignKey(blank=True, help_text='Compte à effacer', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='erasure_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
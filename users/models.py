@@ -1,6 +1,8 @@
+import uuid
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.validators import MinValueValidator
+from projects.constants import JobStatus
 
 
 class CustomUser(AbstractUser):
@@ -33,4 +35,82 @@ class CustomUser(AbstractUser):
 
         Utilise le nom d'utilisateur pour l'affichage.
         """
-        return self.username
\ No newline at end of file
+        return self.username
+
+
+class AccountErasureJob(models.Model):
+    """
+    Tâche d'effacement différé d'un compte et des données qui lui sont liées.
+
+    L'effacement est découpé en étapes (voir users.erasure.ERASURE_STEPS),
+    chacune traitée par lots : une tâche interrompue reprend à son étape courante.
+
+    Attributs :
+        id (UUID) : identifiant non devinable, utilisé pour le suivi sans authentification.
+        user (CustomUser|None) : compte à effacer (NULL une fois supprimé).
+        status (str) : état de la tâche, parmi JobStatus.
+        step (str) : étape en cours d'effacement.
+        chunk_size (int) : taille des lots, réduite si un lot dépasse le budget de verrou.
+        processed_rows (int) : nombre de lignes traitées jusqu'ici.
+        error (str) : message d'erreur en cas d'échec.
+        created_time (datetime) : horodatage de la demande.
+        updated_time (datetime) : horodatage de la dernière progression.
+        finished_time (datetime|None) : horodatage de fin de l'effacement.
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text="Identifiant unique de la tâche"
+    )
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="erasure_jobs",
+        help_text="Compte à effacer"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=JobStatus.choices,
+        default=JobStatus.PENDING,
+        db_index=True,
+        help_text="Statut de la tâche d'effacement"
+    )
+    step = models.CharField(
+        max_length=32,
+        blank=True,
+        help_text="Étape d'effacement en cours"
+    )
+    chunk_size = models.PositiveIntegerField(
+        default=500,
+        help_text="Nombre de lignes traitées par transaction"
+    )
+    processed_rows = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Nombre de lignes traitées"
+    )
+    error = models.TextField(
+        blank=True,
+        help_text="Message d'erreur si l'effacement a échoué"
+    )
+    created_time = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Date et heure de la demande d'effacement"
+    )
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        help_text="Date et heure de la dernière progression"
+    )
+    finished_time = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Date et heure de fin de l'effacement"
+    )
+
+    def __str__(self):
+        """
+        Retourne une représentation concise de la tâche.
+        """
+        return f"Effacement {self.id} ({self.status})"
@@ -0,0 +1,189 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+
+from .models import CustomUser
+
+# En dessous de ce nombre de mots de passe, le coût de démarrage du pool
+# de processus dépasse le gain du hachage parallèle
+MIN_ROWS_FOR_POOL = 20
+
+TRUE_VALUES = {"1", "true", "yes", "oui", "y"}
+
+
+def read_rows(stream, fmt):
+    """
+    Lit les lignes d'un fichier CSV (avec en-tête) ou JSONL.
+
+    Args:
+        stream (io.TextIOBase): flux texte à lire.
+        fmt (str): "csv" ou "jsonl".
+
+    Returns:
+        list: une entrée par utilisateur à créer (les lignes qui ne sont pas
+        des objets sont rejetées par validate_row).
+
+    Raises:
+        ValueError: format inconnu ou fichier mal formé.
+    """
+    if fmt == "csv":
+        try:
+            return list(csv.DictReader(stream))
+        except csv.Error as exc:
+            raise ValueError(f"CSV invalide : {exc}") from exc
+    if fmt == "jsonl":
+        return [json.loads(line) for line in stream if line.strip()]
+    raise ValueError(f"Format inconnu : {fmt}")
+
+
+def read_upload(uploaded_file):
+    """
+    Lit un fichier envoyé en multipart ; le format est déduit de l'extension.
+    """
+    fmt = "csv" if uploaded_file.name.lower().endswith(".csv") else "jsonl"
+    text = io.TextIOWrapper(uploaded_file.file, encoding="utf-8")
+    return read_rows(text, fmt)
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+
+def validate_row(row):
+    """
+    Applique à une ligne les règles de RegisterView, sauf l'unicité
+    du username qui est vérifiée en une seule requête pour tout le lot.
+
+    Returns:
+        tuple[dict|None, list[str]]: champs nettoyés, ou None et la liste des erreurs.
+    """
+    if not isinstance(row, dict):
+        return None, ["Chaque ligne doit être un objet."]
+
+    username = (row.get("username") or "").strip()
+    password = row.get("password") or ""
+    age = row.get("age")
+
+    if not username or not password or age in (None, ""):
+        return None, ["Username, password et age sont requis."]
+
+    try:
+        age = int(age)
+    except (TypeError, ValueError):
+        return None, ["L'âge doit être un entier."]
+    if age < 15:
+        return None, ["Vous devez avoir au moins 15 ans pour vous inscrire."]
+
+    try:
+        validate_password(password, CustomUser(username=username))
+    except DjangoValidationError as e:
+        return None, list(e.messages)
+
+    return {
+        "username": username,
+        "password": password,
+        "email": (row.get("email") or "").strip(),
+        "first_name": (row.get("first_name") or "").strip(),
+        "last_name": (row.get("last_name") or "").strip(),
+        "age": age,
+        "can_be_contacted": _as_bool(row.get("can_be_contacted")),
+        "can_data_be_shared": _as_bool(row.get("can_data_be_shared")),
+    }, []
+
+
+def _init_worker(settings_module):
+    """
+    Initialise Django dans un processus du pool (nécessaire hors fork).
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hache les mots de passe avec le hasher configuré, en parallèle sur
+    tous les cœurs disponibles (ou `workers` processus).
+
+    Returns:
+        list[str]: mots de passe hachés, dans l'ordre d'entrée.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < MIN_ROWS_FOR_POOL:
+        return [make_password(password) for password in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "softdesk.settings"),),
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def provision_users(rows, workers=None, batch_size=500):
+    """
+    Valide puis crée en masse les utilisateurs décrits par `rows`.
+
+    - Une ligne invalide (ou dont le username existe déjà, en base ou plus
+      haut dans le fichier) est rejetée sans bloquer les autres.
+    - Les mots de passe sont hachés en parallèle puis les comptes insérés
+      avec bulk_create.
+
+    Returns:
+        dict: {"created": int, "failures": [{"row", "username", "errors"}]}.
+    """
+    failures = []
+    valid = []
+    for index, row in enumerate(rows, start=1):
+        cleaned, errors = validate_row(row)
+        if errors:
+            failures.append(
+                {
+                    "row": index,
+                    "username": row.get("username") if isinstance(row, dict) else None,
+                    "errors": errors,
+                }
+            )
+        else:
+            valid.append((index, cleaned))
+
+    existing = set(
+        CustomUser.objects.filter(
+            username__in=[cleaned["username"] for _, cleaned in valid]
+        ).values_list("username", flat=True)
+    )
+    accepted = []
+    for index, cleaned in valid:
+        if cleaned["username"] in existing:
+            failures.append(
+                {
+                    "row": index,
+                    "username": cleaned["username"],
+                    "errors": ["Ce nom d'utilisateur existe déjà."],
+                }
+            )
+            continue
+        existing.add(cleaned["username"])
+        accepted.append(cleaned)
+
+    hashed = hash_passwords([cleaned["password"] for cleaned in accepted], workers)
+    users = []
+    for cleaned, password in zip(accepted, hashed):
+        cleaned["password"] = password
+        users.append(CustomUser(**cleaned))
+
+    with transaction.atomic():
+        CustomUser.objects.bulk_create(users, batch_size=batch_size)
+
+    failures.sort(key=lambda failure: failure["row"])
+    return {"created": len(users), "failures": failures}
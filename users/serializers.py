@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import CustomUser
+from .models import CustomUser, AccountErasureJob
 
 
 class CustomUserSerializer(serializers.ModelSerializer):
@@ -70,4 +70,30 @@ class CustomUserSerializer(serializers.ModelSerializer):
         # Hash du mot de passe
         user.set_password(password)
         user.save()
-        return user
\ No newline at end of file
+        return user
+
+
+class AccountErasureJobSerializer(serializers.ModelSerializer):
+    """
+    Sérialiseur en lecture seule pour le suivi d'un effacement de compte.
+
+    - Le champ 'status_url' pointe vers l'endpoint de suivi de la tâche.
+    """
+    status_url = serializers.HyperlinkedIdentityField(
+        view_name="users:erasure-job-detail"
+    )
+
+    class Meta:
+        model = AccountErasureJob
+        fields = [
+            "id",
+            "status",
+            "step",
+            "processed_rows",
+            "error",
+            "created_time",
+            "updated_time",
+            "finished_time",
+            "status_url",
+        ]
+        read_only_fields = fields
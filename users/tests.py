@@ -1,8 +1,20 @@
+import csv
+import io
+import os
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.test import override_settings
 from django.urls import reverse
-from .models import CustomUser
+from .models import CustomUser, AccountErasureJob
+from .erasure import process_erasure_jobs, run_erasure_job
 from rest_framework_simplejwt.tokens import RefreshToken
+from projects.constants import JobStatus, Priority, Tag
+from projects.models import Project, Contributor, Issue, Comment
+from projects.sharding import use_shard
 
 
 class CustomUserPermissionTests(APITestCase):
@@ -60,12 +72,18 @@ class CustomUserPermissionTests(APITestCase):
 
     def test_user_can_delete_own_account(self):
         """
-        Un utilisateur peut supprimer son propre compte (status 204).
+        Un utilisateur peut supprimer son propre compte (status 202) :
+        le compte est désactivé puis effacé par le worker.
         """
         self.authenticate(self.user1)
         url = reverse("users:user-detail", args=[self.user1.id])
         response = self.client.delete(url)
-        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.user1.refresh_from_db()
+        self.assertFalse(self.user1.is_active)
+
+        process_erasure_jobs()
+        self.assertFalse(CustomUser.objects.filter(pk=self.user1.id).exists())
 
     def test_user_cannot_access_another_user_profile(self):
         """
@@ -119,4 +137,244 @@ class CustomUserPermissionTests(APITestCase):
         response = self.client.patch(url, {"age": 14}, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.user1.refresh_from_db()
-        self.assertNotEqual(self.user1.age, 14)
\ No newline at end of file
+        self.assertNotEqual(self.user1.age, 14)
+
+
+class AccountErasureTests(APITestCase):
+    """
+    Tests de l'effacement différé des comptes.
+
+    Vérifie que l'effacement traite par lots les données du compte,
+    libère les issues assignées et qu'il est suivi sans authentification.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="leaving", password="password123", age=20
+        )
+        self.other = CustomUser.objects.create_user(
+            username="staying", password="password123", age=30
+        )
+        own_project = Project.objects.create(
+            title="Projet du partant", description="d", type="Back-End", author=self.user
+        )
+        other_project = Project.objects.create(
+            title="Projet restant", description="d", type="Back-End", author=self.other
+        )
+        Contributor.objects.create(user=self.user, project=own_project)
+        Contributor.objects.create(user=self.other, project=own_project)
+        Contributor.objects.create(user=self.user, project=other_project)
+        Contributor.objects.create(user=self.other, project=other_project)
+
+        self.kept_issue = Issue.objects.create(
+            title="Issue restante", description="d", tag=Tag.BUG,
+            priority=Priority.LOW, project=other_project,
+            author=self.other, assignee_user=self.user,
+        )
+        own_issue = Issue.objects.create(
+            title="Issue du partant", description="d", tag=Tag.BUG,
+            priority=Priority.LOW, project=other_project, author=self.user,
+        )
+        for i in range(5):
+            Comment.objects.create(description=f"c{i}", author=self.user, issue=self.kept_issue)
+            Comment.objects.create(description=f"o{i}", author=self.other, issue=own_issue)
+        self.kept_comment = Comment.objects.create(
+            description="reste", author=self.other, issue=self.kept_issue
+        )
+
+    def test_erasure_removes_user_data_in_chunks(self):
+        """
+        Avec des lots de 2 lignes, toutes les données du compte sont effacées
+        et seules les données des autres utilisateurs subsistent.
+        """
+        with self.settings(USER_ERASURE_CHUNK_SIZE=2):
+            refresh = RefreshToken.for_user(self.user)
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+            response = self.client.delete(reverse("users:user-detail", args=[self.user.id]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(process_erasure_jobs(), 1)
+
+        self.assertFalse(CustomUser.objects.filter(pk=self.user.id).exists())
+        self.assertEqual(Project.objects.count(), 1)
+        self.assertEqual(Issue.objects.count(), 1)
+        self.assertEqual(list(Comment.objects.all()), [self.kept_comment])
+        self.kept_issue.refresh_from_db()
+        self.assertIsNone(self.kept_issue.assignee_user)
+
+        self.client.credentials()
+        status_response = self.client.get(response.data["status_url"])
+        self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(status_response.data["status"], JobStatus.DONE)
+
+    def test_interrupted_erasure_resumes_from_current_step(self):
+        """
+        Une tâche reprise à une étape intermédiaire termine l'effacement.
+        """
+        job = AccountErasureJob.objects.create(
+            user=self.user, status=JobStatus.RUNNING, step="issues", chunk_size=3
+        )
+        Comment.objects.filter(author=self.user).delete()
+        Comment.objects.filter(issue__author=self.user).delete()
+        run_erasure_job(job)
+
+        self.assertEqual(job.status, JobStatus.DONE)
+        self.assertFalse(CustomUser.objects.filter(pk=self.user.id).exists())
+        # L'étape "unassign" précède "issues" : la reprise ne l'a pas rejouée,
+        # l'assignation est donc retirée par la suppression du compte (SET_NULL).
+        self.kept_issue.refresh_from_db()
+        self.assertIsNone(self.kept_issue.assignee_user)
+
+
+@override_settings(PROJECT_SHARDS=["default", "shard1"])
+class ShardedAccountErasureTests(APITestCase):
+    """
+    Effacement d'un compte dont les données sont réparties sur deux shards.
+    """
+    databases = {"default", "shard1"}
+
+    def create_project(self, author, title):
+        project = Project.objects.create(
+            title=title, description="d", type="Back-End", author=author
+        )
+        with use_shard(project._state.db):
+            Contributor.objects.create(user=author, project=project)
+        return project
+
+    def test_erasure_covers_every_shard(self):
+        """
+        Projets, contributions, issues et commentaires du compte sont effacés
+        sur chaque shard ; les données des autres utilisateurs subsistent.
+        """
+        user = CustomUser.objects.create_user(username="leaving", password="password123", age=20)
+        other = CustomUser.objects.create_user(username="staying", password="password123", age=30)
+        own = [self.create_project(user, f"Projet {index}") for index in range(2)]
+        kept = [self.create_project(other, f"Restant {index}") for index in range(2)]
+        self.assertEqual({project._state.db for project in own}, {"default", "shard1"})
+
+        for project in kept:
+            with use_shard(project._state.db):
+                Contributor.objects.create(user=user, project=project)
+                issue = Issue.objects.create(
+                    title="Issue restante", description="d", tag=Tag.BUG,
+                    priority=Priority.LOW, project=project, author=other, assignee_user=user,
+                )
+                Comment.objects.create(description="du partant", author=user, issue=issue)
+                Comment.objects.create(description="reste", author=other, issue=issue)
+                Issue.objects.create(
+                    title="Issue du partant", description="d", tag=Tag.BUG,
+                    priority=Priority.LOW, project=project, author=user,
+                )
+
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        response = self.client.delete(reverse("users:user-detail", args=[user.id]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(process_erasure_jobs(), 1)
+
+        self.assertFalse(CustomUser.objects.filter(pk=user.id).exists())
+        for alias in ("default", "shard1"):
+            self.assertFalse(Project.objects.using(alias).filter(author_id=user.id).exists())
+            self.assertFalse(Contributor.objects.using(alias).filter(user_id=user.id).exists())
+            self.assertFalse(Issue.objects.using(alias).filter(author_id=user.id).exists())
+            self.assertFalse(Issue.objects.using(alias).filter(assignee_user_id=user.id).exists())
+            self.assertFalse(Comment.objects.using(alias).filter(author_id=user.id).exists())
+            self.assertEqual(Issue.objects.using(alias).count(), 1)
+            self.assertEqual(Comment.objects.using(alias).count(), 1)
+
+
+class BulkProvisioningTests(APITestCase):
+    """
+    Tests de la création en masse d'utilisateurs (endpoint staff et commande).
+    """
+
+    def setUp(self):
+        self.staff = CustomUser.objects.create_user(
+            username="admin", password="password123", age=40, is_staff=True
+        )
+        self.rows = [
+            {"username": "alice", "password": "Xk9!mZ2#qL", "age": 22, "can_be_contacted": True},
+            {"username": "bob", "password": "short", "age": 30},
+            {"username": "admin", "password": "Xk9!mZ2#qL", "age": 30},
+            {"username": "young", "password": "Xk9!mZ2#qL", "age": 12},
+            {"username": "alice", "password": "Xk9!mZ2#qL", "age": 25},
+        ]
+
+    def authenticate(self, user):
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def test_staff_can_provision_users_with_per_row_failures(self):
+        """
+        Seules les lignes valides sont créées ; chaque rejet est rapporté avec son numéro.
+        """
+        self.authenticate(self.staff)
+        response = self.client.post(reverse("users:register-bulk"), self.rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([f["row"] for f in response.data["failures"]], [2, 3, 4, 5])
+
+        alice = CustomUser.objects.get(username="alice")
+        self.assertTrue(alice.check_password("Xk9!mZ2#qL"))
+        self.assertTrue(alice.can_be_contacted)
+
+    def test_non_staff_cannot_provision_users(self):
+        """
+        Un utilisateur non staff reçoit un 403.
+        """
+        user = CustomUser.objects.create_user(username="plain", password="password123", age=20)
+        self.authenticate(user)
+        response = self.client.post(reverse("users:register-bulk"), self.rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(CustomUser.objects.filter(username="alice").exists())
+
+    def test_non_object_rows_are_rejected_per_row(self):
+        """
+        Une liste JSON d'éléments qui ne sont pas des objets donne des rejets
+        par ligne, pas une erreur 500.
+        """
+        self.authenticate(self.staff)
+        response = self.client.post(reverse("users:register-bulk"), ["a", 1], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual([f["row"] for f in response.data["failures"]], [1, 2])
+
+    def test_jsonl_upload_rejects_non_object_lines(self):
+        """
+        Une ligne JSONL qui n'est pas un objet est rejetée sans bloquer les autres.
+        """
+        self.authenticate(self.staff)
+        upload = SimpleUploadedFile(
+            "users.jsonl",
+            b'[1, 2]\n{"username": "erin", "password": "Xk9!mZ2#qL", "age": 40}\n',
+        )
+        response = self.client.post(reverse("users:register-bulk"), {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([f["row"] for f in response.data["failures"]], [1])
+
+    def test_malformed_csv_upload_returns_400(self):
+        """
+        Un CSV mal formé (champ trop long pour le module csv) donne un 400.
+        """
+        self.authenticate(self.staff)
+        content = "username,password,age\n" + "x" * (csv.field_size_limit() + 1) + ",p,20\n"
+        upload = SimpleUploadedFile("users.csv", content.encode())
+        response = self.client.post(reverse("users:register-bulk"), {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"], "Fichier illisible.")
+
+    def test_command_reads_csv(self):
+        """
+        La commande provision_users crée les comptes d'un fichier CSV.
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("username,password,age,can_be_contacted\n")
+            f.write("carol,Xk9!mZ2#qL,33,oui\n")
+            f.write("dave,Xk9!mZ2#qL,,\n")
+        self.addCleanup(os.remove, f.name)
+
+        out = io.StringIO()
+        call_command("provision_users", f.name, stdout=out, stderr=io.StringIO())
+        self.assertIn("1 utilisateur(s) créé(s)", out.getvalue())
+        self.assertTrue(CustomUser.objects.get(username="carol").can_be_contacted)
+        self.assertFalse(CustomUser.objects.filter(username="dave").exists())
@@ -1,11 +1,20 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import RegisterView, CustomUserViewSet
+from .views import (
+    RegisterView,
+    BulkRegisterView,
+    CustomUserViewSet,
+    AccountErasureJobViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"users", CustomUserViewSet, basename="user")
+router.register(
+    r"erasure-jobs", AccountErasureJobViewSet, basename="erasure-job"
+)
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
+    path("register/bulk/", BulkRegisterView.as_view(), name="register-bulk"),
     path("", include(router.urls)),
 ]
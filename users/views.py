@@ -1,13 +1,15 @@
-from rest_framework import status, viewsets
+from rest_framework import status, viewsets, mixins
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
 from django.contrib.auth.password_validation import validate_password
 
-from .models import CustomUser
-from .serializers import CustomUserSerializer
+from .erasure import schedule_account_erasure
+from .models import CustomUser, AccountErasureJob
+from .provisioning import provision_users, read_upload
+from .serializers import CustomUserSerializer, AccountErasureJobSerializer
 
 
 class RegisterView(APIView):
@@ -85,6 +87,53 @@ class RegisterView(APIView):
         )
 
 
+class BulkRegisterView(APIView):
+    """
+    Vue API de création en masse d'utilisateurs, réservée au staff.
+
+    Permissions :
+        IsAdminUser - seuls les comptes is_staff sont autorisés.
+
+    Méthode POST :
+        - Accepte un fichier CSV/JSONL (multipart, champ 'file')
+          ou une liste JSON d'utilisateurs.
+        - Applique les mêmes règles que RegisterView à chaque ligne.
+        - Crée les comptes valides en masse et rapporte les lignes rejetées.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        """
+        Traite la requête de création en masse.
+
+        Returns:
+            Response: rapport {"created", "failures"} ; 201 si au moins
+                      un compte a été créé, 400 sinon.
+        """
+        uploaded = request.FILES.get("file")
+        if uploaded is not None:
+            try:
+                rows = read_upload(uploaded)
+            except ValueError:
+                return Response(
+                    {"error": "Fichier illisible."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            return Response(
+                {"error": "Un fichier ou une liste d'utilisateurs est requis."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report = provision_users(rows)
+        return Response(
+            report,
+            status=status.HTTP_201_CREATED if report["created"] else status.HTTP_400_BAD_REQUEST,
+        )
+
+
 class CustomUserViewSet(viewsets.ModelViewSet):
     """
     ViewSet pour gérer les utilisateurs par leurs propres profils.
@@ -95,6 +144,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     - get_queryset : renvoie uniquement l'utilisateur connecté.
     - perform_destroy : n'autorise la suppression que sur son propre compte,
       sinon déclenche PermissionDenied.
+    - destroy : l'effacement est différé, la réponse 202 pointe vers la tâche.
     """
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
@@ -103,22 +153,63 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Limite le queryset à l'utilisateur connecté.
+        En génération de schéma Swagger, renvoie un queryset vide.
 
         Returns:
             QuerySet[CustomUser]: l'objet user courant.
         """
+        if getattr(self, 'swagger_fake_view', False):
+            return CustomUser.objects.none()
+
         return CustomUser.objects.filter(id=self.request.user.id)
 
+    def destroy(self, request, *args, **kwargs):
+        """
+        Planifie l'effacement du compte et renvoie la tâche créée.
+
+        Returns:
+            Response: 202 avec la tâche d'effacement et son URL de suivi.
+        """
+        instance = self.get_object()
+        job = self.perform_destroy(instance)
+        serializer = AccountErasureJobSerializer(
+            job, context=self.get_serializer_context()
+        )
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": serializer.data["status_url"]},
+        )
+
     def perform_destroy(self, instance):
         """
-        Supprime le compte utilisateur si c'est le sien,
+        Planifie l'effacement du compte utilisateur si c'est le sien,
         sinon lève une exception PermissionDenied.
 
+        Le compte est désactivé immédiatement ; ses données sont effacées
+        par lots par la commande erase_deleted_accounts.
+
         Args:
             instance (CustomUser): instance à supprimer.
+
+        Returns:
+            AccountErasureJob: tâche d'effacement planifiée.
         """
         if instance != self.request.user:
             raise PermissionDenied(
                 "Vous ne pouvez supprimer que votre propre compte."
             )
-        instance.delete()
+        return schedule_account_erasure(instance)
+
+
+class AccountErasureJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Suivi d'un effacement de compte.
+
+    Le compte étant désactivé dès la demande, l'endpoint n'exige pas
+    d'authentification : l'UUID de la tâche, non devinable, sert de jeton.
+    """
+    queryset = AccountErasureJob.objects.all()
+    serializer_class = AccountErasureJobSerializer
+    authentication_classes = []
+    permission_classes = [AllowAny]
@@ -0,0 +1,44 @@
+"""
+Identifiants UUID ordonnés dans le temps (UUIDv7, RFC 9562).
+
+Les 48 bits de poids fort portent l'horodatage Unix en millisecondes, suivis
+d'un compteur de 12 bits qui garantit l'ordre des identifiants générés dans la
+même milliseconde par un processus. Les insertions se font ainsi en fin d'index
+(B-tree compact) et l'ordre des identifiants suit l'ordre de création.
+"""
+
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+# Dernière valeur (horodatage en ms << 12 | compteur) attribuée par ce processus
+_last = 0
+
+
+def uuid7():
+    """
+    Génère un UUIDv7 strictement croissant au sein du processus.
+
+    Returns:
+        uuid.UUID: identifiant de version 7, variante RFC 4122.
+    """
+    global _last
+    with _lock:
+        # Si l'horloge n'a pas avancé (ou a reculé), le compteur est incrémenté ;
+        # son débordement empiète sur la milliseconde suivante, l'ordre est conservé
+        value = max((time.time_ns() // 1_000_000) << 12, _last + 1)
+        _last = value
+    timestamp_ms, counter = value >> 12, value & 0xFFF
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    return uuid.UUID(
+        int=(timestamp_ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+    )
+
+
+def uuid7_time(value):
+    """
+    Horodatage Unix (en secondes) encodé dans un UUIDv7.
+    """
+    return (value.int >> 80) / 1000
@@ -0,0 +1,79 @@
+"""
+Format binaire MessagePack pour l'API (renderer et parser DRF).
+
+Choisi par négociation de contenu : `Accept: application/msgpack` pour les
+réponses, `Content-Type: application/msgpack` pour les corps de requête.
+Les serializers DRF rendent déjà datetimes et UUID en texte : les réponses
+MessagePack contiennent donc les mêmes valeurs qu'en JSON. Les types non
+natifs restants (Decimal, durée, chaînes traduites) sont encodés comme par
+le renderer JSON de DRF.
+
+msgpack est une dépendance optionnelle : les classes ne sont enregistrées dans
+REST_FRAMEWORK que si le paquet est installé (voir softdesk/settings.py).
+"""
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    msgpack = None
+
+MEDIA_TYPE = "application/msgpack"
+
+_json_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """
+    Encode les types que msgpack ne gère pas nativement, comme en JSON.
+    """
+    try:
+        return _json_encoder.default(obj)
+    except TypeError:
+        raise TypeError(f"Type non sérialisable en MessagePack : {type(obj).__name__}") from None
+
+
+def packb(data):
+    """
+    Encode des données en MessagePack.
+    """
+    return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+def unpackb(content):
+    """
+    Décode du MessagePack (clés de dictionnaire de tout type, chaînes en str).
+    """
+    return msgpack.unpackb(content, strict_map_key=False, raw=False)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Rend la réponse en MessagePack.
+    """
+    media_type = MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return packb(data)
+
+
+class MessagePackParser(BaseParser):
+    """
+    Lit un corps de requête MessagePack.
+    """
+    media_type = MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return unpackb(stream.read())
+        except Exception as exc:
+            raise ParseError(f"Corps MessagePack invalide : {exc}")